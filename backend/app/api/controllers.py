@@ -1,21 +1,166 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-from app.infra.sql_repository import SqlAccountRepository, ensure_tables
+from fastapi import APIRouter, HTTPException, Header, Query, Request
+from fastapi.responses import StreamingResponse, FileResponse
+from starlette.background import BackgroundTask
+import os
+import tempfile
+from typing import List, Optional
+from app.infra.sql_repository import SqlAccountRepository, FLAG_LIST_COLUMNS, MIN_SEARCH_LENGTH
 from app.application.use_cases import ListFlaggedUseCase
 from app.api.schemas import FlaggedOut
+from app.api.serialization import rows_to_json, json_response, dumps
+from app.infra.live_stream import broadcaster
+from app.infra import cluster_index, snapshots, parquet_export, export_adapter, link_graph, handle_import, labels, platforms, reason_templates, report_queue, risk_summary
+from app.domain.value_objects import Handle
+import asyncio
+from datetime import datetime, timedelta, timezone
 
 router = APIRouter(prefix="/api")
 
-@router.on_event("startup")
-async def ensure_db():
-    await ensure_tables()
+_REASONS_INDEX = FLAG_LIST_COLUMNS.index("reasons")
 
-@router.get("/flags", response_model=List[FlaggedOut])
-async def list_flags(limit: int = 100):
+@router.get("/flags", responses={200: {"model": List[FlaggedOut]}})
+async def list_flags(
+    limit: int = 100,
+    rule: Optional[str] = None,
+    field: Optional[str] = None,
+    term: Optional[str] = None,
+    lang: str = "en",
+):
+    """Top flagged accounts, optionally only those hit by a rule (and field/term)."""
+    reason = {k: v for k, v in (("rule", rule), ("field", field), ("term", term)) if v is not None}
+    rows = None if reason else _cached_top(limit)
+    if rows is None:
+        repo = SqlAccountRepository()
+        usecase = ListFlaggedUseCase(repo)
+        rows = await usecase.execute_rows(limit=limit, reason=reason or None)
+    return json_response(rows_to_json(FLAG_LIST_COLUMNS, reason_templates.render_rows(rows, _REASONS_INDEX, lang)))
+
+def _cached_top(limit: int):
+    """Ranked rows from the in-process top-K, or None when it can't answer."""
+    cache = risk_summary.top_risk
+    if cache is None or not cache.ready or limit > cache.k:
+        return None
+    cache.refresh_if_stale(lambda n: SqlAccountRepository().list_flagged_rows(limit=n))
+    return cache.top(limit)
+
+@router.get("/summary")
+async def dashboard_summary(top: int = Query(default=10, ge=0, le=100), lang: str = "en"):
+    """Per-platform counts, risk histograms and the highest-risk accounts."""
+    body = await risk_summary.summary()
+    rows = _cached_top(top)
+    if rows is None:
+        rows = await SqlAccountRepository().list_flagged_rows(limit=top)
+    rows = reason_templates.render_rows(rows, _REASONS_INDEX, lang)
+    body["top"] = [dict(zip(FLAG_LIST_COLUMNS, r)) for r in rows]
+    return json_response(dumps(body))
+
+@router.get("/search", responses={200: {"model": List[FlaggedOut]}})
+async def search_flags(
+    q: str,
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    fuzzy: bool = True,
+    lang: str = "en",
+):
+    """Substring (`cpsel`), prefix (`cpselq*`) or fuzzy search over handles, names and descriptions."""
+    if len(q.replace("*", "").strip()) < MIN_SEARCH_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Query must have at least {MIN_SEARCH_LENGTH} characters")
     repo = SqlAccountRepository()
-    usecase = ListFlaggedUseCase(repo)
-    rows = await usecase.execute(limit=limit)
-    return rows
+    rows = await repo.search_rows(q, limit=limit, offset=offset, fuzzy=fuzzy)
+    rows = reason_templates.render_rows(rows, _REASONS_INDEX, lang)
+    return json_response(rows_to_json(FLAG_LIST_COLUMNS + ("rank",), rows))
+
+@router.get("/clusters")
+async def list_clusters(limit: int = Query(default=50, ge=1, le=500), min_size: int = Query(default=2, ge=1)):
+    """Largest families of near-duplicate accounts."""
+    rows = await cluster_index.largest_clusters(limit=limit, min_size=min_size)
+    return json_response(rows_to_json(("cluster_id", "size", "max_risk_score"), rows))
+
+@router.get("/clusters/{platform}/{handle}")
+async def get_cluster(platform: str, handle: str):
+    cluster_id, members = await cluster_index.cluster_of(platform, handle)
+    if cluster_id is None:
+        raise HTTPException(status_code=404, detail="Not clustered")
+    body = {
+        "cluster_id": cluster_id,
+        "members": [dict(zip(("id", "platform", "handle", "display_name", "risk_score"), m)) for m in members],
+    }
+    return json_response(dumps(body))
+
+@router.get("/accounts/{platform}/{handle}/history")
+async def account_history(platform: str, handle: str, days: Optional[int] = Query(default=None, ge=1), lang: str = "en"):
+    """Risk score over time for one account."""
+    since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+    rows = reason_templates.render_rows(await snapshots.score_history(platform, handle, since=since), 2, lang)
+    return json_response(rows_to_json(("captured_at", "risk_score", "reasons"), rows))
+
+@router.get("/escalations")
+async def list_escalations(
+    days: int = Query(default=7, ge=1, le=365),
+    min_increase: float = Query(default=0.2, ge=0.0, le=1.0),
+    limit: int = Query(default=100, ge=1, le=1000),
+):
+    """Accounts whose risk score rose in the last N days."""
+    rows = await snapshots.newly_escalated(days=days, min_increase=min_increase, limit=limit)
+    return json_response(rows_to_json(snapshots.ESCALATION_COLUMNS, rows))
+
+@router.get("/export/{dataset}.parquet")
+async def download_parquet(dataset: str, days: Optional[int] = Query(default=None, ge=1)):
+    """Columnar export of `flags` or `snapshots` (optionally only the last N days)."""
+    if not parquet_export.PARQUET_AVAILABLE:
+        raise HTTPException(status_code=501, detail="Parquet export is not available (pyarrow missing)")
+    fd, path = tempfile.mkstemp(suffix=".parquet", prefix="eumenides_")
+    os.close(fd)
+    try:
+        if dataset == "flags":
+            await parquet_export.export_flagged_to_parquet(path)
+        elif dataset == "snapshots":
+            since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+            await parquet_export.export_snapshots_to_parquet(path, since=since)
+        else:
+            raise HTTPException(status_code=404, detail="Unknown dataset")
+    except Exception:
+        os.remove(path)
+        raise
+    return FileResponse(path, media_type="application/vnd.apache.parquet", filename=f"{dataset}.parquet",
+                        background=BackgroundTask(os.remove, path))
+
+@router.get("/exports/{handle}")
+async def list_exports(handle: str, since: Optional[str] = None, decrypt: bool = False):
+    """Encrypted exports written for a handle, optionally decrypted."""
+    def lookup():
+        records = export_adapter.find_exports(Handle(handle).normalized(), since=since)
+        if decrypt:
+            for rec in records:
+                rec["payload"] = export_adapter.decrypt_export(rec["file"])
+        return records
+    try:
+        records = await asyncio.get_running_loop().run_in_executor(None, lookup)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=410, detail="Indexed export file is missing")
+    return json_response(dumps(records))
+
+@router.get("/graph/{platform}/{handle}")
+async def account_neighborhood(platform: str, handle: str, depth: int = Query(default=2, ge=1, le=4)):
+    """Accounts linked to/from a handle through profile references."""
+    rows = await link_graph.neighborhood(platform, Handle(handle).normalized(), depth=depth)
+    return json_response(rows_to_json(("src_handle", "dst_handle", "hops"), rows))
+
+@router.get("/flags/stream")
+async def stream_flags(last_event_id: Optional[str] = Header(default=None)):
+    """Server-Sent Events feed of newly flagged accounts."""
+    try:
+        resume_from = int(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_from = None
+    client = broadcaster.connect(resume_from)
+    return StreamingResponse(
+        broadcaster.stream(client),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @router.post("/report/{platform}/{handle}")
 async def mark_for_review(platform: str, handle: str):
@@ -23,4 +168,54 @@ async def mark_for_review(platform: str, handle: str):
     f = await repo.find_by_handle(platform, handle)
     if not f:
         raise HTTPException(status_code=404, detail="Not found")
-    return {"status": "marked_for_manual_review", "platform": platform, "handle": handle}
+    # queued for the report worker regardless of the automatic threshold
+    await report_queue.enqueue([{
+        "platform": f.metadata.platform,
+        "handle": f.metadata.handle.normalized(),
+        "display_name": f.metadata.display_name,
+        "description": f.metadata.description,
+        "risk_score": f.risk_score.value,
+        "reasons": reason_templates.render(f.reasons),
+        "first_seen": f.created_at.value.isoformat() if f.created_at else None,
+        "last_seen": f.last_seen.value.isoformat() if f.last_seen else None,
+    }], requested_by="manual")
+    return {"status": "queued_for_report", "platform": platform, "handle": handle}
+
+@router.get("/report/{platform}/{handle}")
+async def report_status(platform: str, handle: str):
+    """Submission state of an account's report."""
+    row = await report_queue.status_of(platform, handle)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Not queued")
+    return json_response(dumps(dict(zip(report_queue.STATUS_COLUMNS, row))))
+
+@router.get("/reports/queue")
+async def report_queue_counts():
+    """Number of reports per submission status."""
+    return json_response(dumps(await report_queue.counts()))
+
+@router.post("/labels/{platform}/{handle}")
+async def label_account(platform: str, handle: str, label: int = Query(ge=0, le=1)):
+    """Analyst verdict (1 = abusive, 0 = benign) used to train the learned scoring model."""
+    handle = Handle(handle).normalized()
+    repo = SqlAccountRepository()
+    if not await repo.find_by_handle(platform, handle):
+        raise HTTPException(status_code=404, detail="Not found")
+    await labels.set_label(platform, handle, label)
+    return {"status": "labeled", "platform": platform, "handle": handle, "label": label}
+
+@router.post("/import/handles")
+async def import_handles(
+    request: Request,
+    format: str = Query(default="text", pattern="^(text|csv)$"),
+    column: Optional[str] = None,
+    platform: str = "telegram",
+    source: str = "api",
+    priority: float = Query(default=handle_import.IMPORT_PRIORITY, ge=0.0, le=1.0),
+):
+    """Queue handles from the raw request body (one per line or a CSV column, optionally gzipped) for crawling."""
+    if platform not in platforms.available():
+        raise HTTPException(status_code=400, detail=f"Unknown platform {platform!r}")
+    values = handle_import.iter_body(request.stream(), fmt=format, column=column)
+    stats = await handle_import.import_handles(values, source=source, platform=platform, priority=priority)
+    return json_response(dumps(dict(stats)))
@@ -8,6 +8,7 @@ class FlaggedOut(BaseModel):
     display_name: Optional[str]
     description: Optional[str]
     risk_score: float
+    model_score: Optional[float]
     reasons: Optional[List[str]]
     created_at: Optional[str]
     last_seen: Optional[str]
@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Any, Iterable, Sequence
+from fastapi.responses import Response
+
+try:
+    import orjson
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:  # pragma: no cover - stdlib fallback
+    import json
+
+    def _default(o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, default=_default).encode()
+
+
+def rows_to_json(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> bytes:
+    """Encode DB row tuples straight to a JSON array of objects, without ORM/DTO layers."""
+    return dumps([dict(zip(columns, r)) for r in rows])
+
+
+def json_response(body: bytes, status_code: int = 200) -> Response:
+    return Response(content=body, status_code=status_code, media_type="application/json")
@@ -2,13 +2,14 @@ from dataclasses import dataclass
 from typing import Optional, Dict, List
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class IngestHandleDTO:
     platform: str
     raw_handle: str
     discovered_at: datetime
+    depth: int = 0  # hops from a seed handle when found through link discovery
 
-@dataclass
+@dataclass(slots=True)
 class FlaggedDTO:
     id: int
     platform: str
@@ -1,56 +1,111 @@
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from app.domain.value_objects import Handle, Timestamp
-from app.domain.services import create_flagged_from_metadata
+from app.domain.services import create_flagged_from_metadata, FLAG_THRESHOLD
 from app.domain.entities import AccountMetadata, FlaggedAccount
+from app.domain.platforms import PlatformAdapter
 from app.domain.repositories import AccountRepository
 from app.infra.event_bus import event_bus
+from app.infra import reason_templates, model_store
 from app.application.dtos import IngestHandleDTO, FlaggedDTO
 import logging
 
-class IngestTelegramHandle:
-    def __init__(self, account_repo: AccountRepository, telegram_adapter):
+class IngestHandle:
+    """Fetch, score and persist one handle through a platform adapter."""
+
+    def __init__(self, account_repo: AccountRepository, adapter: Optional[PlatformAdapter], discovery=None):
         self.repo = account_repo
-        self.telegram = telegram_adapter
+        self.adapter = adapter
+        self.discovery = discovery
+
+    async def execute(self, dto: IngestHandleDTO) -> Optional[FlaggedAccount]:
+        """Fetch and score one handle; returns the scored account, or None if it was not found."""
+        md = await self.fetch(dto)
+        if not md:
+            return None
+        return await self.process_metadata(md, dto)
 
-    async def execute(self, dto: IngestHandleDTO) -> None:
-        md = await self.telegram.fetch_public_channel_metadata(dto.raw_handle)
+    async def fetch(self, dto: IngestHandleDTO) -> Optional[dict]:
+        md = await self.adapter.fetch(dto.raw_handle)
         logging.info(f"Fetched metadata for {dto.raw_handle}: {md}")
         if not md:
             logging.info(f"No metadata found for {dto.raw_handle}")
-            return
+        return md
+
+    def score(self, md: dict, dto: IngestHandleDTO) -> FlaggedAccount:
+        """Build the account from fetched metadata and score it, without side effects."""
+        extra = {"participants": md.get("participants_count")}
+        if md.get("is_bot") is not None:
+            extra["is_bot"] = md["is_bot"]
+        fetched_at = datetime.fromisoformat(md["fetched_at"]) if md.get("fetched_at") else datetime.utcnow()
         metadata = AccountMetadata(
-            platform="telegram",
+            platform=dto.platform,
             handle=Handle(md.get("username") or str(md.get("id"))),
             display_name=md.get("title"),
             description=md.get("description"),
-            extra={"participants": md.get("participants_count")},
-            fetched_at=Timestamp(datetime.utcnow())
+            extra=extra,
+            fetched_at=Timestamp(fetched_at)
         )
         flagged = create_flagged_from_metadata(metadata)
+        model = model_store.get_default_model()
+        if model is not None:
+            # scored next to the rules for comparison; the flag decision stays rule-based
+            flagged.model_score, flagged.model_features = model.score_one(metadata)
+        return flagged
+
+    @staticmethod
+    def should_flag(flagged: FlaggedAccount) -> bool:
         # Always flag if handle or display name contains 'vendo_cp'
         force_flag = False
-        if "vendo_cp" in (metadata.handle.normalized().lower()):
+        if "vendo_cp" in (flagged.metadata.handle.normalized().lower()):
             force_flag = True
-        if "vendo_cp" in (metadata.display_name or "").lower():
+        if "vendo_cp" in (flagged.metadata.display_name or "").lower():
             force_flag = True
-        logging.info(f"Risk score for {metadata.handle.normalized()}: {flagged.risk_score.value}, force_flag={force_flag}")
-        if flagged.risk_score.value >= 0.2 or force_flag:
-            saved = await self.repo.save(flagged)
-            event_bus.publish("AccountFlagged", {
-                "platform": saved.metadata.platform,
-                "handle": saved.metadata.handle.normalized(),
-                "display_name": saved.metadata.display_name,
-                "description": saved.metadata.description,
-                "risk_score": saved.risk_score.value,
-                "reasons": saved.reasons,
-                "first_seen": saved.created_at.value.isoformat() if saved.created_at else None,
-                "last_seen": saved.last_seen.value.isoformat() if saved.last_seen else None,
-                "crawl_log": []
-            })
+        return flagged.risk_score.value >= FLAG_THRESHOLD or force_flag
+
+    async def process_metadata(self, md: dict, dto: IngestHandleDTO, publish: bool = True) -> FlaggedAccount:
+        """Score fetched metadata (live or replayed from capture) and persist it if flagged."""
+        flagged = self.score(md, dto)
+        metadata = flagged.metadata
+        logging.info(f"Risk score for {metadata.handle.normalized()}: {flagged.risk_score.value}, model_score={flagged.model_score}")
+        if self.should_flag(flagged):
+            saved = await self.repo.save(flagged, notify=publish)
+            if publish:
+                self._publish(saved)
             logging.info("Flagged saved: %s %s", saved.metadata.platform, saved.metadata.handle.normalized())
+            if self.discovery is not None and self.adapter is not None:
+                # follow links / @mentions out of flagged profiles
+                refs = self.adapter.references(metadata)
+                await self.discovery.record(metadata.platform, metadata.handle.normalized(), refs,
+                                            flagged.risk_score.value, dto.depth)
         else:
             logging.info(f"Not flagged: {metadata.handle.normalized()} (risk score: {flagged.risk_score.value})")
+        return flagged
+
+    def _publish(self, saved: FlaggedAccount):
+        event_bus.publish("AccountFlagged", {
+            "id": saved.id,
+            "platform": saved.metadata.platform,
+            "handle": saved.metadata.handle.normalized(),
+            "display_name": saved.metadata.display_name,
+            "description": saved.metadata.description,
+            "risk_score": saved.risk_score.value,
+            "model_score": saved.model_score,
+            "reasons": reason_templates.render(saved.reasons),
+            "reason_codes": reason_templates.codes(saved.reasons),
+            "first_seen": saved.created_at.value.isoformat() if saved.created_at else None,
+            "last_seen": saved.last_seen.value.isoformat() if saved.last_seen else None,
+            "crawl_log": []
+        })
+
+class IngestTelegramHandle(IngestHandle):
+    """IngestHandle bound to Telegram."""
+
+    def __init__(self, account_repo: AccountRepository, telegram_adapter: Optional[PlatformAdapter] = None, discovery=None):
+        if telegram_adapter is None:
+            from app.infra.telegram_client import TelegramAdapter
+            telegram_adapter = TelegramAdapter()
+        super().__init__(account_repo, telegram_adapter, discovery)
 
 class ListFlaggedUseCase:
     def __init__(self, account_repo: AccountRepository):
@@ -67,8 +122,12 @@ class ListFlaggedUseCase:
                 display_name=r.metadata.display_name,
                 description=r.metadata.description,
                 risk_score=r.risk_score.value,
-                reasons=r.reasons,
+                reasons=reason_templates.render(r.reasons),
                 created_at=r.created_at.value.isoformat() if r.created_at else None,
                 last_seen=r.last_seen.value.isoformat() if r.last_seen else None
             ))
         return result
+
+    async def execute_rows(self, limit: int = 100, reason: Optional[dict] = None):
+        """Read path for serializers that consume raw column tuples directly."""
+        return await self.repo.list_flagged_rows(limit=limit, reason=reason)
@@ -1,12 +1,16 @@
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import AnyUrl
 
 class Settings(BaseSettings):
-    TELEGRAM_API_ID: int
-    TELEGRAM_API_HASH: str
+    # Telegram credentials are only needed by the crawler; the API can run without them
+    TELEGRAM_API_ID: Optional[int] = None
+    TELEGRAM_API_HASH: Optional[str] = None
     TELEGRAM_SESSION: str = "eumenides_session"
     DATABASE_URL: AnyUrl
     POLL_INTERVAL_SECONDS: int = 30
+    # Serve the API without connecting to Telegram or preparing exports at startup
+    API_ONLY: bool = False
 
     class Config:
         env_file = ".env"
@@ -1,9 +1,11 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, Dict, List
 from datetime import datetime
 from app.domain.value_objects import Handle, RiskScore, Timestamp
+from app.domain.reasons import Reason
+from app.domain.normalization import FoldedText, fold
 
-@dataclass
+@dataclass(slots=True)
 class AccountMetadata:
     platform: str
     handle: Handle
@@ -11,15 +13,29 @@ class AccountMetadata:
     description: Optional[str]
     extra: Dict
     fetched_at: Timestamp
+    _folded: Optional[Dict[str, FoldedText]] = field(default=None, init=False, repr=False, compare=False)
 
-@dataclass
+    def folded(self) -> Dict[str, FoldedText]:
+        """Lowercased and confusable-folded handle, display_name and description, computed once."""
+        if self._folded is None:
+            self._folded = {
+                "handle": fold(self.handle.normalized()),
+                "display_name": fold(self.display_name),
+                "description": fold(self.description),
+            }
+        return self._folded
+
+@dataclass(slots=True)
 class FlaggedAccount:
     id: Optional[int]
     metadata: AccountMetadata
     risk_score: RiskScore
-    reasons: List[str]
+    reasons: List[Reason]
     created_at: Optional[Timestamp] = None
     last_seen: Optional[Timestamp] = None
+    raw_risk_score: Optional[float] = None  # unclamped score, only set when freshly computed
+    model_score: Optional[float] = None  # learned model probability, when a model is trained
+    model_features: Optional[List[Dict]] = None
 
     def mark_seen(self, at: Timestamp):
         self.last_seen = at
@@ -0,0 +1,100 @@
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from app.domain.entities import AccountMetadata
+
+DIM = 1 << 18
+NGRAM_RANGE = (2, 4)
+# field prefixes keep "cp" in a handle and "cp" in a description as separate features
+_FIELDS = (("h", lambda m: m.handle.normalized()), ("n", lambda m: m.display_name), ("d", lambda m: m.description))
+
+
+def features(metadata: AccountMetadata, ngram_range: Tuple[int, int] = NGRAM_RANGE) -> List[str]:
+    """Distinct field-tagged character n-grams of an account."""
+    lo, hi = ngram_range
+    grams = set()
+    for tag, get in _FIELDS:
+        text = f" {' '.join((get(metadata) or '').lower().split())} "
+        if text == "  ":
+            continue
+        for n in range(lo, hi + 1):
+            grams.update(f"{tag}:{text[i:i + n]}" for i in range(len(text) - n + 1))
+    return list(grams)
+
+
+def _hash(gram: str, dim: int) -> int:
+    return zlib.crc32(gram.encode()) & (dim - 1)
+
+
+class HashedNgramModel:
+    """Logistic regression over hashed character n-grams.
+
+    Rows are represented as flat index arrays plus a row id per index, so
+    scoring a batch is one gather and one bincount regardless of batch size.
+    """
+
+    def __init__(self, weights: Optional[np.ndarray] = None, bias: float = 0.0, dim: int = DIM,
+                 ngram_range: Tuple[int, int] = NGRAM_RANGE):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.weights = weights if weights is not None else np.zeros(dim, dtype=np.float32)
+        self.bias = float(bias)
+
+    def _encode(self, grams_per_row: Sequence[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        lengths = np.fromiter((len(g) for g in grams_per_row), dtype=np.int64, count=len(grams_per_row))
+        idx = np.fromiter((_hash(g, self.dim) for grams in grams_per_row for g in grams), dtype=np.int64,
+                          count=int(lengths.sum()))
+        rows = np.repeat(np.arange(len(grams_per_row)), lengths)
+        return idx, rows
+
+    def _decision(self, idx: np.ndarray, rows: np.ndarray, n: int) -> np.ndarray:
+        return np.bincount(rows, weights=self.weights[idx], minlength=n) + self.bias
+
+    def score_batch(self, metadatas: Sequence[AccountMetadata], top_k: int = 5) -> List[Tuple[float, List[Dict]]]:
+        """(probability, top contributing features) for each account."""
+        grams_per_row = [features(m, self.ngram_range) for m in metadatas]
+        idx, rows = self._encode(grams_per_row)
+        probs = 1.0 / (1.0 + np.exp(-self._decision(idx, rows, len(grams_per_row))))
+        if top_k <= 0:
+            return [(round(float(p), 4), []) for p in probs]
+        contrib = self.weights[idx]
+        out = []
+        start = 0
+        for i, grams in enumerate(grams_per_row):
+            c = contrib[start:start + len(grams)]
+            top = np.argsort(-c)[:top_k]
+            out.append((round(float(probs[i]), 4),
+                        [{"feature": grams[j], "weight": round(float(c[j]), 4)} for j in top if c[j] > 0]))
+            start += len(grams)
+        return out
+
+    def score_one(self, metadata: AccountMetadata, top_k: int = 5) -> Tuple[float, List[Dict]]:
+        return self.score_batch([metadata], top_k=top_k)[0]
+
+    @classmethod
+    def train(cls, metadatas: Sequence[AccountMetadata], labels: Sequence[int], epochs: int = 200,
+              learning_rate: float = 0.5, l2: float = 1e-4, dim: int = DIM) -> "HashedNgramModel":
+        """Full-batch AdaGrad on class-balanced logistic loss."""
+        model = cls(dim=dim)
+        y = np.asarray(labels, dtype=np.float64)
+        n = len(y)
+        pos = max(1.0, y.sum())
+        neg = max(1.0, n - y.sum())
+        sample_w = np.where(y > 0, n / (2 * pos), n / (2 * neg))
+        idx, rows = model._encode([features(m, model.ngram_range) for m in metadatas])
+        w = np.zeros(dim, dtype=np.float64)
+        g2 = np.full(dim, 1e-8)
+        b, b2 = 0.0, 1e-8
+        for _ in range(epochs):
+            z = np.bincount(rows, weights=w[idx], minlength=n) + b
+            p = 1.0 / (1.0 + np.exp(-z))
+            err = (p - y) * sample_w / n
+            grad = np.bincount(idx, weights=err[rows], minlength=dim) + l2 * w
+            g2 += grad ** 2
+            w -= learning_rate * grad / np.sqrt(g2)
+            gb = err.sum()
+            b2 += gb ** 2
+            b -= learning_rate * gb / np.sqrt(b2)
+        model.weights = w.astype(np.float32)
+        model.bias = b
+        return model
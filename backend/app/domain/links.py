@@ -0,0 +1,22 @@
+import re
+from typing import Iterable, Set
+
+# Public Telegram usernames: 5-32 chars, letters/digits/underscore, starting with a letter
+_USERNAME = r"[A-Za-z][A-Za-z0-9_]{4,31}"
+_LINK = re.compile(rf"(?:https?://)?(?:www\.)?(?:t|telegram)\.(?:me|dog)/(?:s/)?({_USERNAME})(?![A-Za-z0-9_])", re.IGNORECASE)
+_MENTION = re.compile(rf"(?<![A-Za-z0-9_@./])@({_USERNAME})\b")
+# t.me paths that are not accounts
+_RESERVED = {"joinchat", "addstickers", "addemoji", "share", "proxy", "socks", "setlanguage", "iv", "login", "addtheme"}
+
+
+def extract_references(texts: Iterable[str]) -> Set[str]:
+    """Normalized handles referenced through t.me links or @mentions."""
+    out: Set[str] = set()
+    for text in texts:
+        if not text:
+            continue
+        for m in _LINK.finditer(text):
+            out.add(m.group(1).lower())
+        for m in _MENTION.finditer(text):
+            out.add(m.group(1).lower())
+    return {h for h in out if h not in _RESERVED}
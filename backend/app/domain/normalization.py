@@ -0,0 +1,95 @@
+import re
+import unicodedata
+from typing import NamedTuple, Optional
+
+# Digits and symbols standing in for Latin letters ("v3nd0"); applied only to tokens with Latin letters or digits
+_LEET = {
+    "0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "9": "g",
+    "$": "s", "@": "a", "!": "i", "|": "i",
+}
+# Cyrillic and Greek letters folded to the Latin letter they imitate. Following UTS #39 these
+# are only folded in mixed-script tokens ("vеndо" with Cyrillic е/о), never in Cyrillic or Greek
+# words, which would otherwise read as Latin keywords ("Срочно" as "cpoчho"). Applied before
+# casefolding, since e.g. Greek "Η" imitates "H" while its lowercase "η" imitates "n".
+_CROSS_SCRIPT = {
+    # Cyrillic
+    "А": "a", "В": "b", "Е": "e", "К": "k", "М": "m", "Н": "h", "О": "o", "Р": "p", "С": "c",
+    "Т": "t", "У": "y", "Х": "x", "Ѕ": "s", "І": "i", "Ј": "j",
+    "а": "a", "в": "b", "е": "e", "ё": "e", "з": "e", "к": "k", "м": "m", "н": "h", "о": "o",
+    "п": "n", "р": "p", "с": "c", "т": "t", "у": "y", "х": "x", "ѕ": "s", "і": "i", "ї": "i",
+    "ј": "j", "ԁ": "d", "ԛ": "q", "ԝ": "w", "һ": "h", "ӏ": "l", "ү": "y",
+    # Greek
+    "Α": "a", "Β": "b", "Ε": "e", "Ζ": "z", "Η": "h", "Ι": "i", "Κ": "k", "Μ": "m", "Ν": "n",
+    "Ο": "o", "Ρ": "p", "Τ": "t", "Υ": "y", "Χ": "x",
+    "α": "a", "β": "b", "γ": "y", "ε": "e", "η": "n", "ι": "i", "κ": "k", "μ": "u", "ν": "v",
+    "ο": "o", "ρ": "p", "τ": "t", "υ": "u", "χ": "x", "ω": "w",
+}
+# Latin small capitals and variants NFKD leaves alone; Latin script, so folded everywhere
+_LATIN_VARIANTS = {
+    "ᴀ": "a", "ʙ": "b", "ᴄ": "c", "ᴅ": "d", "ᴇ": "e", "ɢ": "g", "ʜ": "h", "ɪ": "i", "ᴊ": "j",
+    "ᴋ": "k", "ʟ": "l", "ᴍ": "m", "ɴ": "n", "ᴏ": "o", "ᴘ": "p", "ꜱ": "s", "ᴛ": "t", "ᴜ": "u",
+    "ᴠ": "v", "ᴡ": "w", "ʏ": "y", "ᴢ": "z",
+    "ı": "i", "ȷ": "j", "ɑ": "a", "ɩ": "i", "ʀ": "r", "ø": "o", "đ": "d", "ł": "l", "ħ": "h", "ɡ": "g",
+}
+# Invisible characters used to split keywords ("c\u200bp")
+_ZERO_WIDTH = "\u00ad\u034f\u180e\u200b\u200c\u200d\u200e\u200f\u2060\u2061\u2062\u2063\u2064\ufeff"
+_COMBINING = [(0x0300, 0x036F), (0x1AB0, 0x1AFF), (0x1DC0, 0x1DFF), (0x20D0, 0x20FF), (0xFE20, 0xFE2F)]
+
+
+def _build_table() -> dict:
+    table = {ord(k): v for k, v in _LATIN_VARIANTS.items()}
+    table.update({ord(c): None for c in _ZERO_WIDTH})
+    for lo, hi in _COMBINING:
+        table.update({cp: None for cp in range(lo, hi + 1)})
+    return table
+
+
+_TABLE = _build_table()
+_LEET_TABLE = str.maketrans(_LEET)
+_CROSS_SCRIPT_TABLE = str.maketrans(_CROSS_SCRIPT)
+# Tokens with a Latin letter or digit: the only ones lookalikes and leetspeak are folded in
+_LATIN_TOKEN = re.compile(r"(?<!\S)\S*?[A-Za-z0-9]\S*")
+_LEET_CHARS = re.compile("[" + re.escape("".join(_LEET)) + "]")
+_FOLDABLE_CHARS = re.compile("[" + re.escape("".join(_LEET) + "".join(_CROSS_SCRIPT)) + "]")
+
+
+def _fold_token(match: "re.Match") -> str:
+    token = match.group()
+    if not token.isascii():
+        token = token.translate(_CROSS_SCRIPT_TABLE)
+    return token.translate(_LEET_TABLE)
+
+
+def skeleton(text: str) -> str:
+    """Fold text to the form lookalike spellings share.
+
+    NFKD maps compatibility forms (fullwidth, math alphanumerics, ligatures)
+    to plain letters and splits accents off as combining marks, which are
+    dropped along with zero-width characters. Leetspeak and Cyrillic/Greek
+    lookalikes are then mapped to ASCII per whitespace-separated token, and
+    only in tokens that contain Latin letters or digits, so single-script
+    words in other alphabets keep their own letters. Text without any
+    foldable character skips the per-token pass.
+    """
+    if text.isascii():
+        if not _LEET_CHARS.search(text):
+            return text.lower()
+    else:
+        text = unicodedata.normalize("NFKD", text).translate(_TABLE)
+        if not _FOLDABLE_CHARS.search(text):
+            return text.casefold()
+    return _LATIN_TOKEN.sub(_fold_token, text).casefold()
+
+
+class FoldedText(NamedTuple):
+    lower: str
+    skeleton: str
+
+    def contains(self, term: str, term_skeleton: Optional[str] = None) -> bool:
+        """Plain substring match, or a match between skeletons."""
+        return term in self.lower or (term_skeleton if term_skeleton is not None else skeleton(term)) in self.skeleton
+
+
+def fold(text: Optional[str]) -> FoldedText:
+    text = text or ""
+    return FoldedText(text.lower(), skeleton(text))
@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Set
+from app.domain.entities import AccountMetadata
+from app.domain.links import extract_references
+from app.domain.value_objects import Handle
+
+
+class PlatformAdapter(ABC):
+    """Fetches public profile metadata for one platform.
+
+    `fetch` returns None only when the handle does not exist (the crawler then
+    skips it for weeks) and raises on transient failures; otherwise a dict
+    with the keys the ingest pipeline scores: "username", "id", "title",
+    "description", "participants_count", "fetched_at" (ISO timestamp) and
+    optionally "is_bot". The crawler runs up to `max_concurrency` fetches at
+    once per adapter and each worker pauses `delay` seconds between fetches.
+    """
+
+    platform: str
+    max_concurrency: int = 1
+    delay: float = 0.0
+
+    def normalize(self, raw_handle: str) -> str:
+        return Handle(raw_handle).normalized()
+
+    def is_valid(self, handle: str) -> bool:
+        """Whether a normalized handle can exist on the platform (imports drop the rest as junk)."""
+        return bool(handle) and not any(c.isspace() for c in handle)
+
+    def references(self, metadata: AccountMetadata) -> Set[str]:
+        """Handles on this platform that a flagged profile points to, for link discovery."""
+        return extract_references([metadata.display_name, metadata.description])
+
+    @abstractmethod
+    async def fetch(self, handle: str) -> Optional[dict]:
+        raise NotImplementedError
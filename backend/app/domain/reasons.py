@@ -0,0 +1,103 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# Default wording per (key, language); rule ids and "field.<name>" labels.
+# Seeded into reason_templates, where analysts can edit or add languages.
+DEFAULT_TEMPLATES: Dict[Tuple[str, str], str] = {
+    ("field.handle", "en"): "handle",
+    ("field.display_name", "en"): "display name",
+    ("field.description", "en"): "description",
+    ("keyword", "en"): "suspicious keyword in {field}: '{term}'",
+    ("emoji", "en"): "suspicious emoji in {field}: '{term}'",
+    ("high_risk_phrase", "en"): "high-risk phrase detected: '{term}'",
+    ("name_phrase", "en"): "suspicious phrase in display name: '{term}'",
+    ("seller", "en"): "{field} suggests seller activity (e.g. selling illegal content)",
+    ("illicit", "en"): "{field} suggests suspicious/illicit content",
+    ("handle_pattern", "en"): "account name matches public Telegram handle pattern (potential risk)",
+    ("repeated_pattern", "en"): "repeated suspicious pattern in handle and display name: '{term}'",
+    ("multiple_emoji", "en"): "multiple suspicious emojis detected",
+    ("legacy", "en"): "{term}",
+    ("field.handle", "pt"): "nome de usuário",
+    ("field.display_name", "pt"): "nome de exibição",
+    ("field.description", "pt"): "descrição",
+    ("keyword", "pt"): "palavra-chave suspeita em {field}: '{term}'",
+    ("emoji", "pt"): "emoji suspeito em {field}: '{term}'",
+    ("high_risk_phrase", "pt"): "frase de alto risco detectada: '{term}'",
+    ("name_phrase", "pt"): "frase suspeita no nome de exibição: '{term}'",
+    ("seller", "pt"): "{field} sugere atividade de venda (ex: venda de conteúdo ilegal)",
+    ("illicit", "pt"): "{field} sugere conteúdo suspeito/ilícito",
+    ("handle_pattern", "pt"): "nome de usuário corresponde ao padrão público do Telegram (risco potencial)",
+    ("repeated_pattern", "pt"): "padrão suspeito repetido no nome de usuário e no nome de exibição: '{term}'",
+    ("multiple_emoji", "pt"): "múltiplos emojis suspeitos detectados",
+    ("legacy", "pt"): "{term}",
+}
+DEFAULT_LANGUAGE = "en"
+
+
+@dataclass(frozen=True, slots=True)
+class Reason:
+    """Why a rule fired: rule id, the field it looked at and the matched term."""
+    rule: str
+    field: Optional[str] = None
+    term: Optional[str] = None
+
+    def to_code(self) -> Dict[str, str]:
+        code = {"rule": self.rule}
+        if self.field is not None:
+            code["field"] = self.field
+        if self.term is not None:
+            code["term"] = self.term
+        return code
+
+    @classmethod
+    def from_code(cls, code: Union["Reason", Dict, str]) -> "Reason":
+        if isinstance(code, Reason):
+            return code
+        if isinstance(code, str):
+            return parse_legacy(code)
+        return cls(code["rule"], code.get("field"), code.get("term"))
+
+
+def render(reason: Union[Reason, Dict, str], lang: str = DEFAULT_LANGUAGE,
+           templates: Dict[Tuple[str, str], str] = DEFAULT_TEMPLATES) -> str:
+    r = Reason.from_code(reason)
+    template = templates.get((r.rule, lang)) or templates.get((r.rule, DEFAULT_LANGUAGE)) or r.rule
+    field = ""
+    if r.field:
+        field = templates.get((f"field.{r.field}", lang)) or templates.get((f"field.{r.field}", DEFAULT_LANGUAGE)) or r.field
+    return template.format(field=field, term=r.term or "")
+
+
+def render_all(reasons: Optional[Iterable], lang: str = DEFAULT_LANGUAGE,
+               templates: Dict[Tuple[str, str], str] = DEFAULT_TEMPLATES) -> List[str]:
+    return [render(r, lang, templates) for r in reasons or ()]
+
+
+def _legacy_patterns() -> Tuple[List[Tuple[str, "re.Pattern"]], Dict[str, str]]:
+    labels = {v: k.split(".", 1)[1] for (k, lang), v in DEFAULT_TEMPLATES.items() if k.startswith("field.") and lang == "en"}
+    labels["account name"] = "handle"
+    field_alt = "|".join(re.escape(label) for label in sorted(labels, key=len, reverse=True))
+    patterns = []
+    for (rule, lang), template in DEFAULT_TEMPLATES.items():
+        if lang != "en" or rule.startswith("field.") or rule == "legacy":
+            continue
+        rx = re.escape(template).replace(r"\{field\}", f"(?P<field>{field_alt})").replace(r"\{term\}", "(?P<term>.*)")
+        patterns.append((rule, re.compile(f"^{rx}$")))
+    return patterns, labels
+
+
+_LEGACY_PATTERNS, _LEGACY_LABELS = _legacy_patterns()
+# rules whose sentence names the field in fixed wording
+_IMPLIED_FIELDS = {"name_phrase": "display_name", "handle_pattern": "handle"}
+
+
+def parse_legacy(text: str) -> Reason:
+    """Map a reason sentence stored before reason codes existed back to its code."""
+    for rule, rx in _LEGACY_PATTERNS:
+        m = rx.match(text)
+        if m:
+            groups = m.groupdict()
+            field = _LEGACY_LABELS[groups["field"]] if groups.get("field") else _IMPLIED_FIELDS.get(rule)
+            return Reason(rule, field, groups.get("term"))
+    return Reason("legacy", term=text)
@@ -4,13 +4,17 @@ from app.domain.entities import FlaggedAccount, AccountMetadata
 
 class AccountRepository(ABC):
     @abstractmethod
-    async def save(self, entity: FlaggedAccount) -> FlaggedAccount:
+    async def save(self, entity: FlaggedAccount, notify: bool = True) -> FlaggedAccount:
         raise NotImplementedError
 
     @abstractmethod
     async def list_flagged(self, limit: int = 100) -> List[FlaggedAccount]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def list_flagged_rows(self, limit: int = 100, reason: Optional[dict] = None) -> List[tuple]:
+        raise NotImplementedError
+
     @abstractmethod
     async def find_by_handle(self, platform: str, handle: str) -> Optional[FlaggedAccount]:
         raise NotImplementedError
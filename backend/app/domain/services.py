@@ -1,6 +1,8 @@
 from typing import List
 import re
 from app.domain.entities import AccountMetadata, FlaggedAccount
+from app.domain.reasons import Reason
+from app.domain.normalization import FoldedText, skeleton
 from app.domain.value_objects import RiskScore, Timestamp, Handle
 from datetime import datetime
 
@@ -17,90 +19,96 @@ SUSPICIOUS_KEYWORDS = [
     "link in bio","cp","hot","links","estupr0","rape","vendo","psel","megalink"
 ]
 SUSPICIOUS_EMOJI = ["🔥", "💦", "🔞", "🔒","📁","💥","🔗","🥵"]
+# Accounts scoring at or above this are persisted as flagged
+FLAG_THRESHOLD = 0.2
 
 
-def _fuzzy_match(word, text):
-    # Simple leetspeak/obfuscation: o->0, e->3, a->4, s->$, i->1, etc.
-    leet_map = str.maketrans("oeasigbt", "0e4$1937")
-    text_norm = text.lower().translate(leet_map)
-    word_norm = word.lower().translate(leet_map)
-    return word_norm in text_norm
+# Phrases in the display name or handle that strongly suggest trading groups
+HIGH_RISK_PHRASES = [
+    "group", "mega", "megas", "dm", "cp group", "data sellar", "dm best contant", "cp status"
+]
+# Phrases in the display name (e.g., 'best deal', 'promo', 'unlimited', etc.)
+NAME_PHRASES = ["best deal", "promo", "unlimited", "status", "group", "mega", "links", "new", "cp", "hot"]
+# Keyword skeletons are folded once here; account fields once per entity (AccountMetadata.folded)
+_SKELETONS = {
+    kw: skeleton(kw)
+    for kw in SELLER_HANDLE_KEYWORDS + SUSPICIOUS_HANDLE_KEYWORDS + SUSPICIOUS_KEYWORDS + HIGH_RISK_PHRASES + NAME_PHRASES
+}
+
+
+def _matches(kw: str, text: FoldedText) -> bool:
+    """Keyword match that survives leetspeak, homoglyphs, accents and zero-width characters."""
+    return text.contains(kw, _SKELETONS.get(kw))
 
-def compute_risk_and_reasons(metadata: AccountMetadata) -> tuple[RiskScore, List[str]]:
+def compute_risk_and_reasons(metadata: AccountMetadata) -> tuple[RiskScore, List[Reason], float]:
     reasons = []
     score = 0.0
-    name = (metadata.display_name or "").lower()
-    desc = (metadata.description or "").lower()
-    handle = (metadata.handle.normalized() or "").lower()
+    folded = metadata.folded()
+    name = folded["display_name"]
+    desc = folded["description"]
+    handle = folded["handle"]
 
     # Fuzzy/obfuscated keyword matching in display name, handle, and description
     for kw in SUSPICIOUS_KEYWORDS:
-        for field, label in [(name, "display name"), (desc, "description"), (handle, "handle")]:
-            if kw in field or _fuzzy_match(kw, field):
+        for field, label in [(name, "display_name"), (desc, "description"), (handle, "handle")]:
+            if _matches(kw, field):
                 score += 0.35
-                reasons.append(f"suspicious keyword in {label}: '{kw}'")
+                reasons.append(Reason("keyword", label, kw))
 
     # Emoji/phrase detection in display name and description
     emoji_count = 0
     for em in SUSPICIOUS_EMOJI:
-        for field, label in [(metadata.display_name or "", "display name"), (metadata.description or "", "description")]:
+        for field, label in [(metadata.display_name or "", "display_name"), (metadata.description or "", "description")]:
             if em in field:
                 score += 0.35
                 emoji_count += 1
-                reasons.append(f"suspicious emoji in {label}: '{em}'")
+                reasons.append(Reason("emoji", label, em))
 
 
     # Refined: boost for group/megas/DM/CP GROUP/Data Sellar/DM BEST CONTANT
-    HIGH_RISK_PHRASES = [
-        "group", "mega", "megas", "dm", "cp group", "data sellar", "dm best contant", "cp status"
-    ]
     for phrase in HIGH_RISK_PHRASES:
-        if phrase in name or phrase in handle:
+        if _matches(phrase, name) or _matches(phrase, handle):
             score += 0.5
-            reasons.append(f"high-risk phrase detected: '{phrase}'")
+            reasons.append(Reason("high_risk_phrase", term=phrase))
 
-    # Phrase detection in display name (e.g., 'best deal', 'promo', 'unlimited', etc.)
-    PHRASES = ["best deal", "promo", "unlimited", "status", "group", "mega", "links", "new", "cp", "hot"]
-    for phrase in PHRASES:
-        if phrase in name:
+    for phrase in NAME_PHRASES:
+        if _matches(phrase, name):
             score += 0.2
-            reasons.append(f"suspicious phrase in display name: '{phrase}'")
+            reasons.append(Reason("name_phrase", "display_name", phrase))
 
     # Check for seller/suspicious keywords in handle and display name (with fuzzy)
     if metadata.platform == "telegram":
-        norm_lower = handle
-        display_name_lower = name
         # Seller in handle
-        if any(kw in norm_lower or _fuzzy_match(kw, norm_lower) for kw in SELLER_HANDLE_KEYWORDS):
+        if any(_matches(kw, handle) for kw in SELLER_HANDLE_KEYWORDS):
             score += 1.0
-            reasons.append("account name suggests seller activity (e.g. selling illegal content)")
+            reasons.append(Reason("seller", "handle"))
         # Seller in display name
-        elif any(kw in display_name_lower or _fuzzy_match(kw, display_name_lower) for kw in SELLER_HANDLE_KEYWORDS):
+        elif any(_matches(kw, name) for kw in SELLER_HANDLE_KEYWORDS):
             score += 0.8
-            reasons.append("display name suggests seller activity (e.g. selling illegal content)")
+            reasons.append(Reason("seller", "display_name"))
         # Suspicious in handle
-        elif any(kw in norm_lower or _fuzzy_match(kw, norm_lower) for kw in SUSPICIOUS_HANDLE_KEYWORDS):
+        elif any(_matches(kw, handle) for kw in SUSPICIOUS_HANDLE_KEYWORDS):
             score += 0.5
-            reasons.append("account name suggests suspicious/illicit content")
+            reasons.append(Reason("illicit", "handle"))
         # Suspicious in display name
-        elif any(kw in display_name_lower or _fuzzy_match(kw, display_name_lower) for kw in SUSPICIOUS_HANDLE_KEYWORDS):
+        elif any(_matches(kw, name) for kw in SUSPICIOUS_HANDLE_KEYWORDS):
             score += 0.4
-            reasons.append("display name suggests suspicious/illicit content")
+            reasons.append(Reason("illicit", "display_name"))
         # Generic Telegram handle pattern
-        elif re.match(r"^[A-Za-z0-9_]{5,32}$", handle):
+        elif re.match(r"^[A-Za-z0-9_]{5,32}$", handle.lower):
             score += 0.25
-            reasons.append("account name matches public Telegram handle pattern (potential risk)")
+            reasons.append(Reason("handle_pattern", "handle"))
 
     # Boost risk if repeated patterns in handle and display name
     for kw in SELLER_HANDLE_KEYWORDS + SUSPICIOUS_HANDLE_KEYWORDS:
-        if (kw in handle or _fuzzy_match(kw, handle)) and (kw in name or _fuzzy_match(kw, name)):
+        if _matches(kw, handle) and _matches(kw, name):
             score += 0.3
-            reasons.append(f"repeated suspicious pattern in handle and display name: '{kw}'")
+            reasons.append(Reason("repeated_pattern", term=kw))
 
     # Boost risk for multiple suspicious emojis
     if emoji_count >= 2:
         score += 0.2
-        reasons.append("multiple suspicious emojis detected")
+        reasons.append(Reason("multiple_emoji"))
 
     rs = RiskScore(score).clamp()
     return rs, reasons, score  # return both normalized and raw
@@ -114,7 +122,7 @@ def create_flagged_from_metadata(metadata: AccountMetadata) -> FlaggedAccount:
         risk_score=rs,
         reasons=reasons,
         created_at=now,
-        last_seen=now
+        last_seen=now,
+        raw_risk_score=raw_score  # kept for reporting
     )
-    fa._raw_risk_score = raw_score  # attach for reporting
     return fa
@@ -0,0 +1,74 @@
+import hashlib
+import random
+import re
+from array import array
+from typing import Iterable, List, Optional, Set
+from app.domain.entities import AccountMetadata
+
+# 64 hash functions split in 16 bands of 4 rows: pairs above ~0.5 Jaccard
+# similarity share at least one band bucket with high probability.
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+# fixed seed: signatures must be stable across processes and restarts
+_rng = random.Random(0x45756D)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+_WS = re.compile(r"\s+")
+
+
+def _hash64(s: str) -> int:
+    return int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little")
+
+
+def shingles(metadata: AccountMetadata, k: int = SHINGLE_SIZE) -> Set[str]:
+    """Character k-grams over handle, display name and description."""
+    out: Set[str] = set()
+    fields = [metadata.handle.normalized(), metadata.display_name or "", metadata.description or ""]
+    for field in fields:
+        text = _WS.sub(" ", field.lower()).strip()
+        if len(text) < k:
+            if text:
+                out.add(text)
+            continue
+        out.update(text[i:i + k] for i in range(len(text) - k + 1))
+    return out
+
+
+def minhash(tokens: Iterable[str]) -> Optional[array]:
+    """MinHash signature of a token set, or None for an empty set."""
+    hashes = [_hash64(t) for t in tokens]
+    if not hashes:
+        return None
+    sig = array("Q")
+    for a, b in _PERMUTATIONS:
+        sig.append(min((a * h + b) % _MERSENNE_PRIME for h in hashes))
+    return sig
+
+
+def band_buckets(sig: array) -> List[int]:
+    """One signed 64-bit bucket key per band (fits a BIGINT column)."""
+    keys = []
+    for band in range(BANDS):
+        chunk = sig[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes()
+        keys.append(int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "little", signed=True))
+    return keys
+
+
+def estimated_jaccard(a: array, b: array) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def signature_to_bytes(sig: array) -> bytes:
+    return sig.tobytes()
+
+
+def signature_from_bytes(raw: bytes) -> array:
+    sig = array("Q")
+    sig.frombytes(raw)
+    return sig
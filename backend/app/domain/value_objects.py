@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Optional
 from datetime import datetime
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Handle:
     value: str
 
@@ -14,7 +14,7 @@ class Handle:
             v = v[1:]
         return v.lower()
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RiskScore:
     value: float
 
@@ -22,6 +22,6 @@ class RiskScore:
         v = max(0.0, min(1.0, float(self.value)))
         return RiskScore(round(v, 3))
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Timestamp:
     value: datetime
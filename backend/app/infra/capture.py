@@ -0,0 +1,222 @@
+import base64
+import bisect
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+# Raw fetches are only recorded when this is set (or capture is enabled explicitly)
+CAPTURE_DIR = os.environ.get("EUMENIDES_CAPTURE_DIR")
+SEGMENT_BYTES = int(os.environ.get("EUMENIDES_CAPTURE_SEGMENT_MB", "64")) * 1024 * 1024
+
+# Segment: [u32 length][zlib record]... ; index: one (offset, length, captured_at ms) entry per record
+_LEN = struct.Struct("<I")
+_IDX = struct.Struct("<QIq")
+# Shared compression dictionary: records are small JSON objects with the same keys,
+# so priming zlib with them makes per-record compression worthwhile
+_ZDICT = (
+    b'{"kind": "channel", "kind": "search", "query": "handle": "captured_at": "data": {"username": '
+    b'"title": "id": "description": "participants_count": null, "fetched_at": "is_bot": false, '
+    b'"raw": {"_": "User", "_": "Channel", "_": "UserFull", "_": "ChannelFull", "about": "first_name": '
+    b'"last_name": "access_hash": "photo": "status": "verified": false, "restricted": false, "scam": false, '
+    b'"fake": false, "bot": false, "premium": false, "date": "2025-01-01T00:00:00+00:00"}}'
+)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode()
+    return str(value)
+
+
+def _compress(payload: bytes) -> bytes:
+    c = zlib.compressobj(6, zdict=_ZDICT)
+    return c.compress(payload) + c.flush()
+
+
+def _decompress(blob) -> bytes:
+    d = zlib.decompressobj(zdict=_ZDICT)
+    return d.decompress(blob) + d.flush()
+
+
+def _index_path(segment: str) -> str:
+    return segment[:-len(".seg")] + ".idx"
+
+
+class CaptureWriter:
+    """Appends raw fetch results to rolling, compressed segment files.
+
+    Each record is compressed on its own, so segments stay append-only and
+    any record can be read back from its index entry without touching the
+    rest of the file. Index entries are written after their record; a crash
+    can at worst leave records without index entries, which rebuild_index
+    recovers.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = SEGMENT_BYTES):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._seg = None
+        self._idx = None
+        self._size = 0
+
+    def _roll(self):
+        self.close()
+        os.makedirs(self.directory, exist_ok=True)
+        name = datetime.now(timezone.utc).strftime("capture-%Y%m%dT%H%M%S%fZ.seg")
+        path = os.path.join(self.directory, name)
+        self._seg = open(path, "ab")
+        self._idx = open(_index_path(path), "ab")
+        self._size = self._seg.tell()
+
+    def append(self, kind: str, data: Dict[str, Any], raw: Optional[Any] = None, **fields):
+        captured_at = datetime.now(timezone.utc)
+        record = {"kind": kind, "captured_at": captured_at.isoformat(), **fields, "data": data}
+        if raw is not None:
+            record["raw"] = raw
+        blob = _compress(json.dumps(record, ensure_ascii=False, default=_json_default).encode())
+        with self._lock:
+            if self._seg is None or self._size >= self.segment_bytes:
+                self._roll()
+            offset = self._size + _LEN.size
+            self._seg.write(_LEN.pack(len(blob)) + blob)
+            self._seg.flush()
+            self._idx.write(_IDX.pack(offset, len(blob), int(captured_at.timestamp() * 1000)))
+            self._idx.flush()
+            self._size = offset + len(blob)
+
+    def close(self):
+        for fh in (self._seg, self._idx):
+            if fh is not None:
+                fh.close()
+        self._seg = self._idx = None
+
+
+def segments(directory: str) -> List[str]:
+    if not os.path.isdir(directory):
+        return []
+    return sorted(os.path.join(directory, n) for n in os.listdir(directory) if n.endswith(".seg"))
+
+
+def rebuild_index(segment: str) -> int:
+    """Rewrite a segment's index by scanning its length prefixes; returns the record count."""
+    entries = []
+    with open(segment, "rb") as fh:
+        data = fh.read()
+    pos = 0
+    while pos + _LEN.size <= len(data):
+        (length,) = _LEN.unpack_from(data, pos)
+        start = pos + _LEN.size
+        if start + length > len(data):
+            break  # torn write at the tail
+        try:
+            captured = json.loads(_decompress(data[start:start + length]))["captured_at"]
+            ms = int(datetime.fromisoformat(captured).timestamp() * 1000)
+        except (zlib.error, ValueError, KeyError):
+            logging.warning("Stopping index rebuild of %s at corrupt record offset %d", segment, start)
+            break
+        entries.append(_IDX.pack(start, length, ms))
+        pos = start + length
+    with open(_index_path(segment), "wb") as fh:
+        fh.write(b"".join(entries))
+    return len(entries)
+
+
+def _index_is_stale(segment: str, index_path: str) -> bool:
+    """Whether records at the end of the segment (written before a crash) are missing from its index."""
+    if not os.path.exists(index_path):
+        return True
+    size = os.path.getsize(index_path)
+    if size < _IDX.size or size % _IDX.size:
+        return True  # empty, or torn mid-entry
+    with open(index_path, "rb") as fh:
+        fh.seek(size - _IDX.size)
+        offset, length, _ = _IDX.unpack(fh.read(_IDX.size))
+    return offset + length < os.path.getsize(segment)
+
+
+def iter_records(directory: str, since: Optional[datetime] = None,
+                 until: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+    """Yield captured records in capture order, reading segments through mmap.
+
+    The index is binary-searched on capture time, so a `since` bound skips
+    straight to the first matching record of each segment.
+    """
+    since_ms = int(since.timestamp() * 1000) if since else None
+    until_ms = int(until.timestamp() * 1000) if until else None
+    for segment in segments(directory):
+        index_path = _index_path(segment)
+        if _index_is_stale(segment, index_path):
+            if os.path.getsize(segment) == 0 or rebuild_index(segment) == 0:
+                continue
+        with open(index_path, "rb") as ifh, open(segment, "rb") as sfh:
+            idx = mmap.mmap(ifh.fileno(), 0, access=mmap.ACCESS_READ)
+            seg = mmap.mmap(sfh.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                n = len(idx) // _IDX.size
+                times = _IndexTimes(idx, n)
+                if until_ms is not None and n and times[0] > until_ms:
+                    continue
+                start = bisect.bisect_left(times, since_ms) if since_ms is not None else 0
+                for i in range(start, n):
+                    offset, length, ms = _IDX.unpack_from(idx, i * _IDX.size)
+                    if until_ms is not None and ms > until_ms:
+                        break
+                    yield json.loads(_decompress(seg[offset:offset + length]))
+            finally:
+                idx.close()
+                seg.close()
+
+
+class _IndexTimes:
+    """Sequence view of the capture times in an index, for bisect."""
+
+    def __init__(self, idx, n: int):
+        self._idx = idx
+        self._n = n
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i: int) -> int:
+        return _IDX.unpack_from(self._idx, i * _IDX.size)[2]
+
+
+_writer: Optional[CaptureWriter] = None
+
+
+def get_writer() -> Optional[CaptureWriter]:
+    """The process-wide writer when capture is enabled, else None."""
+    global _writer
+    if _writer is None and CAPTURE_DIR:
+        _writer = CaptureWriter(CAPTURE_DIR)
+    return _writer
+
+
+def enabled() -> bool:
+    return get_writer() is not None
+
+
+def enable(directory: str):
+    global CAPTURE_DIR, _writer
+    CAPTURE_DIR = directory
+    _writer = CaptureWriter(directory)
+
+
+def record(kind: str, data: Dict[str, Any], raw: Optional[Any] = None, **fields):
+    """Capture a fetch result if capture is enabled; never raises into the crawler."""
+    writer = get_writer()
+    if writer is None:
+        return
+    try:
+        writer.append(kind, data, raw, **fields)
+    except Exception:
+        logging.exception("Failed to capture %s record", kind)
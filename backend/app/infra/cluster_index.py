@@ -0,0 +1,195 @@
+import argparse
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select, delete, update, tuple_, func, text
+from sqlalchemy.dialects.postgresql import insert
+from app.db import AsyncSessionLocal
+from app.models import FlaggedAccount as ORMFlagged, AccountSignature, LshBucket, AccountCluster
+from app.domain.entities import AccountMetadata
+from app.domain.value_objects import Handle
+from app.domain import similarity
+
+# Minimum estimated Jaccard similarity for two accounts to join the same cluster
+CLUSTER_THRESHOLD = 0.5
+# Upper bound on candidates checked per save, guards against very crowded buckets
+MAX_CANDIDATES = 500
+
+
+async def index_account(session, account_id: int, metadata: AccountMetadata) -> Optional[int]:
+    """Update the LSH index for one account and merge it into matching clusters.
+
+    Runs inside the caller's session/transaction. Clusters only ever merge; an
+    account whose text drifts away keeps its cluster id. The cluster id is the
+    smallest account id in the cluster.
+    """
+    sig = similarity.minhash(similarity.shingles(metadata))
+    if sig is None:
+        return None
+    buckets = similarity.band_buckets(sig)
+
+    await session.execute(delete(LshBucket).where(LshBucket.account_id == account_id))
+    await session.execute(
+        insert(LshBucket).on_conflict_do_nothing(),
+        [{"band": band, "bucket": bucket, "account_id": account_id} for band, bucket in enumerate(buckets)],
+    )
+    await session.execute(
+        insert(AccountSignature)
+        .values(account_id=account_id, signature=similarity.signature_to_bytes(sig))
+        .on_conflict_do_update(index_elements=[AccountSignature.account_id], set_={"signature": similarity.signature_to_bytes(sig)})
+    )
+
+    # candidates share at least one band bucket; verify them against the stored signatures
+    keys = list(enumerate(buckets))
+    cand_stmt = (
+        select(AccountSignature.account_id, AccountSignature.signature)
+        .where(
+            AccountSignature.account_id.in_(
+                select(LshBucket.account_id)
+                .where(tuple_(LshBucket.band, LshBucket.bucket).in_(keys), LshBucket.account_id != account_id)
+                .distinct()
+                .limit(MAX_CANDIDATES)
+            )
+        )
+    )
+    res = await session.execute(cand_stmt)
+    matches = [
+        other_id for other_id, raw in res.all()
+        if similarity.estimated_jaccard(sig, similarity.signature_from_bytes(raw)) >= CLUSTER_THRESHOLD
+    ]
+
+    if not matches:
+        # a lone account is not a cluster; keep an existing membership (clusters only merge)
+        res = await session.execute(select(AccountCluster.cluster_id).where(AccountCluster.account_id == account_id))
+        return res.scalar_one_or_none()
+    res = await session.execute(
+        select(AccountCluster.account_id, AccountCluster.cluster_id)
+        .where(AccountCluster.account_id.in_(matches + [account_id]))
+    )
+    target, merged, rows = assignment(account_id, matches, dict(res.all()))
+    if merged:
+        await session.execute(
+            update(AccountCluster).where(AccountCluster.cluster_id.in_(merged)).values(cluster_id=target)
+        )
+    if rows:
+        stmt = insert(AccountCluster)
+        await session.execute(
+            stmt.on_conflict_do_update(index_elements=[AccountCluster.account_id], set_={"cluster_id": stmt.excluded.cluster_id}),
+            rows,
+        )
+    return target
+
+
+def assignment(account_id: int, matches: List[int], current: Dict[int, int]) -> Tuple[int, List[int], List[Dict]]:
+    """Merge plan for an account and its matches: (target cluster id, cluster ids merged into it, rows to upsert).
+
+    `current` maps already clustered accounts among them to their cluster id.
+    Only called with at least one match, so every persisted cluster has two or more members.
+    """
+    cluster_ids = set(current.values()) | set(matches) | {account_id}
+    target = min(cluster_ids)
+    merged = sorted(c for c in set(current.values()) if c != target)
+    rows = [{"account_id": a, "cluster_id": target} for a in matches + [account_id] if current.get(a) != target]
+    return target, merged, rows
+
+
+async def prune_singletons(session_factory=AsyncSessionLocal) -> int:
+    """One-off cleanup: drop one-member clusters written before lone accounts stopped getting a cluster row.
+
+    Run once after upgrading (`python -m app.infra.cluster_index --prune-singletons`); returns rows removed.
+    """
+    async with session_factory() as session:
+        res = await session.execute(text(
+            "DELETE FROM account_clusters WHERE cluster_id IN "
+            "(SELECT cluster_id FROM account_clusters GROUP BY cluster_id HAVING count(*) = 1)"
+        ))
+        await session.commit()
+    return res.rowcount
+
+
+async def cluster_ids_for(account_ids: Iterable[int], session_factory=AsyncSessionLocal) -> Dict[int, int]:
+    """Cluster id of each account that shares a cluster with at least one other account."""
+    ids = list(account_ids)
+    if not ids:
+        return {}
+    async with session_factory() as session:
+        shared = (
+            select(AccountCluster.cluster_id)
+            .group_by(AccountCluster.cluster_id)
+            .having(func.count() >= 2)
+        )
+        res = await session.execute(
+            select(AccountCluster.account_id, AccountCluster.cluster_id)
+            .where(AccountCluster.account_id.in_(ids), AccountCluster.cluster_id.in_(shared))
+        )
+        return dict(res.all())
+
+
+async def cluster_of(platform: str, handle: str, session_factory=AsyncSessionLocal) -> Tuple[Optional[int], List[Tuple]]:
+    """Cluster id and members (id, platform, handle, display_name, risk_score) of one account."""
+    async with session_factory() as session:
+        res = await session.execute(
+            select(AccountCluster.cluster_id)
+            .join(ORMFlagged, ORMFlagged.id == AccountCluster.account_id)
+            .where(ORMFlagged.platform == platform, ORMFlagged.handle == handle)
+        )
+        cluster_id = res.scalar_one_or_none()
+        if cluster_id is None:
+            return None, []
+        res = await session.execute(
+            select(ORMFlagged.id, ORMFlagged.platform, ORMFlagged.handle, ORMFlagged.display_name, ORMFlagged.risk_score)
+            .join(AccountCluster, AccountCluster.account_id == ORMFlagged.id)
+            .where(AccountCluster.cluster_id == cluster_id)
+            .order_by(ORMFlagged.risk_score.desc())
+        )
+        return cluster_id, res.tuples().all()
+
+
+async def largest_clusters(limit: int = 50, min_size: int = 2, session_factory=AsyncSessionLocal) -> List[Tuple]:
+    """(cluster_id, size, max_risk_score) of the biggest clusters."""
+    async with session_factory() as session:
+        size = func.count(AccountCluster.account_id).label("size")
+        res = await session.execute(
+            select(AccountCluster.cluster_id, size, func.max(ORMFlagged.risk_score).label("max_risk_score"))
+            .join(ORMFlagged, ORMFlagged.id == AccountCluster.account_id)
+            .group_by(AccountCluster.cluster_id)
+            .having(func.count(AccountCluster.account_id) >= min_size)
+            .order_by(size.desc())
+            .limit(limit)
+        )
+        return res.tuples().all()
+
+
+async def reindex_all(batch_size: int = 1000, session_factory=AsyncSessionLocal):
+    """Backfill the index for accounts saved before clustering existed."""
+    last_id = 0
+    while True:
+        async with session_factory() as session:
+            res = await session.execute(
+                select(ORMFlagged.id, ORMFlagged.platform, ORMFlagged.handle, ORMFlagged.display_name, ORMFlagged.description)
+                .where(ORMFlagged.id > last_id)
+                .order_by(ORMFlagged.id)
+                .limit(batch_size)
+            )
+            rows = res.all()
+            if not rows:
+                return
+            for account_id, platform, handle, display_name, description in rows:
+                md = AccountMetadata(platform=platform, handle=Handle(handle), display_name=display_name,
+                                     description=description, extra={}, fetched_at=None)
+                await index_account(session, account_id, md)
+            await session.commit()
+            last_id = rows[-1][0]
+            logging.info("Clustered accounts up to id %s", last_id)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Backfill the account cluster index")
+    parser.add_argument("--prune-singletons", action="store_true",
+                        help="instead, drop one-member clusters left by older versions (run once after upgrading)")
+    args = parser.parse_args()
+    if args.prune_singletons:
+        print(f"Removed {asyncio.run(prune_singletons())} one-member cluster rows")
+    else:
+        asyncio.run(reindex_all())
@@ -3,20 +3,41 @@ import json
 import hmac
 import hashlib
 from datetime import datetime
-from typing import Any, Dict
-from cryptography.fernet import Fernet
+from typing import Any, Dict, List, Optional
+from app.domain.value_objects import Handle
 from app.infra.event_bus import event_bus
+from app.infra.export_index import ExportIndex
 
 EXPORT_DIR = os.environ.get("EUMENIDES_EXPORT_DIR", "/app/secure_exports")
 EXPORT_KEY = os.environ.get("EXPORT_KEY")
 HMAC_KEY = os.environ.get("EXPORT_HMAC_KEY", "change-me-hmac-key")
 
-os.makedirs(EXPORT_DIR, exist_ok=True)
+_fernet = None
+_export_dir_ready = False
+_index: Optional[ExportIndex] = None
 
-def _get_fernet() -> Fernet:
-    if not EXPORT_KEY:
-        raise RuntimeError("EXPORT_KEY env var not set. Generate via Fernet.generate_key().")
-    return Fernet(EXPORT_KEY.encode())
+def _ensure_export_dir() -> str:
+    global _export_dir_ready
+    if not _export_dir_ready:
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        _export_dir_ready = True
+    return EXPORT_DIR
+
+def _get_fernet():
+    # cryptography is only imported once the first export is written
+    global _fernet
+    if _fernet is None:
+        if not EXPORT_KEY:
+            raise RuntimeError("EXPORT_KEY env var not set. Generate via Fernet.generate_key().")
+        from cryptography.fernet import Fernet
+        _fernet = Fernet(EXPORT_KEY.encode())
+    return _fernet
+
+def _get_index() -> ExportIndex:
+    global _index
+    if _index is None:
+        _index = ExportIndex(os.path.join(_ensure_export_dir(), "index.sqlite"))
+    return _index
 
 def _hmac_of_handle(handle: str) -> str:
     return hmac.new(HMAC_KEY.encode(), handle.encode(), hashlib.sha256).hexdigest()
@@ -47,7 +68,7 @@ def _write_encrypted_file(payload: Dict[str, Any], handle_normalized: str) -> st
     timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
     safe_handle = handle_normalized.replace("/", "_")[:60] if handle_normalized else "unknown"
     filename = f"{timestamp}_{safe_handle}.json.enc"
-    path = os.path.join(EXPORT_DIR, filename)
+    path = os.path.join(_ensure_export_dir(), filename)
     with open(path, "wb") as fh:
         fh.write(token)
     try:
@@ -57,7 +78,7 @@ def _write_encrypted_file(payload: Dict[str, Any], handle_normalized: str) -> st
     return path
 
 def _append_index_record(encrypted_path: str, handle: str):
-    idx_path = os.path.join(EXPORT_DIR, "index.audit.log")
+    idx_path = os.path.join(_ensure_export_dir(), "index.audit.log")
     record = {
         "time": datetime.utcnow().isoformat() + "Z",
         "file": os.path.basename(encrypted_path),
@@ -69,6 +90,22 @@ def _append_index_record(encrypted_path: str, handle: str):
         os.chmod(idx_path, 0o600)
     except Exception:
         pass
+    # the log is written first so a crash here is repaired by rebuild_index()
+    _get_index().add(record["handle_hmac"], record["time"], record["file"])
+
+def rebuild_index() -> int:
+    """Re-populate the lookup index from index.audit.log."""
+    return _get_index().rebuild_from_log(os.path.join(_ensure_export_dir(), "index.audit.log"))
+
+def find_exports(handle: str, since: Optional[str] = None) -> List[Dict[str, str]]:
+    """Exports written for a handle (normalized form), newest first."""
+    rows = _get_index().find(_hmac_of_handle(handle), since=since)
+    return [{"time": t, "file": f} for t, f in rows]
+
+def decrypt_export(filename: str) -> Dict[str, Any]:
+    path = os.path.join(_ensure_export_dir(), os.path.basename(filename))
+    with open(path, "rb") as fh:
+        return json.loads(_get_fernet().decrypt(fh.read()))
 
 def handle_account_flagged(payload: dict):
     try:
@@ -83,3 +120,20 @@ def handle_account_flagged(payload: dict):
 def subscribe():
     event_bus.subscribe("AccountFlagged", lambda p: handle_account_flagged(p))
     print("[export_adapter] subscribed to AccountFlagged events")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Query the encrypted export index")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("rebuild", help="rebuild index.sqlite from index.audit.log")
+    lookup = sub.add_parser("lookup", help="list (and optionally decrypt) exports of a handle")
+    lookup.add_argument("handle")
+    lookup.add_argument("--decrypt", action="store_true")
+    args = parser.parse_args()
+    if args.cmd == "rebuild":
+        print(f"Indexed {rebuild_index()} new records")
+    else:
+        for rec in find_exports(Handle(args.handle).normalized()):
+            if args.decrypt:
+                rec["payload"] = decrypt_export(rec["file"])
+            print(json.dumps(rec, ensure_ascii=False))
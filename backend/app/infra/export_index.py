@@ -0,0 +1,96 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exports (
+    id INTEGER PRIMARY KEY,
+    handle_hmac TEXT NOT NULL,
+    time TEXT NOT NULL,
+    file TEXT NOT NULL UNIQUE
+);
+CREATE INDEX IF NOT EXISTS ix_exports_handle_time ON exports (handle_hmac, time);
+"""
+
+
+class ExportIndex:
+    """SQLite lookup table of encrypted exports keyed by handle HMAC and time.
+
+    index.audit.log stays the source of truth; this store can always be
+    rebuilt from it. Lookups use the (handle_hmac, time) B-tree, so they do
+    not slow down as the export directory grows.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            try:
+                os.chmod(self.path, 0o600)
+            except Exception:
+                pass
+            self._conn = conn
+        return self._conn
+
+    def add(self, handle_hmac: str, time: str, file: str):
+        self.add_many([(handle_hmac, time, file)])
+
+    def add_many(self, records: Iterable[Tuple[str, str, str]]) -> int:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            try:
+                cur = conn.executemany(
+                    "INSERT OR IGNORE INTO exports (handle_hmac, time, file) VALUES (?, ?, ?)", records
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            return cur.rowcount
+
+    def find(self, handle_hmac: str, since: Optional[str] = None, limit: int = 1000) -> List[Tuple[str, str]]:
+        """(time, file) pairs for one handle, newest first."""
+        with self._lock:
+            conn = self._connect()
+            if since:
+                rows = conn.execute(
+                    "SELECT time, file FROM exports WHERE handle_hmac = ? AND time >= ? ORDER BY time DESC LIMIT ?",
+                    (handle_hmac, since, limit),
+                )
+            else:
+                rows = conn.execute(
+                    "SELECT time, file FROM exports WHERE handle_hmac = ? ORDER BY time DESC LIMIT ?",
+                    (handle_hmac, limit),
+                )
+            return rows.fetchall()
+
+    def rebuild_from_log(self, log_path: str, batch_size: int = 10000) -> int:
+        """Re-index every record of an audit log; already indexed files are skipped."""
+        if not os.path.exists(log_path):
+            return 0
+        added, batch = 0, []
+        with open(log_path, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    rec = json.loads(line)
+                    batch.append((rec["handle_hmac"], rec["time"], rec["file"]))
+                except (ValueError, KeyError):
+                    logging.warning("Skipping malformed audit log line: %r", line[:200])
+                    continue
+                if len(batch) >= batch_size:
+                    added += self.add_many(batch)
+                    batch = []
+        if batch:
+            added += self.add_many(batch)
+        return added
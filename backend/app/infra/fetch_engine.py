@@ -0,0 +1,209 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from app.infra.rate_limit import TokenBucket
+
+PER_HOST_CONCURRENCY = int(os.environ.get("EUMENIDES_FETCH_PER_HOST", "4"))
+PER_HOST_RATE = float(os.environ.get("EUMENIDES_FETCH_RATE", "2"))  # requests per second per host
+MAX_CONNECTIONS = int(os.environ.get("EUMENIDES_FETCH_MAX_CONNECTIONS", "100"))
+CACHE_TTL = float(os.environ.get("EUMENIDES_FETCH_CACHE_TTL", "300"))
+CACHE_ENTRIES = int(os.environ.get("EUMENIDES_FETCH_CACHE_ENTRIES", "2048"))
+RETRIES = int(os.environ.get("EUMENIDES_FETCH_RETRIES", "3"))
+TIMEOUT = float(os.environ.get("EUMENIDES_FETCH_TIMEOUT", "15"))
+USER_AGENT = os.environ.get("EUMENIDES_FETCH_USER_AGENT", "eumenides-crawler/0.1")
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+@dataclass(slots=True)
+class FetchResult:
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    from_cache: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def text(self) -> str:
+        return self.body.decode(_charset(self.headers.get("content-type", "")), errors="replace")
+
+    def json(self):
+        return json.loads(self.body)
+
+
+def _charset(content_type: str) -> str:
+    for part in content_type.split(";")[1:]:
+        key, _, value = part.strip().partition("=")
+        if key.lower() == "charset" and value:
+            return value.strip('"')
+    return "utf-8"
+
+
+@dataclass(slots=True)
+class _Host:
+    slots: asyncio.Semaphore
+    bucket: TokenBucket
+    # a 429's Retry-After holds back every request to the host, not just the one retried
+    paused_until: float = 0.0
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    result: FetchResult
+    expires: float
+    validators: Dict[str, str] = field(default_factory=dict)
+
+
+class FetchEngine:
+    """Shared HTTP fetcher for platform adapters.
+
+    One pooled keep-alive client serves every adapter; each host gets its own
+    concurrency slots and token bucket, so a slow or strict site never holds
+    up the others. Successful GETs are cached for `cache_ttl` seconds and
+    revalidated with ETag/Last-Modified afterwards. Transport errors, 429 and
+    5xx are retried with jittered exponential backoff, honouring Retry-After.
+    """
+
+    def __init__(self, per_host_concurrency: int = PER_HOST_CONCURRENCY, per_host_rate: float = PER_HOST_RATE,
+                 cache_ttl: float = CACHE_TTL, cache_entries: int = CACHE_ENTRIES, retries: int = RETRIES,
+                 timeout: float = TIMEOUT, max_connections: int = MAX_CONNECTIONS):
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_rate = per_host_rate
+        self.cache_ttl = cache_ttl
+        self.cache_entries = cache_entries
+        self.retries = retries
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client = None
+        self._hosts: Dict[str, _Host] = {}
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _get_client(self):
+        if self._client is None:
+            import httpx
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_connections)
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=limits, follow_redirects=True,
+                                             headers={"User-Agent": USER_AGENT})
+        return self._client
+
+    def _host(self, url: str) -> _Host:
+        netloc = urlsplit(url).netloc
+        host = self._hosts.get(netloc)
+        if host is None:
+            host = self._hosts[netloc] = _Host(asyncio.Semaphore(self.per_host_concurrency),
+                                               TokenBucket(self.per_host_rate, max(1.0, self.per_host_rate)))
+        return host
+
+    def _cached(self, url: str) -> Tuple[Optional[FetchResult], Dict[str, str]]:
+        entry = self._cache.get(url)
+        if entry is None:
+            return None, {}
+        if entry.expires > time.monotonic():
+            self._cache.move_to_end(url)
+            return entry.result, {}
+        return None, entry.validators
+
+    def _store(self, url: str, result: FetchResult):
+        validators = {}
+        if "etag" in result.headers:
+            validators["If-None-Match"] = result.headers["etag"]
+        if "last-modified" in result.headers:
+            validators["If-Modified-Since"] = result.headers["last-modified"]
+        self._cache[url] = _CacheEntry(result, time.monotonic() + self.cache_ttl, validators)
+        self._cache.move_to_end(url)
+        while len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None, use_cache: bool = True) -> FetchResult:
+        """GET a URL through the cache; concurrent requests for the same URL share one fetch."""
+        if use_cache:
+            hit, _ = self._cached(url)
+            if hit is not None:
+                return FetchResult(hit.url, hit.status, hit.headers, hit.body, from_cache=True)
+            pending = self._inflight.get(url)
+            if pending is not None:
+                return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        if use_cache:
+            self._inflight[url] = future
+        try:
+            result = await self._fetch(url, headers or {}, use_cache)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            if self._inflight.get(url) is future:
+                del self._inflight[url]
+
+    async def _fetch(self, url: str, headers: Dict[str, str], use_cache: bool) -> FetchResult:
+        import httpx
+        host = self._host(url)
+        _, validators = self._cached(url) if use_cache else (None, {})
+        attempt = 0
+        while True:
+            async with host.slots:
+                wait = host.paused_until - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                await host.bucket.acquire(1)
+                try:
+                    resp = await self._get_client().get(url, headers={**headers, **validators})
+                    error = None
+                except httpx.TransportError as exc:
+                    resp, error = None, exc
+            if resp is not None and resp.status_code == 304 and url in self._cache:
+                entry = self._cache[url]
+                entry.expires = time.monotonic() + self.cache_ttl
+                self._cache.move_to_end(url)
+                r = entry.result
+                return FetchResult(r.url, r.status, r.headers, r.body, from_cache=True)
+            if resp is not None and resp.status_code not in _RETRY_STATUS:
+                result = FetchResult(str(resp.url), resp.status_code, dict(resp.headers), resp.content)
+                if use_cache and result.ok:
+                    self._store(url, result)
+                return result
+            if attempt >= self.retries:
+                if error is not None:
+                    raise error
+                return FetchResult(str(resp.url), resp.status_code, dict(resp.headers), resp.content)
+            delay = min(30.0, 0.5 * 2 ** attempt) * (0.5 + random.random())
+            retry_after = resp.headers.get("retry-after") if resp is not None else None
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+                host.paused_until = max(host.paused_until, time.monotonic() + delay)
+            logging.info("Retrying %s in %.1fs (%s)", url, delay, error or f"HTTP {resp.status_code}")
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_engine: Optional[FetchEngine] = None
+
+
+def get_engine() -> FetchEngine:
+    """The process-wide engine, so every adapter shares connections, limits and cache."""
+    global _engine
+    if _engine is None:
+        _engine = FetchEngine()
+    return _engine
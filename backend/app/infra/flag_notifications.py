@@ -0,0 +1,147 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import text
+from app.infra import reason_templates
+from app.infra.event_bus import event_bus
+
+# Postgres channel carrying the id of every committed flagged_accounts write
+CHANNEL = "account_flagged"
+# Local event republished in each listening process, whichever process saved the account
+EVENT = "FlagCommitted"
+# Ids coalesced into one lookup query
+BATCH_SIZE = 200
+RECONNECT_SECONDS = 5.0
+
+
+async def notify(session, account_id: int):
+    """Queue a notification inside the caller's transaction; Postgres delivers it on commit only."""
+    await session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": str(account_id)})
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def payload_from_row(columns: Sequence[str], row: Sequence[Any]) -> Dict[str, Any]:
+    """An AccountFlagged-shaped payload from a flag list row."""
+    r = dict(zip(columns, row))
+    return {
+        "id": r["id"],
+        "platform": r["platform"],
+        "handle": r["handle"],
+        "display_name": r.get("display_name"),
+        "description": r.get("description"),
+        "risk_score": r.get("risk_score"),
+        "model_score": r.get("model_score"),
+        "reasons": reason_templates.render(r.get("reasons")),
+        "reason_codes": r.get("reasons") or [],
+        "first_seen": _iso(r.get("created_at")),
+        "last_seen": _iso(r.get("last_seen")),
+        "crawl_log": [],
+    }
+
+
+class FlagListener:
+    """LISTENs for committed flags from any process and republishes them locally as EVENT.
+
+    Notifications only carry the account id; ids are queued by the asyncpg
+    callback and a drain task looks them up in batches, so a burst of saves
+    costs one query per batch. After a reconnect, `on_gap` is called since
+    notifications sent while disconnected are lost.
+    """
+
+    def __init__(self, dsn: str, columns: Sequence[str],
+                 fetch_rows: Callable[[List[int]], Awaitable[List[Tuple]]],
+                 on_gap: Optional[Callable[[], None]] = None):
+        self.dsn = dsn
+        self.columns = tuple(columns)
+        self.fetch_rows = fetch_rows
+        self.on_gap = on_gap
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+
+    def _on_notify(self, conn, pid, channel, payload):
+        try:
+            self._queue.put_nowait(int(payload))
+        except ValueError:
+            logging.warning("[flag_notifications] ignoring payload %r", payload)
+
+    async def _listen(self):
+        import asyncpg
+        connected_before = False
+        while True:
+            try:
+                conn = await asyncpg.connect(self.dsn)
+            except Exception:
+                logging.exception("[flag_notifications] connect failed, retrying in %.0fs", RECONNECT_SECONDS)
+                await asyncio.sleep(RECONNECT_SECONDS)
+                continue
+            lost = asyncio.get_running_loop().create_future()
+            conn.add_termination_listener(lambda c: lost.done() or lost.set_result(None))
+            try:
+                await conn.add_listener(CHANNEL, self._on_notify)
+                if connected_before and self.on_gap is not None:
+                    self.on_gap()
+                connected_before = True
+                logging.info("[flag_notifications] listening on %s", CHANNEL)
+                await lost
+                logging.warning("[flag_notifications] connection lost, reconnecting")
+            except asyncio.CancelledError:
+                await conn.close()
+                raise
+            except Exception:
+                logging.exception("[flag_notifications] listener failed")
+                await asyncio.sleep(RECONNECT_SECONDS)
+            finally:
+                if not conn.is_closed():
+                    conn.terminate()
+
+    async def drain_once(self):
+        """Publish the next batch of queued ids (waits for at least one)."""
+        ids = [await self._queue.get()]
+        while len(ids) < BATCH_SIZE and not self._queue.empty():
+            ids.append(self._queue.get_nowait())
+        rows = await self.fetch_rows(sorted(set(ids)))
+        for row in rows:
+            event_bus.publish(EVENT, payload_from_row(self.columns, row))
+
+    async def _drain(self):
+        while True:
+            try:
+                await self.drain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("[flag_notifications] failed to publish committed flags")
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._listen()), loop.create_task(self._drain())]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+listener: Optional[FlagListener] = None
+
+
+def asyncpg_dsn(url) -> str:
+    """Plain libpq DSN for a SQLAlchemy URL (asyncpg does not accept the +asyncpg driver suffix)."""
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def start(dsn: str, columns: Sequence[str], fetch_rows, on_gap=None) -> FlagListener:
+    global listener
+    listener = FlagListener(dsn, columns, fetch_rows, on_gap)
+    listener.start()
+    return listener
+
+
+async def stop():
+    if listener is not None:
+        await listener.stop()
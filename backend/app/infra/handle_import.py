@@ -0,0 +1,184 @@
+import codecs
+import csv
+import gzip
+import io
+import zlib
+from collections import Counter
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Union
+from sqlalchemy import text
+from app.db import AsyncSessionLocal
+from app.domain.platforms import PlatformAdapter
+from app.infra import link_graph, platforms
+
+BATCH_SIZE = 5000
+# Imported handles rank below discovered ones (which carry their source's risk) unless told otherwise
+IMPORT_PRIORITY = 0.1
+# Longer lines can't hold a handle; they are skipped (and counted invalid) instead of buffered
+MAX_LINE_CHARS = 4096
+# Upper bound on what one gzip chunk may inflate to before its lines are consumed
+_INFLATE_CHUNK = 64 * 1024
+
+# Handles of a batch that are neither stored accounts nor already queued
+_NEW_HANDLES = text("""
+    SELECT h FROM unnest(CAST(:handles AS varchar[])) AS t(h)
+    EXCEPT SELECT handle FROM flagged_accounts WHERE platform = :platform AND handle = ANY(:handles)
+    EXCEPT SELECT handle FROM crawl_frontier WHERE platform = :platform AND handle = ANY(:handles)
+""")
+
+
+def normalize(raw: str, adapter: Optional[PlatformAdapter] = None) -> Optional[str]:
+    """The platform adapter's normalized handle, or None for blanks, comments and invalid handles."""
+    raw = raw.strip().strip('"').strip()
+    if not raw or raw.startswith("#"):
+        return None
+    adapter = adapter or platforms.get_adapter("telegram")
+    h = adapter.normalize(raw)
+    return h if adapter.is_valid(h) else None
+
+
+class _CsvColumn:
+    """Picks one CSV column (header name or index; default a 'handle' header, else the first column)."""
+
+    def __init__(self, column: Union[str, int, None] = None):
+        if isinstance(column, str) and column.isdigit():
+            column = int(column)
+        self.column = column
+        self.idx = column if isinstance(column, int) else None
+
+    def values(self, lines: Iterable[str]) -> Iterator[str]:
+        for row in csv.reader(lines):
+            if self.idx is None:
+                header = [c.strip().lower() for c in row]
+                name = (self.column or "handle").lower()
+                if name in header:
+                    self.idx = header.index(name)
+                    continue
+                self.idx = 0  # no header row: this row is data
+            if len(row) > self.idx:
+                yield row[self.idx]
+
+
+def iter_file(path: str, fmt: Optional[str] = None, column: Union[str, int, None] = None) -> Iterator[str]:
+    """Raw handle values of a text/CSV file, gzip-compressed or not, read line by line."""
+    with open(path, "rb") as probe:
+        gzipped = probe.read(2) == b"\x1f\x8b"
+    raw = gzip.open(path, "rb") if gzipped else open(path, "rb")
+    with raw, io.TextIOWrapper(raw, encoding="utf-8", errors="replace", newline="") as lines:
+        name = path[:-3] if path.endswith(".gz") else path
+        if (fmt or ("csv" if name.endswith(".csv") else "text")) == "csv":
+            yield from _CsvColumn(column).values(lines)
+        else:
+            yield from lines
+
+
+def _inflated(inflate, chunk: bytes) -> Iterator[bytes]:
+    """Decompress one chunk in bounded pieces, so a small gzip bomb can't expand in memory at once."""
+    piece = inflate.decompress(chunk, _INFLATE_CHUNK)
+    while True:
+        yield piece
+        if not inflate.unconsumed_tail:
+            break
+        piece = inflate.decompress(inflate.unconsumed_tail, _INFLATE_CHUNK)
+
+
+async def iter_body(chunks: AsyncIterator[bytes], fmt: str = "text",
+                    column: Union[str, int, None] = None) -> AsyncIterator[str]:
+    """Raw handle values from a streamed request body; gzip is detected from the first bytes.
+
+    Memory stays bounded by _INFLATE_CHUNK plus MAX_LINE_CHARS: lines longer
+    than that are dropped and yield an empty value, which imports count as invalid.
+    """
+    inflate = None
+    head = b""  # first bytes, until there are enough to spot the gzip magic
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    picker = _CsvColumn(column) if fmt == "csv" else None
+    pending = ""
+    skipping = False  # inside a line already reported as too long
+
+    def values(lines: List[str]) -> Iterator[str]:
+        too_long = sum(len(line) > MAX_LINE_CHARS for line in lines)
+        if too_long:
+            lines = [line for line in lines if len(line) <= MAX_LINE_CHARS]
+        yield from picker.values(lines) if picker else lines
+        yield from [""] * too_long
+
+    async for chunk in chunks:
+        if inflate is None:
+            head += chunk
+            if len(head) < 2:
+                continue
+            chunk = head
+            inflate = zlib.decompressobj(wbits=31) if head[:2] == b"\x1f\x8b" else False
+        for piece in (_inflated(inflate, chunk) if inflate else (chunk,)):
+            lines = (pending + decoder.decode(piece)).split("\n")
+            pending = lines.pop()
+            if skipping and lines:
+                lines.pop(0)  # the rest of the overlong line
+                skipping = False
+            for value in values(lines):
+                yield value
+            if skipping:
+                pending = ""
+            elif len(pending) > MAX_LINE_CHARS:
+                pending, skipping = "", True
+                yield ""
+    rest = inflate.flush() if inflate else head if inflate is None else b""
+    lines = (pending + decoder.decode(rest, final=True)).split("\n")
+    if skipping:
+        lines.pop(0)
+    if lines and not lines[-1]:
+        lines.pop()  # body ended with a newline
+    for value in values(lines):
+        yield value
+
+
+async def import_handles(values: Union[Iterable[str], AsyncIterator[str]], source: str, platform: str = "telegram",
+                         priority: float = IMPORT_PRIORITY, batch_size: int = BATCH_SIZE,
+                         session_factory=AsyncSessionLocal) -> Counter:
+    """Queue every handle that is not already known; memory stays at one batch.
+
+    Each batch is deduplicated in Python, then one set-based query drops
+    handles already stored or queued, and the rest go into the crawl
+    frontier. Duplicates across batches are caught by that query, because
+    earlier batches are committed to the frontier before the next one runs.
+    """
+    adapter = platforms.get_adapter(platform)
+    stats: Counter = Counter()
+    batch: List[str] = []
+    seen = set()
+
+    async def flush():
+        if not batch:
+            return
+        async with session_factory() as session:
+            res = await session.execute(_NEW_HANDLES, {"handles": batch, "platform": platform})
+            new = [r[0] for r in res.all()]
+            if new:
+                await link_graph.enqueue(session, platform, new, priority=priority, depth=0, source=f"import:{source}"[:256])
+            await session.commit()
+        stats["known"] += len(batch) - len(new)
+        stats["enqueued"] += len(new)
+        batch.clear()
+        seen.clear()
+
+    async def add(value: str):
+        stats["lines"] += 1
+        h = normalize(value, adapter)
+        if h is None:
+            stats["invalid"] += 1
+        elif h in seen:
+            stats["duplicates"] += 1
+        else:
+            seen.add(h)
+            batch.append(h)
+            if len(batch) >= batch_size:
+                await flush()
+
+    if hasattr(values, "__aiter__"):
+        async for value in values:
+            await add(value)
+    else:
+        for value in values:
+            await add(value)
+    await flush()
+    return stats
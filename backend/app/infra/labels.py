@@ -0,0 +1,61 @@
+import logging
+from typing import List, Tuple
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert
+from app.db import AsyncSessionLocal
+from app.models import AnalystLabel, FlaggedAccount as ORMFlagged
+from app.domain.entities import AccountMetadata
+from app.domain.value_objects import Handle
+
+
+async def set_label(platform: str, handle: str, label: int, session_factory=AsyncSessionLocal):
+    """Record (or overwrite) an analyst's verdict on an account."""
+    async with session_factory() as session:
+        stmt = insert(AnalystLabel).values(platform=platform, handle=handle, label=label)
+        await session.execute(stmt.on_conflict_do_update(
+            index_elements=[AnalystLabel.platform, AnalystLabel.handle],
+            set_={"label": label, "labeled_at": func.now()},
+        ))
+        await session.commit()
+
+
+def _metadata(platform, handle, display_name, description) -> AccountMetadata:
+    return AccountMetadata(platform=platform, handle=Handle(handle), display_name=display_name,
+                           description=description, extra={}, fetched_at=None)
+
+
+async def labeled_accounts(session_factory=AsyncSessionLocal) -> Tuple[List[AccountMetadata], List[int]]:
+    """Current metadata of every labeled account that is still stored, with its label."""
+    async with session_factory() as session:
+        res = await session.execute(
+            select(ORMFlagged.platform, ORMFlagged.handle, ORMFlagged.display_name, ORMFlagged.description,
+                   AnalystLabel.label)
+            .join(AnalystLabel, (AnalystLabel.platform == ORMFlagged.platform) & (AnalystLabel.handle == ORMFlagged.handle))
+        )
+        rows = res.all()
+    return [_metadata(*r[:4]) for r in rows], [int(r[4]) for r in rows]
+
+
+async def rescore_all(model, batch_size: int = 5000, session_factory=AsyncSessionLocal, top_k: int = 5) -> int:
+    """Write model scores for every stored account, one batch inference and bulk update per batch."""
+    last_id, total = 0, 0
+    while True:
+        async with session_factory() as session:
+            res = await session.execute(
+                select(ORMFlagged.id, ORMFlagged.platform, ORMFlagged.handle, ORMFlagged.display_name, ORMFlagged.description)
+                .where(ORMFlagged.id > last_id)
+                .order_by(ORMFlagged.id)
+                .limit(batch_size)
+            )
+            rows = res.all()
+            if not rows:
+                return total
+            scored = model.score_batch([_metadata(*r[1:]) for r in rows], top_k=top_k)
+            await session.execute(update(ORMFlagged), [
+                {"id": r[0], "model_score": score, "model_features": feats}
+                for r, (score, feats) in zip(rows, scored)
+            ])
+            await session.commit()
+        total += len(rows)
+        last_id = rows[-1][0]
+        logging.info("Rescored accounts up to id %s", last_id)
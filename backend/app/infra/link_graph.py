@@ -0,0 +1,118 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import select, update, func, text, or_, and_
+from sqlalchemy.dialects.postgresql import insert
+from app.db import AsyncSessionLocal
+from app.models import AccountLink, CrawlFrontier
+
+# Links are followed at most this many hops away from a seed handle
+MAX_DEPTH = int(os.environ.get("EUMENIDES_DISCOVERY_MAX_DEPTH", "2"))
+# Priority of a discovered handle is source risk * DECAY ** depth
+DEPTH_DECAY = 0.5
+# Claimed handles whose crawler died are handed out again after this long
+CLAIM_LEASE = timedelta(seconds=int(os.environ.get("EUMENIDES_FRONTIER_LEASE_SECONDS", "1800")))
+
+
+class LinkDiscovery:
+    """Stores reference edges and feeds unseen targets into the crawl frontier."""
+
+    def __init__(self, session_factory=AsyncSessionLocal, max_depth: int = MAX_DEPTH):
+        self._session_factory = session_factory
+        self.max_depth = max_depth
+
+    async def record(self, platform: str, src_handle: str, targets: Iterable[str], source_score: float, depth: int):
+        targets = sorted({t for t in targets if t and t != src_handle})
+        if not targets:
+            return
+        async with self._session_factory() as session:
+            await session.execute(
+                insert(AccountLink).on_conflict_do_nothing(),
+                [{"platform": platform, "src_handle": src_handle, "dst_handle": t} for t in targets],
+            )
+            if depth + 1 <= self.max_depth:
+                await enqueue(session, platform, targets, priority=source_score * DEPTH_DECAY ** (depth + 1),
+                              depth=depth + 1, source=src_handle)
+            await session.commit()
+
+
+async def enqueue(session, platform: str, handles: List[str], priority: float, depth: int, source: Optional[str]):
+    """Add handles to the frontier; a pending handle keeps the best priority/shallowest depth it was offered."""
+    stmt = insert(CrawlFrontier)
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[CrawlFrontier.platform, CrawlFrontier.handle],
+            set_={
+                "priority": func.greatest(CrawlFrontier.priority, stmt.excluded.priority),
+                "depth": func.least(CrawlFrontier.depth, stmt.excluded.depth),
+            },
+            where=CrawlFrontier.status == "pending",
+        ),
+        [{"platform": platform, "handle": h, "priority": priority, "depth": depth, "source": source} for h in handles],
+    )
+
+
+async def claim(limit: int = 50, platform: str = "telegram", session_factory=AsyncSessionLocal) -> List[Tuple[str, int]]:
+    """Take the highest-priority pending (or lease-expired) handles as (handle, depth); safe across concurrent crawlers."""
+    now = datetime.now(timezone.utc)
+    async with session_factory() as session:
+        picked = (
+            select(CrawlFrontier.platform, CrawlFrontier.handle)
+            .where(CrawlFrontier.platform == platform, or_(
+                CrawlFrontier.status == "pending",
+                # rows claimed before claimed_at existed have no lease to wait for
+                and_(CrawlFrontier.status == "claimed",
+                     or_(CrawlFrontier.claimed_at.is_(None), CrawlFrontier.claimed_at < now - CLAIM_LEASE)),
+            ))
+            .order_by(CrawlFrontier.priority.desc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("picked")
+        )
+        res = await session.execute(
+            update(CrawlFrontier)
+            .where(CrawlFrontier.platform == picked.c.platform, CrawlFrontier.handle == picked.c.handle)
+            .values(status="claimed", claimed_at=now)
+            .returning(CrawlFrontier.handle, CrawlFrontier.depth, CrawlFrontier.priority)
+        )
+        rows = sorted(res.all(), key=lambda r: -r[2])
+        await session.commit()
+        return [(h, d) for h, d, _ in rows]
+
+
+async def mark_done(handles: Iterable[str], platform: str = "telegram", session_factory=AsyncSessionLocal):
+    handles = list(handles)
+    if not handles:
+        return
+    async with session_factory() as session:
+        await session.execute(
+            update(CrawlFrontier)
+            .where(CrawlFrontier.platform == platform, CrawlFrontier.handle.in_(handles))
+            .values(status="done")
+        )
+        await session.commit()
+
+
+async def neighborhood(platform: str, handle: str, depth: int = 2, limit: int = 500,
+                       session_factory=AsyncSessionLocal) -> List[Tuple]:
+    """Edges (src_handle, dst_handle, hops) within `depth` hops of a handle, in either direction."""
+    sql = text("""
+        WITH RECURSIVE walk(node, hops) AS (
+            SELECT CAST(:handle AS varchar), 0
+            UNION
+            SELECT CASE WHEN l.src_handle = w.node THEN l.dst_handle ELSE l.src_handle END, w.hops + 1
+            FROM walk w
+            JOIN account_links l ON l.platform = :platform AND (l.src_handle = w.node OR l.dst_handle = w.node)
+            WHERE w.hops < :depth
+        ),
+        nodes AS (SELECT node, min(hops) AS hops FROM walk GROUP BY node LIMIT :limit)
+        SELECT l.src_handle, l.dst_handle, GREATEST(s.hops, d.hops) AS hops
+        FROM account_links l
+        JOIN nodes s ON s.node = l.src_handle
+        JOIN nodes d ON d.node = l.dst_handle
+        WHERE l.platform = :platform
+        ORDER BY hops, l.src_handle, l.dst_handle
+    """)
+    async with session_factory() as session:
+        res = await session.execute(sql, {"platform": platform, "handle": handle, "depth": depth, "limit": limit})
+        return res.all()
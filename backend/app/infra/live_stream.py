@@ -0,0 +1,146 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+from app.infra.event_bus import event_bus
+from app.infra import flag_notifications
+
+# How many recent events are kept so reconnecting clients can resume via Last-Event-ID
+REPLAY_BUFFER_SIZE = 1000
+# Per-client queue bound; a client that falls this far behind is dropped
+CLIENT_BUFFER_SIZE = 256
+HEARTBEAT_SECONDS = 15.0
+_RESET = b"event: reset\ndata: {}\n\n"
+
+# Fields forwarded to dashboards, mapped from the flag payload
+_STREAM_FIELDS = {
+    "platform": "platform",
+    "handle": "handle",
+    "display_name": "display_name",
+    "description": "description",
+    "risk_score": "risk_score",
+    "reasons": "reasons",
+    "first_seen": "created_at",
+    "last_seen": "last_seen",
+}
+
+
+class StreamClient:
+    def __init__(self, maxsize: int = CLIENT_BUFFER_SIZE):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+
+class FlagBroadcaster:
+    """Fans out committed flags to connected stream clients.
+
+    Flags are usually saved by the crawler process, so events come from
+    flag_notifications (Postgres LISTEN) rather than the local AccountFlagged.
+
+    Each event is encoded once as an SSE frame and the same bytes are handed to
+    every client, so the cost per event does not depend on DB access.
+
+    Clients get a `reset` event (and should refetch) whenever the events they
+    missed can't be replayed: the gap is older than the history, the id comes
+    from before a restart, or notifications were lost while LISTEN reconnected.
+    """
+
+    def __init__(self, replay_size: int = REPLAY_BUFFER_SIZE, client_buffer: int = CLIENT_BUFFER_SIZE):
+        self._clients: Set[StreamClient] = set()
+        self._history: Deque[Tuple[int, bytes]] = deque(maxlen=replay_size)
+        self._client_buffer = client_buffer
+        self._last_id = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def _encode(self, event_id: int, payload: Dict[str, Any]) -> bytes:
+        data = {out: payload.get(src) for src, out in _STREAM_FIELDS.items()}
+        body = json.dumps(data, ensure_ascii=False, default=str)
+        return f"id: {event_id}\nevent: flag\ndata: {body}\n\n".encode()
+
+    def _call(self, fn, *args):
+        loop = self._loop
+        if loop is None:
+            # nobody has connected yet, still record the event for late joiners
+            fn(*args)
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            fn(*args)
+        else:
+            loop.call_soon_threadsafe(fn, *args)
+
+    def publish(self, payload: Dict[str, Any]):
+        """Event bus handler; safe to call from any thread."""
+        self._call(self._dispatch, payload)
+
+    def reset(self):
+        """Events were lost upstream: tell connected and resuming clients to refetch; safe from any thread."""
+        self._call(self._dispatch_reset)
+
+    def _dispatch(self, payload: Dict[str, Any]):
+        self._last_id += 1
+        self._send(self._encode(self._last_id, payload))
+
+    def _dispatch_reset(self):
+        # the reset takes an id, so clients resuming from before it replay the reset instead of the gap
+        self._history.clear()
+        self._last_id += 1
+        self._send(f"id: {self._last_id}\n".encode() + _RESET)
+
+    def _send(self, frame: bytes):
+        self._history.append((self._last_id, frame))
+        for client in list(self._clients):
+            try:
+                client.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # slow consumer: drop it instead of buffering without bound
+                logging.warning("Dropping slow live-stream client (%d queued)", client.queue.qsize())
+                client.dropped = True
+                self._clients.discard(client)
+
+    def connect(self, last_event_id: Optional[int] = None) -> StreamClient:
+        self._loop = asyncio.get_running_loop()
+        client = StreamClient(self._client_buffer)
+        if last_event_id is not None:
+            backlog = [frame for eid, frame in self._history if eid > last_event_id]
+            oldest = self._history[0][0] if self._history else self._last_id + 1
+            if last_event_id < oldest - 1 or len(backlog) > self._client_buffer or last_event_id > self._last_id:
+                # gap is larger than what we kept, or the id is from before a restart; tell the client to refetch
+                backlog = [_RESET]
+            for frame in backlog:
+                client.queue.put_nowait(frame)
+        self._clients.add(client)
+        return client
+
+    def disconnect(self, client: StreamClient):
+        self._clients.discard(client)
+
+    async def stream(self, client: StreamClient, heartbeat: float = HEARTBEAT_SECONDS):
+        """Yield SSE frames for one client until it disconnects or is dropped."""
+        try:
+            yield b"retry: 3000\n\n"
+            while not client.dropped or not client.queue.empty():
+                try:
+                    frame = await asyncio.wait_for(client.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield frame
+        finally:
+            self.disconnect(client)
+
+
+broadcaster = FlagBroadcaster()
+
+
+def subscribe():
+    event_bus.subscribe(flag_notifications.EVENT, broadcaster.publish)
+    logging.info("[live_stream] subscribed to %s events", flag_notifications.EVENT)
@@ -0,0 +1,35 @@
+import os
+from typing import Optional
+
+# numpy and the scorer are imported on first load, so processes that never score pay nothing at startup
+MODEL_PATH = os.environ.get("EUMENIDES_MODEL_PATH", "models/risk_model.npz")
+
+
+def save(model, path: str = MODEL_PATH):
+    import numpy as np
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.savez_compressed(path, weights=model.weights, bias=np.float64(model.bias),
+                        dim=np.int64(model.dim), ngram_range=np.asarray(model.ngram_range))
+
+
+def load(path: str = MODEL_PATH):
+    """A HashedNgramModel built from the weights saved at `path`."""
+    import numpy as np
+    from app.domain.learned_scoring import HashedNgramModel
+    with np.load(path) as data:
+        return HashedNgramModel(weights=data["weights"], bias=float(data["bias"]), dim=int(data["dim"]),
+                                ngram_range=tuple(int(x) for x in data["ngram_range"]))
+
+
+_default_model = None
+_default_loaded = False
+
+
+def get_default_model():
+    """The trained model at MODEL_PATH, or None until one has been trained."""
+    global _default_model, _default_loaded
+    if not _default_loaded:
+        _default_loaded = True
+        if os.path.exists(MODEL_PATH):
+            _default_model = load(MODEL_PATH)
+    return _default_model
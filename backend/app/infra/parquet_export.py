@@ -0,0 +1,165 @@
+import asyncio
+import functools
+import importlib.util
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+# pyarrow is imported by the first export, not at startup (it dominates the import time of the API)
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+pa = pq = None
+
+from app.infra.sql_repository import SqlAccountRepository, FLAG_LIST_COLUMNS
+from app.infra import snapshots
+from app.domain.reasons import Reason
+
+ROW_GROUP_SIZE = 50_000
+# extra keys promoted to their own typed columns; anything else lands in extra_json
+_EXTRA_COLUMNS = ("participants", "is_bot")
+
+
+def _load_pyarrow():
+    global pa, pq
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("pyarrow is not installed. Run 'pip install pyarrow' to enable Parquet export.")
+    if pq is None:
+        import pyarrow
+        import pyarrow.parquet
+        pa, pq = pyarrow, pyarrow.parquet
+
+
+def _reasons_type():
+    return pa.list_(pa.struct([
+        ("rule", pa.dictionary(pa.int32(), pa.string())),
+        ("field", pa.dictionary(pa.int32(), pa.string())),
+        ("term", pa.string()),
+    ]))
+
+
+def _flagged_schema():
+    ts = pa.timestamp("us", tz="UTC")
+    return pa.schema([
+        ("id", pa.int64()),
+        ("platform", pa.dictionary(pa.int32(), pa.string())),
+        ("handle", pa.string()),
+        ("display_name", pa.string()),
+        ("description", pa.string()),
+        ("risk_score", pa.float64()),
+        ("model_score", pa.float64()),
+        ("reasons", _reasons_type()),
+        ("created_at", ts),
+        ("last_seen", ts),
+        ("fetched_at", ts),
+        ("participants", pa.int64()),
+        ("is_bot", pa.bool_()),
+        ("extra_json", pa.string()),
+    ])
+
+
+def _snapshot_schema():
+    return pa.schema([
+        ("account_id", pa.int64()),
+        ("captured_at", pa.timestamp("us", tz="UTC")),
+        ("platform", pa.dictionary(pa.int32(), pa.string())),
+        ("handle", pa.string()),
+        ("display_name", pa.string()),
+        ("description", pa.string()),
+        ("risk_score", pa.float64()),
+        ("reasons", _reasons_type()),
+    ])
+
+
+def _as_utc(value: Any) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _reason_codes(value) -> Optional[List[Dict]]:
+    if value is None:
+        return None
+    # rows written before reason codes hold sentences
+    return [Reason.from_code(r).to_code() if isinstance(r, str) else r for r in value]
+
+
+def _convert(name: str, value: Any):
+    if name in ("created_at", "last_seen", "captured_at"):
+        return _as_utc(value)
+    if name == "reasons":
+        return _reason_codes(value)
+    return value
+
+
+def _flagged_batch(schema, rows: Sequence[Tuple]):
+    cols: Dict[str, List] = {name: [] for name in schema.names}
+    n = len(FLAG_LIST_COLUMNS)
+    for r in rows:
+        for name, value in zip(FLAG_LIST_COLUMNS, r[:n]):
+            cols[name].append(_convert(name, value))
+        meta = r[n] or {}
+        extra = dict(meta.get("extra") or {})
+        cols["fetched_at"].append(_as_utc(meta.get("fetched_at")))
+        for key in _EXTRA_COLUMNS:
+            cols[key].append(extra.pop(key, None))
+        cols["extra_json"].append(json.dumps(extra, ensure_ascii=False) if extra else None)
+    return pa.RecordBatch.from_pydict(cols, schema=schema)
+
+
+def _snapshot_batch(schema, rows: Sequence[Tuple]):
+    cols = {name: [] for name in schema.names}
+    for r in rows:
+        for name, value in zip(snapshots.SNAPSHOT_COLUMNS, r):
+            cols[name].append(_convert(name, value))
+    return pa.RecordBatch.from_pydict(cols, schema=schema)
+
+
+def _write_rows(writer, schema, rows: Sequence[Tuple], to_batch):
+    writer.write_batch(to_batch(schema, rows))
+
+
+async def _write(path: str, schema, batches: AsyncIterator[List[Tuple]], to_batch) -> int:
+    """Write DB batches as row groups; Arrow conversion and zstd writes run in a worker thread.
+
+    Encoding a batch overlaps with fetching the next, so at most two batches
+    are held in memory regardless of table size, and the event loop keeps
+    serving other requests during a large export.
+    """
+    loop = asyncio.get_running_loop()
+    writer = await loop.run_in_executor(
+        None, functools.partial(pq.ParquetWriter, path, schema, compression="zstd", use_dictionary=True))
+    total = 0
+    pending = None
+    try:
+        async for rows in batches:
+            if not rows:
+                continue
+            if pending is not None:
+                await pending
+            pending = loop.run_in_executor(None, _write_rows, writer, schema, rows, to_batch)
+            total += len(rows)
+        if pending is not None:
+            await pending
+    finally:
+        if pending is not None and not pending.done():
+            await asyncio.wait([pending])
+        await loop.run_in_executor(None, writer.close)
+    logging.info("Wrote %d rows to %s", total, path)
+    return total
+
+
+async def export_flagged_to_parquet(path: str, batch_size: int = ROW_GROUP_SIZE) -> int:
+    await asyncio.get_running_loop().run_in_executor(None, _load_pyarrow)
+    repo = SqlAccountRepository()
+    columns = FLAG_LIST_COLUMNS + ("account_metadata",)
+    return await _write(path, _flagged_schema(), repo.iter_flagged_rows(batch_size=batch_size, columns=columns), _flagged_batch)
+
+
+async def export_snapshots_to_parquet(path: str, since: Optional[datetime] = None, batch_size: int = ROW_GROUP_SIZE) -> int:
+    await asyncio.get_running_loop().run_in_executor(None, _load_pyarrow)
+    return await _write(path, _snapshot_schema(), snapshots.iter_snapshot_rows(since=since, batch_size=batch_size), _snapshot_batch)
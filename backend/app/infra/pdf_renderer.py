@@ -0,0 +1,260 @@
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+
+try:
+    from fpdf import FPDF
+    from fpdf.enums import XPos, YPos
+    PDF_AVAILABLE = True
+except ImportError:
+    PDF_AVAILABLE = False
+
+try:
+    from pypdf import PdfWriter
+    MERGE_AVAILABLE = True
+except ImportError:
+    MERGE_AVAILABLE = False
+
+CHUNK_SIZE = int(os.environ.get("EUMENIDES_PDF_CHUNK_SIZE", "500"))
+MAX_WORKERS = int(os.environ.get("EUMENIDES_PDF_WORKERS", str(os.cpu_count() or 2)))
+# pypdf holds every page of the merged report until it is written (roughly the file size in memory),
+# so larger reports are refused instead of risking the process; export Parquet for those
+MAX_MERGE_PAGES = int(os.environ.get("EUMENIDES_PDF_MAX_MERGE_PAGES", "20000"))
+
+# A TTF with wide Unicode coverage; emoji need an extra fallback font (e.g. Noto Emoji)
+_FONT_CANDIDATES = [
+    os.environ.get("EUMENIDES_PDF_FONT", ""),
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+]
+FALLBACK_FONTS = [p for p in os.environ.get("EUMENIDES_PDF_FALLBACK_FONTS", "").split(",") if p] or [
+    "/usr/share/fonts/truetype/noto/NotoEmoji-Regular.ttf",
+    "/usr/share/fonts/truetype/ancient-scripts/Symbola_hint.ttf",
+]
+
+
+def find_unicode_font() -> Optional[str]:
+    for path in _FONT_CANDIDATES:
+        if path and os.path.exists(path):
+            return path
+    return None
+
+
+@dataclass
+class ReportLayout:
+    """Static text of a report; rows are dicts keyed by the first item of each field pair."""
+    title: str
+    subtitle: str
+    fields: List[Tuple[str, str]]
+    heading_field: Tuple[str, str]
+    intro: Optional[str] = None
+    toc_title: str = "Contents"
+    toc_entry: str = "Accounts {first}-{last}"
+    multiline_fields: Tuple[str, ...] = field(default_factory=lambda: ("description", "reasons"))
+
+
+class _Doc:
+    """FPDF wrapper that picks a Unicode font when one is installed."""
+
+    def __init__(self, font_path: Optional[str]):
+        self.pdf = FPDF()
+        self.pdf.set_auto_page_break(True, margin=15)
+        self.unicode = False
+        self.family = "Arial"
+        self.covered = None  # code points the loaded fonts can draw; None for core fonts
+        self.missing = set()
+        if font_path:
+            self.pdf.add_font("Report", "", font_path)
+            bold = font_path.replace(".ttf", "-Bold.ttf")
+            self.pdf.add_font("Report", "B", bold if os.path.exists(bold) else font_path)
+            fallbacks = []
+            for i, path in enumerate(FALLBACK_FONTS):
+                if os.path.exists(path):
+                    self.pdf.add_font(f"Fallback{i}", "", path)
+                    fallbacks.append(f"Fallback{i}")
+            if fallbacks:
+                self.pdf.set_fallback_fonts(fallbacks)
+            self.family = "Report"
+            self.unicode = True
+            self.covered = set()
+            for name in ["report"] + [f.lower() for f in fallbacks]:
+                self.covered.update(self.pdf.fonts[name].cmap)
+
+    def text(self, val) -> str:
+        s = "N/A" if val is None else str(val)
+        if self.unicode:
+            # fpdf2 silently leaves out glyphs no loaded font has; remember them for the log
+            self.missing.update(c for c in s if ord(c) not in self.covered and c.isprintable() and not c.isspace())
+            return s
+        # core fonts only cover latin-1
+        return s.encode("latin-1", errors="replace").decode("latin-1")
+
+    def font(self, size: int, bold: bool = False):
+        self.pdf.set_font(self.family, style="B" if bold else "", size=size)
+
+
+def _render_chunk(layout: ReportLayout, rows: Sequence[Dict], out_path: str, font_path: Optional[str],
+                  with_front: bool = False) -> Tuple[int, Set[str]]:
+    """Process-pool worker: lay out one chunk of accounts into its own PDF file.
+
+    Returns the page count and the characters no loaded font could draw.
+    """
+    doc = _Doc(font_path)
+    pdf = doc.pdf
+    pdf.add_page()
+    if with_front:
+        _front_matter(doc, layout)
+    key, label = layout.heading_field
+    for row in rows:
+        doc.font(10, bold=True)
+        pdf.cell(0, 8, text=f"{label}: {doc.text(row.get(key))}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        doc.font(10)
+        for k, lbl in layout.fields:
+            if k in layout.multiline_fields:
+                pdf.multi_cell(0, 6, text=f"{lbl}: {doc.text(row.get(k))}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            else:
+                pdf.cell(0, 8, text=f"{lbl}: {doc.text(row.get(k))}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.ln(2)
+        pdf.set_draw_color(100, 100, 100)
+        pdf.set_line_width(0.3)
+        pdf.line(10, pdf.get_y(), 200, pdf.get_y())
+        pdf.ln(2)
+    pdf.output(out_path)
+    return pdf.page_no(), doc.missing
+
+
+def _front_matter(doc: _Doc, layout: ReportLayout):
+    pdf = doc.pdf
+    doc.font(14, bold=True)
+    pdf.cell(0, 12, text=doc.text(layout.title), new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+    doc.font(10)
+    pdf.cell(0, 8, text=doc.text(layout.subtitle), new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+    pdf.ln(4)
+    if layout.intro:
+        doc.font(9)
+        pdf.multi_cell(0, 7, text=doc.text(layout.intro), align='L', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.ln(2)
+
+
+def _render_front(layout: ReportLayout, toc: List[Tuple[str, int]], out_path: str, font_path: Optional[str]) -> int:
+    """Title page with intro and table of contents; page numbers are final (1-based)."""
+    doc = _Doc(font_path)
+    pdf = doc.pdf
+    pdf.add_page()
+    _front_matter(doc, layout)
+    doc.font(12, bold=True)
+    pdf.cell(0, 10, text=doc.text(layout.toc_title), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    doc.font(9)
+    for entry, page in toc:
+        pdf.cell(170, 6, text=doc.text(entry))
+        pdf.cell(0, 6, text=str(page), new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='R')
+    pdf.output(out_path)
+    return pdf.page_no()
+
+
+def _merge(front: str, chunk_paths: List[str], toc: List[Tuple[str, int]], out_path: str):
+    """Concatenate the front page and chunk PDFs and add one bookmark per TOC entry."""
+    writer = PdfWriter()
+    for path in [front] + chunk_paths:
+        writer.append(path)
+    for entry, page in toc:
+        writer.add_outline_item(entry, page - 1)
+    with open(out_path, "wb") as fh:
+        writer.write(fh)
+
+
+async def render_report(layout: ReportLayout, row_batches: AsyncIterator[List[Dict]], pdf_path: str,
+                        chunk_size: int = CHUNK_SIZE, max_workers: int = MAX_WORKERS) -> int:
+    """Render rows into `pdf_path` using a process pool; returns the number of accounts.
+
+    Rows are pulled from `row_batches` as chunks are handed to workers, and at
+    most 2 * max_workers chunks are in flight, so memory does not grow with the
+    report size. Each chunk becomes a temporary PDF; they are merged behind a
+    front page with a table of contents and bookmarks. The merge holds the
+    whole report in memory, so it runs in a thread and reports longer than
+    MAX_MERGE_PAGES fail as soon as the rendered chunks pass that size.
+    Without pypdf the report is rendered as a single document in one worker.
+    """
+    if not PDF_AVAILABLE:
+        raise RuntimeError("fpdf2 is not installed")
+    if not MERGE_AVAILABLE:
+        chunk_size = float("inf")
+    font_path = find_unicode_font()
+    loop = asyncio.get_running_loop()
+    workdir = tempfile.mkdtemp(prefix="eumenides_pdf_")
+    chunks: List[Tuple[str, str, str, int]] = []  # (path, first, last, count)
+    page_counts: Dict[int, int] = {}
+    pending: Dict[int, asyncio.Future] = {}
+    total = 0
+
+    missing: Set[str] = set()
+
+    def collect(done):
+        for i in [i for i, f in pending.items() if f in done]:
+            page_counts[i], chunk_missing = pending.pop(i).result()
+            missing.update(chunk_missing)
+        if MERGE_AVAILABLE and sum(page_counts.values()) > MAX_MERGE_PAGES:
+            raise RuntimeError(f"PDF report would exceed {MAX_MERGE_PAGES} pages (EUMENIDES_PDF_MAX_MERGE_PAGES); "
+                               "narrow it down or export Parquet instead")
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            async def submit(rows):
+                idx = len(chunks)
+                path = os.path.join(workdir, f"chunk_{idx:06d}.pdf")
+                key = layout.heading_field[0]
+                first, last = (str(rows[0].get(key)), str(rows[-1].get(key))) if rows else ("", "")
+                chunks.append((path, first, last, len(rows)))
+                pending[idx] = loop.run_in_executor(
+                    pool, _render_chunk, layout, rows, path, font_path, not MERGE_AVAILABLE)
+                if len(pending) >= 2 * max_workers:
+                    done, _ = await asyncio.wait(list(pending.values()), return_when=asyncio.FIRST_COMPLETED)
+                    collect(done)
+
+            buf: List[Dict] = []
+            async for batch in row_batches:
+                for row in batch:
+                    buf.append(row)
+                    total += 1
+                    if len(buf) >= chunk_size:
+                        await submit(buf)
+                        buf = []
+            if buf or not chunks:
+                await submit(buf or [])
+            if pending:
+                done, _ = await asyncio.wait(list(pending.values()))
+                collect(done)
+
+        if missing:
+            logging.warning("PDF %s: %d characters have no glyph in %s or the fallback fonts and were left out: %s "
+                            "(install Noto Emoji or set EUMENIDES_PDF_FALLBACK_FONTS)",
+                            pdf_path, len(missing), font_path, " ".join(sorted(missing)))
+        if not MERGE_AVAILABLE:
+            shutil.copyfile(chunks[0][0], pdf_path)
+            return total
+
+        # front matter length can change the page numbers it lists, so settle it first
+        front = os.path.join(workdir, "front.pdf")
+        front_pages = 1
+        while True:
+            toc, page, offset = [], front_pages + 1, 0
+            for i, (_, first, last, count) in enumerate(chunks):
+                if not count:
+                    continue
+                toc.append((layout.toc_entry.format(first=first, last=last, start=offset + 1, end=offset + count), page))
+                page += page_counts[i]
+                offset += count
+            rendered = _render_front(layout, toc, front, font_path)
+            if rendered == front_pages:
+                break
+            front_pages = rendered
+
+        await loop.run_in_executor(None, _merge, front, [path for path, _, _, count in chunks if count], toc, pdf_path)
+        return total
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,38 @@
+from typing import Callable, Dict, List
+from app.domain.platforms import PlatformAdapter
+
+# Adapters are built on first use so a process only pays for the platforms it crawls
+_factories: Dict[str, Callable[[], PlatformAdapter]] = {}
+_adapters: Dict[str, PlatformAdapter] = {}
+
+
+def register(platform: str, factory: Callable[[], PlatformAdapter]):
+    _factories[platform] = factory
+    _adapters.pop(platform, None)
+
+
+def get_adapter(platform: str) -> PlatformAdapter:
+    adapter = _adapters.get(platform)
+    if adapter is None:
+        if platform not in _factories:
+            raise KeyError(f"No adapter registered for platform {platform!r} (known: {', '.join(available())})")
+        adapter = _adapters[platform] = _factories[platform]()
+    return adapter
+
+
+def available() -> List[str]:
+    return sorted(_factories)
+
+
+def _telegram() -> PlatformAdapter:
+    from app.infra.telegram_client import TelegramAdapter
+    return TelegramAdapter()
+
+
+def _web() -> PlatformAdapter:
+    from app.infra.web_adapter import WebPageAdapter
+    return WebPageAdapter()
+
+
+register("telegram", _telegram)
+register("web", _web)
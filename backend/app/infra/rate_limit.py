@@ -0,0 +1,37 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Allows `rate` operations per second on average with bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._last = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    async def acquire(self, n: int):
+        while True:
+            self._refill()
+            if self.tokens >= n:
+                self.tokens -= n
+                return
+            await asyncio.sleep((n - self.tokens) / self.rate)
+
+    async def acquire_up_to(self, n: int) -> int:
+        """Wait for at least one token, then take as many as are available, up to n."""
+        await self.acquire(1)
+        self._refill()
+        extra = min(n - 1, int(self.tokens))
+        self.tokens -= extra
+        return 1 + extra
+
+    def refund(self, n: int):
+        """Return tokens taken for operations that did not happen."""
+        self.tokens = min(self.burst, self.tokens + n)
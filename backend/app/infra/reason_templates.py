@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
+from app.db import AsyncSessionLocal
+from app.models import ReasonTemplate, FlaggedAccount as ORMFlagged, AccountSnapshot
+from app.domain.reasons import DEFAULT_TEMPLATES, DEFAULT_LANGUAGE, Reason, render_all
+
+# Loaded copy of reason_templates; rendering is a dict lookup per reason, no SQL per row
+_templates: Dict[Tuple[str, str], str] = dict(DEFAULT_TEMPLATES)
+
+
+async def seed(conn):
+    """Insert the built-in templates; rows already present (possibly edited) are kept."""
+    rows = [{"key": k, "lang": lang, "template": t} for (k, lang), t in DEFAULT_TEMPLATES.items()]
+    await conn.execute(insert(ReasonTemplate).on_conflict_do_nothing(), rows)
+
+
+async def load(session_factory=AsyncSessionLocal) -> Dict[Tuple[str, str], str]:
+    async with session_factory() as session:
+        res = await session.execute(select(ReasonTemplate.key, ReasonTemplate.lang, ReasonTemplate.template))
+        loaded = {(k, lang): t for k, lang, t in res.all()}
+    _templates.clear()
+    _templates.update(DEFAULT_TEMPLATES)
+    _templates.update(loaded)
+    return _templates
+
+
+def languages() -> List[str]:
+    return sorted({lang for _, lang in _templates})
+
+
+def render(reasons: Optional[Iterable], lang: str = DEFAULT_LANGUAGE) -> List[str]:
+    """Reason codes (or Reason objects) as sentences in `lang`."""
+    return render_all(reasons, lang, _templates)
+
+
+def render_rows(rows: Iterable[Tuple], column: int, lang: str = DEFAULT_LANGUAGE) -> List[Tuple]:
+    """Replace the reason-code column of result tuples with rendered sentences."""
+    return [r[:column] + (render(r[column], lang),) + r[column + 1:] for r in rows]
+
+
+def codes(reasons: Iterable[Reason]) -> List[Dict[str, str]]:
+    return [r.to_code() for r in reasons]
+
+
+async def migrate_legacy(batch_size: int = 1000, session_factory=AsyncSessionLocal) -> int:
+    """Rewrite reasons stored as sentences (before reason codes) into codes, with their snapshots."""
+    is_legacy = text("jsonb_typeof(reasons -> 0) = 'string'")
+    total = 0
+    while True:
+        async with session_factory() as session:
+            res = await session.execute(
+                select(ORMFlagged.id, ORMFlagged.reasons).where(is_legacy).order_by(ORMFlagged.id).limit(batch_size)
+            )
+            rows = res.all()
+            if not rows:
+                return total
+            for account_id, reasons in rows:
+                new = codes(Reason.from_code(r) for r in reasons)
+                await session.execute(ORMFlagged.__table__.update().where(ORMFlagged.id == account_id).values(reasons=new))
+            snap = await session.execute(
+                select(AccountSnapshot.account_id, AccountSnapshot.captured_at, AccountSnapshot.reasons)
+                .where(AccountSnapshot.account_id.in_([r[0] for r in rows]), is_legacy)
+            )
+            for account_id, captured_at, reasons in snap.all():
+                await session.execute(
+                    AccountSnapshot.__table__.update()
+                    .where(AccountSnapshot.account_id == account_id, AccountSnapshot.captured_at == captured_at)
+                    .values(reasons=codes(Reason.from_code(r) for r in reasons))
+                )
+            await session.commit()
+        total += len(rows)
+        logging.info("Migrated reasons up to account id %s", rows[-1][0])
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(f"Migrated {asyncio.run(migrate_legacy())} accounts")
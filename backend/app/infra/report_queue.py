@@ -0,0 +1,220 @@
+import asyncio
+import hashlib
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import select, update, func, or_, and_, bindparam
+from sqlalchemy.dialects.postgresql import insert
+from app.db import AsyncSessionLocal
+from app.models import ReportSubmission
+from app.infra.event_bus import event_bus
+from app.infra.report_sinks import SubmissionResult
+
+# Flagged accounts at or above this risk score are reported automatically
+REPORT_THRESHOLD = float(os.environ.get("EUMENIDES_REPORT_THRESHOLD", "0.8"))
+MAX_ATTEMPTS = int(os.environ.get("EUMENIDES_REPORT_MAX_ATTEMPTS", "6"))
+BACKOFF_BASE_SECONDS = 60
+# Claimed rows whose worker died are handed out again after this long
+CLAIM_LEASE = timedelta(minutes=10)
+
+STATUS_COLUMNS = ("platform", "handle", "status", "attempts", "requested_by", "risk_score",
+                  "enqueued_at", "submitted_at", "external_id", "last_error")
+
+
+def idempotency_key(platform: str, handle: str) -> str:
+    """Stable per account, so retries and re-enqueues never produce a second report."""
+    return hashlib.sha256(f"{platform}:{handle}".encode()).hexdigest()
+
+
+def _report_payload(event: Dict) -> Dict:
+    return {k: event.get(k) for k in ("platform", "handle", "display_name", "description", "risk_score",
+                                      "reasons", "first_seen", "last_seen")}
+
+
+async def enqueue(items: List[Dict], requested_by: str = "auto", session_factory=AsyncSessionLocal) -> int:
+    """Queue reports for accounts (dicts shaped like the AccountFlagged payload).
+
+    Accounts already submitted are left alone; queued ones get the latest
+    payload and score. A manual request revives a report that failed.
+    """
+    if not items:
+        return 0
+    rows = {}
+    for item in items:
+        key = idempotency_key(item["platform"], item["handle"])
+        rows[key] = {
+            "platform": item["platform"],
+            "handle": item["handle"],
+            "idempotency_key": key,
+            "risk_score": float(item.get("risk_score") or 0.0),
+            "payload": _report_payload(item),
+            "requested_by": requested_by,
+        }
+    stmt = insert(ReportSubmission)
+    revivable = ["pending", "failed"] if requested_by == "manual" else ["pending"]
+    set_ = {"risk_score": stmt.excluded.risk_score, "payload": stmt.excluded.payload}
+    if requested_by == "manual":
+        set_.update(requested_by="manual", status="pending", attempts=0, next_attempt_at=func.now(), last_error=None)
+    async with session_factory() as session:
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[ReportSubmission.platform, ReportSubmission.handle],
+                set_=set_,
+                where=ReportSubmission.status.in_(revivable),
+            ),
+            list(rows.values()),
+        )
+        await session.commit()
+    return len(rows)
+
+
+async def claim(limit: int = 50, session_factory=AsyncSessionLocal) -> List[Dict]:
+    """Take due reports, riskiest first; safe across concurrent workers."""
+    now = datetime.now(timezone.utc)
+    async with session_factory() as session:
+        picked = (
+            select(ReportSubmission.platform, ReportSubmission.handle)
+            .where(or_(
+                and_(ReportSubmission.status == "pending", ReportSubmission.next_attempt_at <= now),
+                and_(ReportSubmission.status == "claimed", ReportSubmission.claimed_at < now - CLAIM_LEASE),
+            ))
+            .order_by(ReportSubmission.risk_score.desc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("picked")
+        )
+        res = await session.execute(
+            update(ReportSubmission)
+            .where(ReportSubmission.platform == picked.c.platform, ReportSubmission.handle == picked.c.handle)
+            .values(status="claimed", claimed_at=now, attempts=ReportSubmission.attempts + 1)
+            .returning(ReportSubmission.idempotency_key, ReportSubmission.attempts, ReportSubmission.payload)
+        )
+        rows = res.all()
+        await session.commit()
+    return [{**payload, "idempotency_key": key, "attempt": attempts} for key, attempts, payload in rows]
+
+
+def backoff(attempt: int) -> timedelta:
+    return timedelta(seconds=BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+
+
+async def record_results(claimed: List[Dict], results: Iterable, session_factory=AsyncSessionLocal):
+    """Store sink outcomes; retriable failures are rescheduled with exponential backoff."""
+    by_key = {r.idempotency_key: r for r in results}
+    now = datetime.now(timezone.utc)
+    submitted, retries, failed = [], [], []
+    for report in claimed:
+        result = by_key.get(report["idempotency_key"])
+        if result is not None and result.ok:
+            submitted.append({"k": report["idempotency_key"], "ext": result.external_id})
+            continue
+        error = result.error if result is not None else "no result from sink"
+        if (result is not None and not result.retriable) or report["attempt"] >= MAX_ATTEMPTS:
+            failed.append({"k": report["idempotency_key"], "error": error})
+        else:
+            retries.append({"k": report["idempotency_key"], "error": error, "at": now + backoff(report["attempt"])})
+    table = ReportSubmission.__table__
+    async with session_factory() as session:
+        if submitted:
+            await session.execute(
+                table.update().where(table.c.idempotency_key == bindparam("k"))
+                .values(status="submitted", submitted_at=now, external_id=bindparam("ext"), last_error=None),
+                submitted,
+            )
+        if retries:
+            await session.execute(
+                table.update().where(table.c.idempotency_key == bindparam("k"))
+                .values(status="pending", next_attempt_at=bindparam("at"), last_error=bindparam("error")),
+                retries,
+            )
+        if failed:
+            await session.execute(
+                table.update().where(table.c.idempotency_key == bindparam("k"))
+                .values(status="failed", last_error=bindparam("error")),
+                failed,
+            )
+        await session.commit()
+    return len(submitted), len(retries), len(failed)
+
+
+async def release(claimed: List[Dict], error: str, session_factory=AsyncSessionLocal):
+    """Reschedule a whole batch after the sink raised."""
+    await record_results(claimed, [SubmissionResult(r["idempotency_key"], ok=False, error=error) for r in claimed],
+                         session_factory=session_factory)
+
+
+async def status_of(platform: str, handle: str, session_factory=AsyncSessionLocal) -> Optional[Tuple]:
+    async with session_factory() as session:
+        res = await session.execute(
+            select(*(getattr(ReportSubmission, c) for c in STATUS_COLUMNS))
+            .where(ReportSubmission.platform == platform, ReportSubmission.handle == handle)
+        )
+        return res.first()
+
+
+async def counts(session_factory=AsyncSessionLocal) -> Dict[str, int]:
+    async with session_factory() as session:
+        res = await session.execute(select(ReportSubmission.status, func.count()).group_by(ReportSubmission.status))
+        return dict(res.all())
+
+
+class AutoReporter:
+    """Queues AccountFlagged events above REPORT_THRESHOLD.
+
+    Event handlers are synchronous, so events are buffered and written by one
+    background flush per event-loop tick: a burst of flags costs one INSERT
+    and never waits on the database inside the crawler or a request. A failed
+    flush puts its events back in the buffer for the next one; processes call
+    `drain()` before exiting so nothing buffered is lost.
+    """
+
+    def __init__(self, threshold: float = REPORT_THRESHOLD, session_factory=AsyncSessionLocal):
+        self.threshold = threshold
+        self._session_factory = session_factory
+        self._buffer: List[Dict] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def handle(self, payload: Dict):
+        if float(payload.get("risk_score") or 0.0) < self.threshold:
+            return
+        self._buffer.append(payload)
+        if self._flush_task is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # no loop (sync caller); picked up by the next flush()
+            self._flush_task = loop.create_task(self.flush())
+            self._tasks.add(self._flush_task)
+            self._flush_task.add_done_callback(self._tasks.discard)
+
+    async def flush(self):
+        await asyncio.sleep(0)
+        items, self._buffer = self._buffer, []
+        self._flush_task = None
+        if not items:
+            return
+        try:
+            await enqueue(items, session_factory=self._session_factory)
+        except Exception:
+            logging.exception("Failed to queue %d reports, keeping them for the next flush", len(items))
+            self._buffer[:0] = items
+
+    async def drain(self):
+        """Wait for in-flight flushes, then write whatever is still buffered."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._buffer:
+            await self.flush()
+        if self._buffer:
+            logging.error("Dropping %d reports that could not be queued", len(self._buffer))
+            self._buffer = []
+
+
+auto_reporter = AutoReporter()
+
+
+def subscribe():
+    event_bus.subscribe("AccountFlagged", auto_reporter.handle)
+    logging.info("[report_queue] auto-reporting accounts with risk >= %.2f", auto_reporter.threshold)
@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import json
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+SINK = os.environ.get("EUMENIDES_REPORT_SINK", "local")
+SINK_URL = os.environ.get("EUMENIDES_REPORT_URL")
+SINK_TOKEN = os.environ.get("EUMENIDES_REPORT_TOKEN")
+LOCAL_SINK_DIR = os.environ.get("EUMENIDES_REPORT_DIR", "report_submissions")
+# batch-level statuses that say nothing about the reports: bad credentials or a slow/limiting endpoint
+_RETRIABLE_STATUSES = {401, 403, 408, 429}
+
+
+@dataclass(slots=True)
+class SubmissionResult:
+    idempotency_key: str
+    ok: bool
+    external_id: Optional[str] = None
+    error: Optional[str] = None
+    retriable: bool = True
+
+
+class ReportSink(ABC):
+    """Destination for abuse reports.
+
+    `submit_batch` gets report dicts (each with an idempotency_key) and returns
+    one result per report; raising means the whole batch is retried. Sinks
+    must treat a repeated idempotency key as the same report.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def submit_batch(self, reports: List[Dict]) -> List[SubmissionResult]:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class LocalFileSink(ReportSink):
+    """Stand-in sink: appends reports to a daily JSONL file, skipping keys already written."""
+
+    name = "local"
+
+    def __init__(self, directory: str = LOCAL_SINK_DIR):
+        self.directory = directory
+        self._seen: Optional[set] = None
+
+    def _load_seen(self) -> set:
+        seen = set()
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".jsonl"):
+                    with open(os.path.join(self.directory, name), encoding="utf-8") as fh:
+                        for line in fh:
+                            try:
+                                seen.add(json.loads(line)["idempotency_key"])
+                            except (ValueError, KeyError):
+                                continue
+        return seen
+
+    def _write(self, reports: List[Dict]) -> List[SubmissionResult]:
+        os.makedirs(self.directory, exist_ok=True)
+        if self._seen is None:
+            self._seen = self._load_seen()
+        path = os.path.join(self.directory, f"{datetime.now(timezone.utc):%Y%m%d}.jsonl")
+        results = []
+        with open(path, "a", encoding="utf-8") as fh:
+            for report in reports:
+                key = report["idempotency_key"]
+                if key not in self._seen:
+                    fh.write(json.dumps(report, ensure_ascii=False, default=str) + "\n")
+                    self._seen.add(key)
+                results.append(SubmissionResult(key, ok=True, external_id=f"local:{key[:16]}"))
+        return results
+
+    async def submit_batch(self, reports: List[Dict]) -> List[SubmissionResult]:
+        return await asyncio.get_running_loop().run_in_executor(None, self._write, reports)
+
+
+class HttpReportSink(ReportSink):
+    """POSTs a batch as JSON to EUMENIDES_REPORT_URL.
+
+    Expects `{"results": [{"idempotency_key", "ok", "id"?, "error"?, "status"?}]}`
+    back. A 4xx for one report is permanent; for the whole batch only a
+    malformed request (400, 404, 422, ...) is, while auth failures, timeouts,
+    rate limits and 5xx make the batch retry with backoff.
+    """
+
+    name = "http"
+
+    def __init__(self, url: str = SINK_URL, token: Optional[str] = SINK_TOKEN, timeout: float = 30.0):
+        if not url:
+            raise RuntimeError("EUMENIDES_REPORT_URL is not set")
+        import httpx
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self.url = url
+        self._client = httpx.AsyncClient(timeout=timeout, headers=headers)
+
+    async def submit_batch(self, reports: List[Dict]) -> List[SubmissionResult]:
+        batch_key = hashlib.sha256("".join(sorted(r["idempotency_key"] for r in reports)).encode()).hexdigest()
+        resp = await self._client.post(self.url, json={"reports": reports}, headers={"Idempotency-Key": batch_key})
+        if resp.status_code in _RETRIABLE_STATUSES or resp.status_code >= 500:
+            resp.raise_for_status()
+        if resp.status_code >= 400:
+            return [SubmissionResult(r["idempotency_key"], ok=False, error=f"HTTP {resp.status_code}", retriable=False)
+                    for r in reports]
+        by_key = {item.get("idempotency_key"): item for item in resp.json().get("results", [])}
+        results = []
+        for r in reports:
+            item = by_key.get(r["idempotency_key"])
+            if item is None:
+                results.append(SubmissionResult(r["idempotency_key"], ok=False, error="missing from response"))
+            else:
+                results.append(SubmissionResult(
+                    r["idempotency_key"], ok=bool(item.get("ok")), external_id=item.get("id"),
+                    error=item.get("error"), retriable=not str(item.get("status", "")).startswith("4"),
+                ))
+        return results
+
+    async def close(self):
+        await self._client.aclose()
+
+
+_SINKS = {"local": LocalFileSink, "http": HttpReportSink}
+
+
+def get_sink(name: str = SINK) -> ReportSink:
+    try:
+        return _SINKS[name]()
+    except KeyError:
+        raise RuntimeError(f"Unknown report sink {name!r} (expected one of {', '.join(_SINKS)})")
@@ -0,0 +1,184 @@
+import asyncio
+import heapq
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
+from app.db import AsyncSessionLocal
+from app.models import RiskSummary
+from app.infra import flag_notifications
+from app.infra.event_bus import event_bus
+
+BUCKETS = 10
+# Accounts kept in memory; ranked reads up to TOP_K are served without touching the database
+TOP_K = 1000
+# Safety net for updates the notifications miss (edits made outside SqlAccountRepository)
+MAX_AGE_SECONDS = float(os.environ.get("EUMENIDES_TOP_RISK_MAX_AGE", "60"))
+
+
+def bucket_of(score: float) -> int:
+    return min(BUCKETS - 1, max(0, int(float(score) * BUCKETS)))
+
+
+async def apply(session, platform: str, old_score: Optional[float], new_score: float):
+    """Move one account between buckets inside the caller's transaction (old_score None = new account)."""
+    new_bucket = bucket_of(new_score)
+    if old_score is not None and bucket_of(old_score) == new_bucket:
+        return
+    deltas = [(new_bucket, 1)]
+    if old_score is not None:
+        deltas.append((bucket_of(old_score), -1))
+    stmt = insert(RiskSummary)
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[RiskSummary.platform, RiskSummary.bucket],
+            set_={"count": RiskSummary.count + stmt.excluded.count},
+        ),
+        [{"platform": platform, "bucket": b, "count": d} for b, d in deltas],
+    )
+
+
+_REBUILD_SQL = f"""
+    INSERT INTO risk_summary (platform, bucket, count)
+    SELECT platform, LEAST({BUCKETS - 1}, GREATEST(0, floor(risk_score * {BUCKETS})))::smallint, count(*)
+    FROM flagged_accounts GROUP BY 1, 2
+"""
+
+
+async def ensure_seeded(conn):
+    """Fill the summary from flagged_accounts the first time it is deployed."""
+    if (await conn.execute(text("SELECT 1 FROM risk_summary LIMIT 1"))).first() is None:
+        await conn.execute(text(_REBUILD_SQL + " ON CONFLICT DO NOTHING"))
+
+
+async def rebuild(session_factory=AsyncSessionLocal):
+    """Recompute the summary from scratch (e.g. after manual edits to flagged_accounts)."""
+    async with session_factory() as session:
+        await session.execute(text("LOCK TABLE risk_summary IN EXCLUSIVE MODE"))
+        await session.execute(text("DELETE FROM risk_summary"))
+        await session.execute(text(_REBUILD_SQL))
+        await session.commit()
+
+
+async def summary(session_factory=AsyncSessionLocal) -> Dict[str, Any]:
+    """Totals, per-platform counts and score histograms; reads at most platforms x BUCKETS rows."""
+    async with session_factory() as session:
+        res = await session.execute(select(RiskSummary.platform, RiskSummary.bucket, RiskSummary.count))
+        rows = res.all()
+    platforms: Dict[str, int] = {}
+    histograms: Dict[str, List[int]] = {}
+    for platform, bucket, count in rows:
+        platforms[platform] = platforms.get(platform, 0) + count
+        histograms.setdefault(platform, [0] * BUCKETS)[bucket] += count
+    return {
+        "total": sum(platforms.values()),
+        "platforms": platforms,
+        "bucket_edges": [round(i / BUCKETS, 2) for i in range(BUCKETS + 1)],
+        "histograms": histograms,
+    }
+
+
+class TopRiskCache:
+    """Highest-risk accounts kept in memory from committed-flag notifications.
+
+    Members live in a dict keyed by (platform, handle) with a min-heap on
+    score for eviction (stale heap entries are skipped lazily). Updates come
+    from flag_notifications, so flags saved by the crawler or another replica
+    arrive like local ones. A score that drops can let an account outside the
+    cache overtake it and notifications sent while the listener was
+    reconnecting are lost, so the cache is re-read from the database after
+    either, or once it is MAX_AGE_SECONDS old.
+    """
+
+    def __init__(self, k: int = TOP_K, columns: Tuple[str, ...] = ()):
+        self.k = k
+        self.columns = columns
+        self._score_index = columns.index("risk_score") if columns else 0
+        self._rows: Dict[Tuple[str, str], Tuple] = {}
+        self._heap: List[Tuple[float, Tuple[str, str]]] = []
+        self._ranked: Optional[List[Tuple]] = None
+        self._seeded = False
+        self._stale = False
+        self._loaded_at = 0.0
+        self._reseeding = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._seeded
+
+    def _put(self, key: Tuple[str, str], row: Tuple):
+        score = float(row[self._score_index] or 0.0)
+        old = self._rows.get(key)
+        if old is None and len(self._rows) >= self.k and self._heap and score <= self._heap[0][0]:
+            return
+        if old is not None and score < float(old[self._score_index] or 0.0):
+            self._stale = True
+        self._rows[key] = row
+        heapq.heappush(self._heap, (score, key))
+        while len(self._rows) > self.k:
+            s, evict = heapq.heappop(self._heap)
+            current = self._rows.get(evict)
+            if current is not None and float(current[self._score_index] or 0.0) == s:
+                del self._rows[evict]
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(float(r[self._score_index] or 0.0), k) for k, r in self._rows.items()]
+            heapq.heapify(self._heap)
+        self._ranked = None
+
+    def load(self, rows: List[Tuple]):
+        platform_i, handle_i = self.columns.index("platform"), self.columns.index("handle")
+        self._rows.clear()
+        self._heap = []
+        for row in rows:
+            self._put((row[platform_i], row[handle_i]), tuple(row))
+        self._seeded = True
+        self._stale = False
+        self._loaded_at = time.monotonic()
+
+    async def seed(self, fetch):
+        """(Re)load from `fetch(limit)`, an awaitable returning rows in `columns` order."""
+        self._reseeding = True
+        try:
+            self.load(await fetch(self.k))
+        finally:
+            self._reseeding = False
+        logging.debug("[risk_summary] top-risk cache loaded with %d accounts", len(self._rows))
+
+    def mark_stale(self):
+        """Reseed on the next read (e.g. after missing notifications)."""
+        self._stale = True
+
+    def handle(self, payload: Dict[str, Any]):
+        """Event bus handler for flag_notifications.EVENT."""
+        if not self._seeded or payload.get("id") is None:
+            return
+        row = tuple(payload.get(_EVENT_FIELDS.get(c, c)) for c in self.columns)
+        self._put((payload["platform"], payload["handle"]), row)
+
+    def refresh_if_stale(self, fetch):
+        """Start a background reseed when due; readers keep getting the current ranking meanwhile."""
+        if not self._reseeding and (self._stale or time.monotonic() - self._loaded_at >= MAX_AGE_SECONDS):
+            self._reseeding = True
+            self._task = asyncio.get_running_loop().create_task(self.seed(fetch))
+
+    def top(self, limit: int) -> List[Tuple]:
+        if self._ranked is None:
+            self._ranked = sorted(self._rows.values(), key=lambda r: -float(r[self._score_index] or 0.0))
+        return self._ranked[:limit]
+
+
+# Event payload keys for list columns whose names differ
+_EVENT_FIELDS = {"created_at": "first_seen", "reasons": "reason_codes"}
+
+top_risk: Optional[TopRiskCache] = None
+
+
+async def start(columns: Tuple[str, ...], fetch, k: int = TOP_K):
+    """Seed the in-process top-K from the database and keep it current from committed-flag events."""
+    global top_risk
+    top_risk = TopRiskCache(k=k, columns=columns)
+    await top_risk.seed(fetch)
+    event_bus.subscribe(flag_notifications.EVENT, top_risk.handle)
@@ -0,0 +1,230 @@
+import hashlib
+import logging
+import math
+import os
+import struct
+import time
+from typing import Iterable, List, Optional, Set
+from app.domain.value_objects import Handle
+
+FILTER_DIR = os.environ.get("EUMENIDES_FILTER_DIR", "crawl_filters")
+RECENT_TTL_SECONDS = int(os.environ.get("EUMENIDES_RECENT_TTL_SECONDS", str(7 * 24 * 3600)))
+NOT_FOUND_TTL_SECONDS = int(os.environ.get("EUMENIDES_NOT_FOUND_TTL_SECONDS", str(30 * 24 * 3600)))
+
+_MAGIC = b"EUBF1"
+
+
+def _key(handle: str) -> str:
+    return Handle(handle).normalized()
+
+
+def _hashes(key: str):
+    digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one blake2b digest."""
+
+    def __init__(self, capacity: int, error_rate: float, bits: Optional[bytearray] = None, count: int = 0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.nbits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.k = max(1, round(self.nbits / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.nbits + 7) // 8)
+        self.count = count
+
+    def _positions(self, key: str):
+        h1, h2 = _hashes(key)
+        n = self.nbits
+        return ((h1 + i * h2) % n for i in range(self.k))
+
+    def add(self, key: str) -> bool:
+        """Add a key; returns False if it was (probably) already present."""
+        new = False
+        bits = self.bits
+        for p in self._positions(key):
+            byte, mask = p >> 3, 1 << (p & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+
+class ScalableBloomFilter:
+    """Bloom filter that grows by stacking larger, tighter filters as it fills up."""
+
+    GROWTH = 2
+    TIGHTENING = 0.5
+
+    def __init__(self, initial_capacity: int = 100_000, error_rate: float = 0.001):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.filters: List[BloomFilter] = []
+
+    def _grow(self):
+        i = len(self.filters)
+        self.filters.append(BloomFilter(
+            self.initial_capacity * (self.GROWTH ** i),
+            self.error_rate * (1 - self.TIGHTENING) * (self.TIGHTENING ** i),
+        ))
+
+    def add(self, key: str) -> bool:
+        if key in self:
+            return False
+        if not self.filters or self.filters[-1].full:
+            self._grow()
+        return self.filters[-1].add(key)
+
+    def __contains__(self, key: str) -> bool:
+        return any(key in f for f in reversed(self.filters))
+
+    def __len__(self) -> int:
+        return sum(f.count for f in self.filters)
+
+    def write(self, fh):
+        fh.write(struct.pack("<QdI", self.initial_capacity, self.error_rate, len(self.filters)))
+        for f in self.filters:
+            fh.write(struct.pack("<QdQ", f.capacity, f.error_rate, f.count))
+            fh.write(f.bits)
+
+    @classmethod
+    def read(cls, fh) -> "ScalableBloomFilter":
+        initial_capacity, error_rate, n = struct.unpack("<QdI", fh.read(struct.calcsize("<QdI")))
+        sbf = cls(initial_capacity, error_rate)
+        for _ in range(n):
+            capacity, err, count = struct.unpack("<QdQ", fh.read(struct.calcsize("<QdQ")))
+            f = BloomFilter(capacity, err, count=count)
+            f.bits = bytearray(fh.read(len(f.bits)))
+            sbf.filters.append(f)
+        return sbf
+
+
+class SeenFilter:
+    """Persistent handle filter with optional expiry and exact confirmation.
+
+    With a ttl, two generations are kept and the older one is discarded every
+    ttl/2 seconds, so entries are remembered for between ttl/2 and ttl. With
+    `confirm=True` an exact set is kept next to the Bloom filter and positive
+    hits are confirmed against it, so the filter never reports false positives;
+    otherwise the Bloom filter's error rate is accepted.
+    """
+
+    def __init__(self, name: str, directory: str = FILTER_DIR, ttl: Optional[int] = None,
+                 initial_capacity: int = 100_000, error_rate: float = 0.001, confirm: bool = False):
+        self.name = name
+        self.path = os.path.join(directory, f"{name}.bloom")
+        self.exact_path = os.path.join(directory, f"{name}.exact")
+        self.ttl = ttl
+        self._initial_capacity = initial_capacity
+        self._error_rate = error_rate
+        self.exact: Optional[Set[str]] = set() if confirm else None
+        self.rotated_at = time.time()
+        self.current = ScalableBloomFilter(initial_capacity, error_rate)
+        self.previous: Optional[ScalableBloomFilter] = None
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if self.exact is not None and os.path.exists(self.exact_path):
+            with open(self.exact_path, encoding="utf-8") as fh:
+                self.exact.update(line.strip() for line in fh if line.strip())
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as fh:
+                if fh.read(len(_MAGIC)) != _MAGIC:
+                    raise ValueError("bad magic")
+                self.rotated_at, has_previous = struct.unpack("<d?", fh.read(struct.calcsize("<d?")))
+                self.current = ScalableBloomFilter.read(fh)
+                self.previous = ScalableBloomFilter.read(fh) if has_previous else None
+        except Exception:
+            logging.exception("Could not load filter %s, starting empty", self.path)
+        self._maybe_rotate()
+
+    def _maybe_rotate(self):
+        if self.ttl is None:
+            return
+        now = time.time()
+        if now - self.rotated_at >= self.ttl:
+            # both generations are stale
+            self.previous = None
+            self.current = ScalableBloomFilter(self._initial_capacity, self._error_rate)
+            self.rotated_at = now
+            self._dirty = True
+        elif now - self.rotated_at >= self.ttl / 2:
+            self.previous = self.current
+            self.current = ScalableBloomFilter(self._initial_capacity, self._error_rate)
+            self.rotated_at = now
+            self._dirty = True
+
+    def add(self, handle: str):
+        self._maybe_rotate()
+        key = _key(handle)
+        if self.exact is not None and key not in self.exact:
+            self.exact.add(key)
+            self._dirty = True
+        if self.current.add(key):
+            self._dirty = True
+
+    def __contains__(self, handle: str) -> bool:
+        key = _key(handle)
+        hit = key in self.current or (self.previous is not None and key in self.previous)
+        if hit and self.exact is not None:
+            return key in self.exact
+        return hit
+
+    def __len__(self) -> int:
+        return len(self.current) + (len(self.previous) if self.previous else 0)
+
+    def save(self):
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(_MAGIC)
+            fh.write(struct.pack("<d?", self.rotated_at, self.previous is not None))
+            self.current.write(fh)
+            if self.previous is not None:
+                self.previous.write(fh)
+        os.replace(tmp, self.path)
+        if self.exact is not None:
+            with open(tmp, "w", encoding="utf-8") as fh:
+                fh.writelines(f"{k}\n" for k in sorted(self.exact))
+            os.replace(tmp, self.exact_path)
+        self._dirty = False
+
+
+class CrawlFilters:
+    """The three filters consulted before any entity lookup."""
+
+    def __init__(self, directory: str = FILTER_DIR, safe_handles: Iterable[str] = ()):
+        self.recent = SeenFilter("recent", directory, ttl=RECENT_TTL_SECONDS)
+        self.not_found = SeenFilter("not_found", directory, ttl=NOT_FOUND_TTL_SECONDS)
+        self.safe = SeenFilter("safe", directory, confirm=True)
+        for h in safe_handles:
+            self.safe.add(h)
+
+    def skip_reason(self, handle: str) -> Optional[str]:
+        if handle in self.safe:
+            return "known safe"
+        if handle in self.not_found:
+            return "not found"
+        if handle in self.recent:
+            return "crawled recently"
+        return None
+
+    def save(self):
+        for f in (self.recent, self.not_found, self.safe):
+            f.save()
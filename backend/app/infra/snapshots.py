@@ -0,0 +1,168 @@
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import select, func, text, literal
+from sqlalchemy.dialects.postgresql import insert
+from app.db import AsyncSessionLocal, engine
+from app.models import AccountSnapshot, FlaggedAccount as ORMFlagged
+from app.infra import reason_templates
+
+PARENT_TABLE = AccountSnapshot.__tablename__
+_PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+# Months whose partition is known to exist in this process; only added once the CREATE committed
+_ensured: Set[Tuple[int, int]] = set()
+
+
+def _month_start(dt: datetime) -> datetime:
+    return datetime(dt.year, dt.month, 1, tzinfo=timezone.utc)
+
+
+def _next_month(dt: datetime) -> datetime:
+    return datetime(dt.year + (dt.month == 12), dt.month % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(dt: datetime) -> str:
+    return f"{PARENT_TABLE}_y{dt.year:04d}m{dt.month:02d}"
+
+
+def partition_ddl(start: datetime) -> str:
+    return (f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF {PARENT_TABLE} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{_next_month(start).isoformat()}')")
+
+
+async def ensure_partitions(conn, around: Optional[datetime] = None, months_ahead: int = 1):
+    """Create the monthly partitions for `around` and the following months if missing."""
+    start = _month_start(around or datetime.now(timezone.utc))
+    for _ in range(months_ahead + 1):
+        await conn.execute(text(partition_ddl(start)))
+        start = _next_month(start)
+
+
+async def _ensure_months(months: Iterable[Tuple[int, int]], bind=None):
+    """Create partitions in their own transaction, so a rolled-back save can't leave _ensured wrong."""
+    async with (bind or engine).begin() as conn:
+        for year, month in sorted(months):
+            await conn.execute(text(partition_ddl(datetime(year, month, 1, tzinfo=timezone.utc))))
+    _ensured.update(months)
+
+
+def snapshot_row(account_id: int, entity, captured_at: datetime) -> Dict:
+    return {
+        "account_id": account_id,
+        "captured_at": captured_at,
+        "platform": entity.metadata.platform,
+        "handle": entity.metadata.handle.normalized(),
+        "display_name": entity.metadata.display_name,
+        "description": entity.metadata.description,
+        "risk_score": float(entity.risk_score.value),
+        "reasons": reason_templates.codes(entity.reasons),
+    }
+
+
+async def append(session, rows: Iterable[Dict]):
+    """Bulk-insert snapshot rows inside the caller's transaction."""
+    rows = list(rows)
+    if not rows:
+        return
+    missing = {(r["captured_at"].year, r["captured_at"].month) for r in rows} - _ensured
+    if missing:
+        await _ensure_months(missing)
+    await session.execute(insert(AccountSnapshot).on_conflict_do_nothing(), rows)
+
+
+async def score_history(platform: str, handle: str, since: Optional[datetime] = None,
+                        session_factory=AsyncSessionLocal) -> List[Tuple]:
+    """(captured_at, risk_score, reasons) for one account, oldest first."""
+    async with session_factory() as session:
+        account_id = select(ORMFlagged.id).where(ORMFlagged.platform == platform, ORMFlagged.handle == handle).scalar_subquery()
+        stmt = (
+            select(AccountSnapshot.captured_at, AccountSnapshot.risk_score, AccountSnapshot.reasons)
+            .where(AccountSnapshot.account_id == account_id)
+            .order_by(AccountSnapshot.captured_at)
+        )
+        if since is not None:
+            stmt = stmt.where(AccountSnapshot.captured_at >= since)
+        res = await session.execute(stmt)
+        return res.tuples().all()
+
+
+ESCALATION_COLUMNS = ("id", "platform", "handle", "display_name", "previous_score", "current_score", "increase")
+
+
+async def newly_escalated(days: int = 7, min_increase: float = 0.2, limit: int = 100,
+                          session_factory=AsyncSessionLocal) -> List[Tuple]:
+    """Accounts whose peak score in the last `days` rose by at least `min_increase`
+    over their last score before the window (new accounts count from 0).
+
+    Rows follow ESCALATION_COLUMNS, biggest increase first.
+    """
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    recent = (
+        select(AccountSnapshot.account_id, func.max(AccountSnapshot.risk_score).label("peak"))
+        .where(AccountSnapshot.captured_at >= since)
+        .group_by(AccountSnapshot.account_id)
+        .subquery()
+    )
+    prior = (
+        select(AccountSnapshot.account_id, AccountSnapshot.risk_score)
+        .where(AccountSnapshot.captured_at < since, AccountSnapshot.account_id.in_(select(recent.c.account_id)))
+        .order_by(AccountSnapshot.account_id, AccountSnapshot.captured_at.desc())
+        .distinct(AccountSnapshot.account_id)
+        .subquery()
+    )
+    previous = func.coalesce(prior.c.risk_score, literal(0.0))
+    increase = (recent.c.peak - previous).label("increase")
+    stmt = (
+        select(ORMFlagged.id, ORMFlagged.platform, ORMFlagged.handle, ORMFlagged.display_name,
+               previous.label("previous_score"), recent.c.peak.label("current_score"), increase)
+        .join(recent, recent.c.account_id == ORMFlagged.id)
+        .outerjoin(prior, prior.c.account_id == ORMFlagged.id)
+        .where(recent.c.peak - previous >= min_increase)
+        .order_by(increase.desc())
+        .limit(limit)
+    )
+    async with session_factory() as session:
+        res = await session.execute(stmt)
+        return res.tuples().all()
+
+
+SNAPSHOT_COLUMNS = ("account_id", "captured_at", "platform", "handle", "display_name", "description", "risk_score", "reasons")
+
+
+async def iter_snapshot_rows(since: Optional[datetime] = None, batch_size: int = 10000,
+                             session_factory=AsyncSessionLocal):
+    """Stream snapshot tuples (SNAPSHOT_COLUMNS) in time order via a server-side cursor."""
+    stmt = select(*(getattr(AccountSnapshot, c) for c in SNAPSHOT_COLUMNS)).order_by(AccountSnapshot.captured_at)
+    if since is not None:
+        stmt = stmt.where(AccountSnapshot.captured_at >= since)
+    async with session_factory() as session:
+        result = await session.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions(batch_size):
+            yield [tuple(r) for r in partition]
+
+
+async def drop_partitions_before(cutoff: datetime, session_factory=AsyncSessionLocal) -> List[str]:
+    """Detach and drop monthly partitions that end on or before `cutoff`."""
+    dropped = []
+    async with session_factory() as session:
+        res = await session.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent"
+        ), {"parent": PARENT_TABLE})
+        for (name,) in res.all():
+            m = _PARTITION_NAME.match(name)
+            if not m:
+                continue
+            start = datetime(int(m.group(1)), int(m.group(2)), 1, tzinfo=timezone.utc)
+            if _next_month(start) <= cutoff:
+                await session.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+                await session.execute(text(f"DROP TABLE {name}"))
+                _ensured.discard((start.year, start.month))
+                dropped.append(name)
+        await session.commit()
+    if dropped:
+        logging.info("Dropped snapshot partitions: %s", ", ".join(dropped))
+    return dropped
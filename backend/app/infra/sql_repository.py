@@ -1,30 +1,88 @@
-from typing import List, Optional
-from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
 from app.db import AsyncSessionLocal, Base, engine
 from app.models import FlaggedAccount as ORMFlagged
 from app.domain.entities import FlaggedAccount, AccountMetadata
 from app.domain.value_objects import Timestamp, Handle, RiskScore
-from sqlalchemy import select, update
+from app.domain.reasons import Reason
+from app.infra import cluster_index, snapshots, reason_templates, risk_summary, flag_notifications
+from sqlalchemy import select, update, or_, func, text, literal
+
+# Columns served by list endpoints, in the order returned by the *_rows methods
+FLAG_LIST_COLUMNS = (
+    "id", "platform", "handle", "display_name", "description",
+    "risk_score", "model_score", "reasons", "created_at", "last_seen",
+)
+_FLAG_LIST_SELECT = tuple(getattr(ORMFlagged, c) for c in FLAG_LIST_COLUMNS)
+
+# Statements create_all can't express; all idempotent so they run on every startup
+_EXTENSIONS_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+]
+_POST_CREATE_DDL = [
+    # columns added after flagged_accounts was first deployed
+    "ALTER TABLE flagged_accounts ADD COLUMN IF NOT EXISTS model_score double precision",
+    "ALTER TABLE flagged_accounts ADD COLUMN IF NOT EXISTS model_features jsonb",
+    "ALTER TABLE crawl_frontier ADD COLUMN IF NOT EXISTS claimed_at timestamptz",
+    # trigram GIN indexes back substring/fuzzy search (ILIKE '%x%', %, <%)
+    "CREATE INDEX IF NOT EXISTS ix_flagged_accounts_handle_trgm ON flagged_accounts USING gin (handle gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_flagged_accounts_display_name_trgm ON flagged_accounts USING gin (display_name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_flagged_accounts_description_trgm ON flagged_accounts USING gin (description gin_trgm_ops)",
+    # serves ORDER BY risk_score DESC LIMIT n and keyset pagination without a sort
+    "CREATE INDEX IF NOT EXISTS ix_flagged_accounts_risk_score ON flagged_accounts (risk_score DESC, id)",
+    # containment index for reason-code filters (reasons @> '[{"rule": "seller"}]')
+    "CREATE INDEX IF NOT EXISTS ix_flagged_accounts_reasons ON flagged_accounts USING gin (reasons jsonb_path_ops)",
+]
+
+# Shortest query trigram indexes can serve; shorter ones would fall back to a sequential scan
+MIN_SEARCH_LENGTH = 3
 
 async def ensure_tables():
-    """Create all tables if they don't exist."""
+    """Create all tables (and their extensions/indexes) if they don't exist."""
     async with engine.begin() as conn:
+        for ddl in _EXTENSIONS_DDL:
+            await conn.execute(text(ddl))
         await conn.run_sync(Base.metadata.create_all)
+        for ddl in _POST_CREATE_DDL:
+            await conn.execute(text(ddl))
+        await snapshots.ensure_partitions(conn)
+        await reason_templates.seed(conn)
+        await risk_summary.ensure_seeded(conn)
+
+def _search_pattern(query: str) -> str:
+    """Turn a user query into an ILIKE pattern: `cpselq*` is a prefix match, anything else a substring."""
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    if "*" in escaped:
+        return escaped.replace("*", "%")
+    return f"%{escaped}%"
+
+def _captured_at(entity: FlaggedAccount) -> datetime:
+    """Snapshot time: when the metadata was fetched, so replayed captures land at their original time."""
+    fetched = getattr(entity.metadata.fetched_at, "value", None)
+    if not isinstance(fetched, datetime):
+        return datetime.now(timezone.utc)
+    return fetched if fetched.tzinfo else fetched.replace(tzinfo=timezone.utc)
 
 class SqlAccountRepository:
     def __init__(self, session_factory=AsyncSessionLocal):
         self._session_factory = session_factory
 
-    async def save(self, entity: FlaggedAccount) -> FlaggedAccount:
-        """Insert or update a flagged account."""
+    async def save(self, entity: FlaggedAccount, notify: bool = True) -> FlaggedAccount:
+        """Insert or update a flagged account.
+
+        last_seen follows the metadata's fetch time, so replayed captures don't
+        look fresh; `notify=False` (replays) keeps the save off the live stream.
+        """
+        seen_at = _captured_at(entity)
         async with self._session_factory() as session:
-            # Try to find existing row
+            # Try to find existing row; locked so concurrent saves move its risk bucket one at a time
             stmt = (
                 select(ORMFlagged)
                 .where(
                     ORMFlagged.platform == entity.metadata.platform,
                     ORMFlagged.handle == entity.metadata.handle.normalized()
                 )
+                .with_for_update()
             )
             res = await session.execute(stmt)
             row = res.scalar_one_or_none()
@@ -41,13 +99,21 @@ class SqlAccountRepository:
 
             if row:
                 # Update existing
+                await risk_summary.apply(session, row.platform, row.risk_score, float(entity.risk_score.value))
                 row.risk_score = float(entity.risk_score.value)
-                row.reasons = entity.reasons
+                row.reasons = reason_templates.codes(entity.reasons)
+                if entity.model_score is not None:
+                    row.model_score = entity.model_score
+                    row.model_features = entity.model_features
                 row.display_name = entity.metadata.display_name
                 row.description = entity.metadata.description
                 row.account_metadata = metadata_data
-                row.last_seen = datetime.utcnow()
+                row.last_seen = max(row.last_seen, seen_at) if row.last_seen else seen_at
                 session.add(row)
+                await cluster_index.index_account(session, row.id, entity.metadata)
+                await snapshots.append(session, [snapshots.snapshot_row(row.id, entity, seen_at)])
+                if notify:
+                    await flag_notifications.notify(session, row.id)
                 await session.commit()
                 domain = self._orm_to_domain(row)
                 return domain
@@ -61,9 +127,18 @@ class SqlAccountRepository:
                     account_metadata =metadata_data,
                     metadata_hash=None,
                     risk_score=float(entity.risk_score.value),
-                    reasons=entity.reasons
+                    reasons=reason_templates.codes(entity.reasons),
+                    model_score=entity.model_score,
+                    model_features=entity.model_features,
+                    last_seen=seen_at,
                 )
                 session.add(new)
+                await session.flush()
+                await risk_summary.apply(session, new.platform, None, new.risk_score)
+                await cluster_index.index_account(session, new.id, entity.metadata)
+                await snapshots.append(session, [snapshots.snapshot_row(new.id, entity, seen_at)])
+                if notify:
+                    await flag_notifications.notify(session, new.id)
                 await session.commit()
                 await session.refresh(new)
                 domain = self._orm_to_domain(new)
@@ -77,6 +152,74 @@ class SqlAccountRepository:
             rows = res.scalars().all()
             return [self._orm_to_domain(r) for r in rows]
 
+    async def list_flagged_rows(self, limit: int = 100, reason: Optional[Dict[str, str]] = None) -> List[Tuple]:
+        """Top flagged accounts as plain tuples (see FLAG_LIST_COLUMNS), skipping ORM hydration.
+
+        `reason` is a partial reason code, e.g. {"rule": "seller"} or
+        {"rule": "keyword", "term": "cp"}; matching uses the reasons GIN index.
+        """
+        async with self._session_factory() as session:
+            stmt = select(*_FLAG_LIST_SELECT).order_by(ORMFlagged.risk_score.desc()).limit(limit)
+            if reason:
+                stmt = stmt.where(ORMFlagged.reasons.contains([reason]))
+            res = await session.execute(stmt)
+            return res.tuples().all()
+
+    async def rows_by_ids(self, ids: List[int]) -> List[Tuple]:
+        """Flagged accounts by id as FLAG_LIST_COLUMNS tuples."""
+        if not ids:
+            return []
+        async with self._session_factory() as session:
+            res = await session.execute(select(*_FLAG_LIST_SELECT).where(ORMFlagged.id.in_(ids)))
+            return res.tuples().all()
+
+    async def iter_flagged_rows(self, batch_size: int = 1000, limit: Optional[int] = None,
+                                columns=FLAG_LIST_COLUMNS) -> AsyncIterator[List[Tuple]]:
+        """Stream flagged accounts by descending risk in batches of tuples via a server-side cursor."""
+        async with self._session_factory() as session:
+            stmt = select(*(getattr(ORMFlagged, c) for c in columns)).order_by(ORMFlagged.risk_score.desc(), ORMFlagged.id)
+            if limit is not None:
+                stmt = stmt.limit(limit)
+            result = await session.stream(stmt.execution_options(yield_per=batch_size))
+            async for partition in result.partitions(batch_size):
+                yield [tuple(r) for r in partition]
+
+    async def search_rows(self, query: str, limit: int = 50, offset: int = 0, fuzzy: bool = True) -> List[Tuple]:
+        """Substring/fuzzy search over handle, display name and description.
+
+        Rows are FLAG_LIST_COLUMNS followed by a relevance rank, best matches first.
+        """
+        q = query.strip().lower()
+        pattern = _search_pattern(q)
+        term = q.replace("*", "").strip()
+        conditions = [
+            ORMFlagged.handle.ilike(pattern, escape="\\"),
+            ORMFlagged.display_name.ilike(pattern, escape="\\"),
+            ORMFlagged.description.ilike(pattern, escape="\\"),
+        ]
+        if fuzzy:
+            # `%` / `<%` are the index-assisted forms of similarity / word_similarity >= threshold
+            conditions += [
+                ORMFlagged.handle.op("%")(term),
+                literal(term).op("<%")(ORMFlagged.display_name),
+                literal(term).op("<%")(ORMFlagged.description),
+            ]
+        rank = func.greatest(
+            func.similarity(ORMFlagged.handle, term),
+            func.word_similarity(term, func.coalesce(ORMFlagged.display_name, "")),
+            func.word_similarity(term, func.coalesce(ORMFlagged.description, "")),
+        ).label("rank")
+        async with self._session_factory() as session:
+            stmt = (
+                select(*_FLAG_LIST_SELECT, rank)
+                .where(or_(*conditions))
+                .order_by(rank.desc(), ORMFlagged.risk_score.desc(), ORMFlagged.id)
+                .limit(limit)
+                .offset(offset)
+            )
+            res = await session.execute(stmt)
+            return res.tuples().all()
+
     async def find_by_handle(self, platform: str, handle: str) -> Optional[FlaggedAccount]:
         """Find a flagged account by platform and handle."""
         async with self._session_factory() as session:
@@ -104,7 +247,7 @@ class SqlAccountRepository:
             fetched_at=Timestamp(row.created_at) if row.created_at else Timestamp(datetime.utcnow())
         )
 
-        reasons = row.reasons if row.reasons else []
+        reasons = [Reason.from_code(r) for r in row.reasons] if row.reasons else []
 
         return FlaggedAccount(
             id=row.id,
@@ -112,5 +255,7 @@ class SqlAccountRepository:
             risk_score=RiskScore(row.risk_score),
             reasons=reasons,
             created_at=created_at,
-            last_seen=last_seen
+            last_seen=last_seen,
+            model_score=row.model_score,
+            model_features=row.model_features
         )
@@ -0,0 +1,129 @@
+import argparse
+import hashlib
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple, Union
+
+Page = Union[str, bytes, Tuple[int, Dict[str, str], Union[str, bytes]]]
+
+
+class StubServer:
+    """Local stand-in for remote sites, for exercising adapters and the fetch engine offline.
+
+    `pages` maps a path to a body or a (status, headers, body) tuple; unknown
+    paths are 404. Every 200 carries an ETag and honours If-None-Match.
+    `fail_first` makes the first N requests to each path answer 503 (with
+    Retry-After when `retry_after` is set) and `latency` delays every
+    response; `hits` counts requests per path and `max_active` the most
+    requests served at once.
+    """
+
+    def __init__(self, pages: Optional[Dict[str, Page]] = None, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, fail_first: int = 0, retry_after: Optional[int] = None):
+        self.pages: Dict[str, Page] = dict(pages or {})
+        self.latency = latency
+        self.fail_first = fail_first
+        self.retry_after = retry_after
+        self.hits: Counter = Counter()
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def netloc(self) -> str:
+        return self.url[len("http://"):]
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like real sites
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                with stub._lock:
+                    stub.hits[path] += 1
+                    hit = stub.hits[path]
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                try:
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                finally:
+                    with stub._lock:
+                        stub.active -= 1
+                if hit <= stub.fail_first:
+                    extra = {"Retry-After": str(stub.retry_after)} if stub.retry_after is not None else {}
+                    return self._send(503, extra, b"unavailable")
+                page = stub.pages.get(path)
+                if page is None:
+                    return self._send(404, {}, b"not found")
+                status, headers, body = page if isinstance(page, tuple) else (200, {}, page)
+                body = body.encode() if isinstance(body, str) else body
+                headers = {"Content-Type": "text/html; charset=utf-8", **headers}
+                if status == 200:
+                    etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                    if self.headers.get("If-None-Match") == etag:
+                        return self._send(304, {"ETag": etag}, b"")
+                    headers["ETag"] = etag
+                self._send(status, headers, body)
+
+            def _send(self, status, headers, body):
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def synthetic_pages(n: int) -> Dict[str, str]:
+    """n profile-like pages at /p/<i>; every tenth one reads like a seller page."""
+    pages = {}
+    for i in range(n):
+        title, desc = (f"CP group {i} 🔥", "vendo links, dm for megas") if i % 10 == 0 else (f"Bakery {i}", "Fresh bread daily")
+        pages[f"/p/{i}"] = (f"<html><head><title>{title}</title><meta name=\"description\" content=\"{desc}\">"
+                            f"</head><body><p>{'x' * 2000}</p></body></html>")
+    return pages
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve synthetic profile pages for offline crawls")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--fail-first", type=int, default=0)
+    args = parser.parse_args()
+    server = StubServer(synthetic_pages(args.pages), port=args.port, latency=args.latency, fail_first=args.fail_first)
+    print(f"Serving {args.pages} pages on {server.url}/p/<n> (web handles: {server.netloc}/p/<n>)")
+    server._server.serve_forever()
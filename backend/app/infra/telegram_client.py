@@ -1,28 +1,48 @@
 import asyncio
-from telethon import TelegramClient
-from telethon.errors import UsernameNotOccupiedError, ChannelInvalidError
+import re
 from app.config import settings
+from app.domain.platforms import PlatformAdapter
+from app.domain.value_objects import Handle
+from app.infra import capture
 from datetime import datetime
 
-_client = TelegramClient(settings.TELEGRAM_SESSION, settings.TELEGRAM_API_ID, settings.TELEGRAM_API_HASH)
+_USERNAME = re.compile(r"^[a-z0-9_]{3,64}$")
 
-async def start_client():
-    if not _client.is_connected():
-        await _client.start()
+# Telethon is imported and the client built on first use so API-only processes never pay for it
+_client = None
+
+def get_client():
+    global _client
+    if _client is None:
+        if not settings.TELEGRAM_API_ID or not settings.TELEGRAM_API_HASH:
+            raise RuntimeError("TELEGRAM_API_ID / TELEGRAM_API_HASH are not configured")
+        from telethon import TelegramClient
+        _client = TelegramClient(settings.TELEGRAM_SESSION, settings.TELEGRAM_API_ID, settings.TELEGRAM_API_HASH)
     return _client
 
+async def start_client():
+    client = get_client()
+    if not client.is_connected():
+        await client.start()
+    return client
+
+def _not_found_errors():
+    """Errors meaning the username does not exist; anything else (flood waits, RPC, network) is transient."""
+    from telethon.errors import UsernameNotOccupiedError, UsernameInvalidError
+    return (UsernameNotOccupiedError, UsernameInvalidError, ValueError)
+
 async def fetch_public_channel_metadata(username_or_link: str):
-    await start_client()
+    """Metadata for a public handle, or None when it does not exist; transient errors propagate."""
+    not_found = _not_found_errors()
+    client = await start_client()
     handle = username_or_link.strip()
     if handle.startswith("https://t.me/"):
         handle = handle.split("t.me/")[-1]
     if handle.startswith("@"):
         handle = handle[1:]
     try:
-        entity = await _client.get_entity(handle)
-    except (UsernameNotOccupiedError, ChannelInvalidError, ValueError):
-        return None
-    except Exception:
+        entity = await client.get_entity(handle)
+    except not_found:
         return None
 
     # Try to extract username from multiple possible fields
@@ -36,6 +56,7 @@ async def fetch_public_channel_metadata(username_or_link: str):
     display_name = None
     description = None
     participants_count = None
+    full_info = None
 
     # User or channel/group logic
     from telethon.tl.types import User, Channel, Chat
@@ -45,7 +66,8 @@ async def fetch_public_channel_metadata(username_or_link: str):
         # Try to get bio (about)
         try:
             from telethon.tl.functions.users import GetFullUser
-            full = await _client(GetFullUser(entity.id))
+            full = await client(GetFullUser(entity.id))
+            full_info = full.full_user
             description = getattr(full.full_user, "about", None)
         except Exception:
             description = None
@@ -54,7 +76,8 @@ async def fetch_public_channel_metadata(username_or_link: str):
         display_name = getattr(entity, "title", None)
         try:
             from telethon.tl.functions.channels import GetFullChannel
-            full = await _client(GetFullChannel(entity))
+            full = await client(GetFullChannel(entity))
+            full_info = full.full_chat
             description = getattr(full.full_chat, "about", None)
             participants_count = getattr(full.full_chat, "participants_count", None)
         except Exception:
@@ -69,4 +92,29 @@ async def fetch_public_channel_metadata(username_or_link: str):
         "participants_count": participants_count,
         "fetched_at": datetime.utcnow().isoformat()
     }
+    if capture.enabled():
+        capture.record("channel", result, handle=handle,
+                       raw={"entity": entity.to_dict(), "full": full_info.to_dict() if full_info is not None else None})
     return result
+
+
+class TelegramAdapter(PlatformAdapter):
+    """Telethon-backed adapter; one fetch at a time to stay clear of flood waits."""
+
+    platform = "telegram"
+    max_concurrency = 1
+    delay = 0.8
+
+    def normalize(self, raw_handle: str) -> str:
+        """@name, t.me / telegram.me links (http or https, with paths or queries) -> name."""
+        raw = raw_handle.strip()
+        for prefix in ("http://", "https://"):
+            if raw.lower().startswith(prefix):
+                raw = "https://" + raw[len(prefix):].replace("telegram.me/", "t.me/")
+        return Handle(raw).normalized().split("?")[0].split("/")[0]
+
+    def is_valid(self, handle: str) -> bool:
+        return bool(_USERNAME.match(handle))
+
+    async def fetch(self, handle: str):
+        return await fetch_public_channel_metadata(handle)
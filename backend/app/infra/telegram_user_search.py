@@ -8,10 +8,11 @@ from datetime import datetime
 from app.infra.telegram_client import start_client
 from app.domain.value_objects import Handle, Timestamp
 from app.domain.entities import AccountMetadata
-from app.domain.services import create_flagged_from_metadata  # if you kept domain.services path
+from app.domain.services import create_flagged_from_metadata, FLAG_THRESHOLD  # if you kept domain.services path
 from app.application.use_cases import IngestTelegramHandle  # optional usage pattern
 from app.infra.sql_repository import SqlAccountRepository
 from app.infra.event_bus import event_bus
+from app.infra import reason_templates, capture
 
 # conservative patterns (tune in a whitelist/blacklist admin UI)
 SUSPICIOUS_PATTERNS = [
@@ -70,22 +71,34 @@ async def search_users_by_query(query: str, limit: int = 50):
                 fetched_at=Timestamp(datetime.utcnow())
             )
 
+            if capture.enabled():
+                capture.record("search", {
+                    "username": username,
+                    "title": display,
+                    "id": getattr(u, "id", None),
+                    "description": about,
+                    "is_bot": getattr(u, "bot", False),
+                    "fetched_at": metadata.fetched_at.value.isoformat(),
+                }, raw=u.to_dict(), query=query)
+
             # quick pattern check on username/display/about
             text_to_check = " ".join(filter(None, [username or "", display or "", about or ""]))
             if COMPILED.search(text_to_check):
                 # use domain scoring (pure logic) to create flagged entity
                 from app.domain.services import create_flagged_from_metadata  # local import to avoid cycles
                 flagged = create_flagged_from_metadata(metadata)
-                if flagged.risk_score.value >= 0.2:
-                    await repo.save(flagged)
+                if flagged.risk_score.value >= FLAG_THRESHOLD:
+                    saved = await repo.save(flagged)
                     # Optionally emit domain event
                     event_bus.publish("AccountFlagged", {
+                        "id": saved.id,
                         "platform": "telegram",
                         "handle": metadata.handle.normalized(),
                         "display_name": metadata.display_name,
                         "description": metadata.description,
                         "risk_score": flagged.risk_score.value,
-                        "reasons": flagged.reasons,
+                        "reasons": reason_templates.render(flagged.reasons),
+                        "reason_codes": reason_templates.codes(flagged.reasons),
                         "first_seen": flagged.created_at.value.isoformat(),
                         "last_seen": flagged.last_seen.value.isoformat(),
                         "crawl_log": [{"query": query, "fetched_at": datetime.utcnow().isoformat()}]
@@ -0,0 +1,100 @@
+import os
+import re
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Optional, Set
+from app.domain.entities import AccountMetadata
+from app.domain.platforms import PlatformAdapter
+from app.infra.fetch_engine import FetchEngine, get_engine
+
+# http for local stand-ins (app.infra.stub_server)
+SCHEME = os.environ.get("EUMENIDES_WEB_SCHEME", "https")
+_DESCRIPTION_META = ("description", "og:description", "twitter:description")
+_TITLE_META = ("og:title", "twitter:title")
+_HOST = re.compile(r"([^/?#]*)(.*)", re.S)
+
+
+class _PageMeta(HTMLParser):
+    """Collects <title> and description/title <meta> tags, stopping at <body>."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.meta = {}
+        self._in_title = False
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title":
+            self._in_title = True
+        elif tag == "meta":
+            a = dict(attrs)
+            key = (a.get("name") or a.get("property") or "").lower()
+            if key and a.get("content") and key not in self.meta:
+                self.meta[key] = a["content"].strip()
+        elif tag == "body":
+            self.done = True
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+
+
+def parse_page(html: str) -> dict:
+    parser = _PageMeta()
+    # the head is all we score; feed in slices so huge pages are not fully parsed
+    for i in range(0, len(html), 16384):
+        parser.feed(html[i:i + 16384])
+        if parser.done:
+            break
+    title = " ".join(parser.title.split()) or next((parser.meta[k] for k in _TITLE_META if k in parser.meta), None)
+    description = next((parser.meta[k] for k in _DESCRIPTION_META if k in parser.meta), None)
+    return {"title": title or None, "description": description}
+
+
+class WebPageAdapter(PlatformAdapter):
+    """Public web pages, keyed by host + path ("example.com/shop"); scores title and meta description."""
+
+    platform = "web"
+    max_concurrency = 32  # per-host limits are enforced by the fetch engine
+    delay = 0.0
+
+    def __init__(self, engine: Optional[FetchEngine] = None, scheme: str = SCHEME):
+        self.engine = engine
+        self.scheme = scheme
+
+    def normalize(self, raw_handle: str) -> str:
+        """Scheme and fragment stripped, host lowercased; paths and queries are case-sensitive, so kept as given."""
+        h = raw_handle.strip()
+        for prefix in ("https://", "http://"):
+            if h.lower().startswith(prefix):
+                h = h[len(prefix):]
+        host, rest = _HOST.match(h.split("#")[0]).groups()
+        return host.lower() + rest.rstrip("/")
+
+    def is_valid(self, handle: str) -> bool:
+        return super().is_valid(handle) and bool(_HOST.match(handle).group(1))
+
+    def references(self, metadata: AccountMetadata) -> Set[str]:
+        return set()  # outgoing page links are not followed yet
+
+    async def fetch(self, handle: str) -> Optional[dict]:
+        handle = self.normalize(handle)
+        resp = await (self.engine or get_engine()).get(f"{self.scheme}://{handle}")
+        if resp.status in (404, 410):
+            return None
+        if not resp.ok:
+            raise RuntimeError(f"HTTP {resp.status} fetching {resp.url}")
+        page = parse_page(resp.text())
+        return {
+            "username": handle,
+            "id": None,
+            "title": page["title"],
+            "description": page["description"],
+            "participants_count": None,
+            "fetched_at": datetime.utcnow().isoformat(),
+        }
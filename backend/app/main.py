@@ -1,28 +1,64 @@
+import time
+
+_BOOT_STARTED = time.perf_counter()
+
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from app.api.controllers import router as api_router
-from app.infra.sql_repository import ensure_tables
+from app.infra.sql_repository import ensure_tables, SqlAccountRepository, FLAG_LIST_COLUMNS
+from app.config import settings
 import logging
 
-from app.infra import export_adapter
+from app.infra import export_adapter, flag_notifications, live_stream, reason_templates, report_queue, risk_summary
+from app.db import engine
 
 app = FastAPI(title="Eumenides - DDD Metadata Monitor (safe-only)")
 app.include_router(api_router)
 
+_first_request_served = False
+
+@app.middleware("http")
+async def log_cold_start(request: Request, call_next):
+    global _first_request_served
+    response = await call_next(request)
+    if not _first_request_served:
+        _first_request_served = True
+        logging.info("Cold start to first served request: %.3fs", time.perf_counter() - _BOOT_STARTED)
+    return response
+
+def _on_flag_gap():
+    # notifications were lost while LISTEN reconnected
+    risk_summary.top_risk.mark_stale()
+    live_stream.broadcaster.reset()
+
 @app.on_event("startup")
 async def startup():
     logging.info("Starting up, creating DB if needed")
     await ensure_tables()
-    try:
-        from app.infra.telegram_client import start_client
-        await start_client()
-    except Exception:
-        logging.exception("Telegram client init failed; continue for offline dev")
-    # subscribe export adapter
+    await reason_templates.load()
+    await risk_summary.start(FLAG_LIST_COLUMNS, lambda limit: SqlAccountRepository().list_flagged_rows(limit=limit))
+    live_stream.subscribe()
+    # flags saved by the crawler (or another replica) reach this process through LISTEN
+    flag_notifications.start(flag_notifications.asyncpg_dsn(engine.url), FLAG_LIST_COLUMNS,
+                             SqlAccountRepository().rows_by_ids, on_gap=_on_flag_gap)
+    report_queue.subscribe()
+    # subscribe export adapter (encryption and the export dir are set up on the first export)
     try:
         export_adapter.subscribe()
     except Exception:
         logging.exception("export adapter subscribe failed")
+    if not settings.API_ONLY:
+        try:
+            from app.infra.telegram_client import start_client
+            await start_client()
+        except Exception:
+            logging.exception("Telegram client init failed; continue for offline dev")
+    logging.info("Startup finished in %.3fs", time.perf_counter() - _BOOT_STARTED)
+
+@app.on_event("shutdown")
+async def shutdown():
+    await report_queue.auto_reporter.drain()
+    await flag_notifications.stop()
 
 if __name__ == "__main__":
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, SmallInteger, BigInteger, LargeBinary, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.db import Base
 from sqlalchemy.dialects.postgresql import JSONB
@@ -15,5 +15,137 @@ class FlaggedAccount(Base):
     metadata_hash = Column(String(128), nullable=True)
     risk_score = Column(Float, default=0.0)
     reasons = Column(JSONB, nullable=False)        # Optional change
+    model_score = Column(Float, nullable=True)
+    model_features = Column(JSONB, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    last_seen = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
\ No newline at end of file
+    last_seen = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class AccountSignature(Base):
+    """MinHash signature of an account, kept to verify LSH candidates."""
+    __tablename__ = "account_signatures"
+    account_id = Column(Integer, ForeignKey("flagged_accounts.id", ondelete="CASCADE"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)
+
+
+class LshBucket(Base):
+    """One row per (band, bucket) an account's signature hashes into."""
+    __tablename__ = "lsh_buckets"
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    account_id = Column(Integer, ForeignKey("flagged_accounts.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+
+class AccountCluster(Base):
+    __tablename__ = "account_clusters"
+    account_id = Column(Integer, ForeignKey("flagged_accounts.id", ondelete="CASCADE"), primary_key=True)
+    cluster_id = Column(Integer, nullable=False, index=True)
+
+
+class AccountSnapshot(Base):
+    """Append-only copy of an account's scored state, one row per save.
+
+    Range-partitioned by month on captured_at (partitions are created by
+    app.infra.snapshots), so old months can be dropped without a vacuum.
+    """
+    __tablename__ = "account_snapshots"
+    __table_args__ = (
+        Index("ix_account_snapshots_captured_at_brin", "captured_at", postgresql_using="brin"),
+        Index("ix_account_snapshots_account_captured", "account_id", "captured_at"),
+        {"postgresql_partition_by": "RANGE (captured_at)"},
+    )
+    account_id = Column(Integer, primary_key=True)
+    captured_at = Column(DateTime(timezone=True), primary_key=True)
+    platform = Column(String(32))
+    handle = Column(String(256))
+    display_name = Column(String(512))
+    description = Column(Text, nullable=True)
+    risk_score = Column(Float)
+    reasons = Column(JSONB, nullable=False)
+
+
+class KeywordStat(Base):
+    """Running yield of one search keyword, used by the keyword scheduler."""
+    __tablename__ = "keyword_stats"
+    keyword = Column(String(128), primary_key=True)
+    pulls = Column(Integer, nullable=False, default=0)
+    handles_found = Column(Integer, nullable=False, default=0)
+    new_handles = Column(Integer, nullable=False, default=0)
+    flagged = Column(Integer, nullable=False, default=0)
+    risk_sum = Column(Float, nullable=False, default=0.0)
+    reward_sum = Column(Float, nullable=False, default=0.0)
+    last_pulled_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class AccountLink(Base):
+    """Directed reference from one account's profile text to another handle."""
+    __tablename__ = "account_links"
+    platform = Column(String(32), primary_key=True)
+    src_handle = Column(String(256), primary_key=True)
+    dst_handle = Column(String(256), primary_key=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class CrawlFrontier(Base):
+    """Handles waiting to be crawled, highest priority first."""
+    __tablename__ = "crawl_frontier"
+    __table_args__ = (
+        Index("ix_crawl_frontier_pending", "status", "priority"),
+    )
+    platform = Column(String(32), primary_key=True)
+    handle = Column(String(256), primary_key=True)
+    priority = Column(Float, nullable=False, default=0.0)
+    depth = Column(SmallInteger, nullable=False, default=0)
+    source = Column(String(256), nullable=True)  # handle or import that enqueued it
+    status = Column(String(16), nullable=False, default="pending")  # pending | claimed | done
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    enqueued_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class AnalystLabel(Base):
+    """Analyst verdict on an account (1 = abusive, 0 = benign); training data for the learned model."""
+    __tablename__ = "analyst_labels"
+    platform = Column(String(32), primary_key=True)
+    handle = Column(String(256), primary_key=True)
+    label = Column(SmallInteger, nullable=False)
+    labeled_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class ReasonTemplate(Base):
+    """Localized wording of a reason code (rule id or "field.<name>" label)."""
+    __tablename__ = "reason_templates"
+    key = Column(String(64), primary_key=True)
+    lang = Column(String(8), primary_key=True)
+    template = Column(Text, nullable=False)
+
+
+class ReportSubmission(Base):
+    """Submission state of one account's abuse report; one row per account."""
+    __tablename__ = "report_submissions"
+    __table_args__ = (
+        Index("ix_report_submissions_due", "status", "next_attempt_at"),
+    )
+    platform = Column(String(32), primary_key=True)
+    handle = Column(String(256), primary_key=True)
+    idempotency_key = Column(String(64), nullable=False, unique=True)
+    risk_score = Column(Float, nullable=False, default=0.0)
+    payload = Column(JSONB, nullable=False)
+    requested_by = Column(String(16), nullable=False, default="auto")  # auto | manual
+    status = Column(String(16), nullable=False, default="pending")  # pending | claimed | submitted | failed
+    attempts = Column(SmallInteger, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now())
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    submitted_at = Column(DateTime(timezone=True), nullable=True)
+    external_id = Column(String(128), nullable=True)
+    last_error = Column(Text, nullable=True)
+    enqueued_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class RiskSummary(Base):
+    """Flagged account counts per platform and risk-score bucket, kept current by every save."""
+    __tablename__ = "risk_summary"
+    platform = Column(String(32), primary_key=True)
+    bucket = Column(SmallInteger, primary_key=True)  # floor(risk_score * 10), 1.0 folded into 9
+    count = Column(BigInteger, nullable=False, default=0)
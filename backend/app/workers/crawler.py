@@ -1,21 +1,106 @@
+import argparse
 import asyncio
 from datetime import datetime
-from app.application.use_cases import IngestTelegramHandle
+from typing import Dict, Optional
+from app.application.use_cases import IngestHandle
+from app.domain.platforms import PlatformAdapter
 from app.infra.sql_repository import SqlAccountRepository
-from app.infra.telegram_client import fetch_public_channel_metadata
+from app.infra.seen_filter import CrawlFilters
+from app.infra import link_graph, platforms
 from app.application.dtos import IngestHandleDTO
-from app.infra.telegram_client import start_client
 import logging
 
-async def run_crawl(handles: list):
+async def run_crawl(handles: list, filters: Optional[CrawlFilters] = None,
+                    discovery: Optional[link_graph.LinkDiscovery] = None, depths: Optional[Dict[str, int]] = None,
+                    platform: str = "telegram", adapter: Optional[PlatformAdapter] = None):
+    """Ingest handles through the platform's adapter, skipping any the crawl filters already know about.
+
+    Up to `adapter.max_concurrency` handles are in flight at once, each worker
+    pausing `adapter.delay` between fetches (Telegram: one at a time, 0.8s apart).
+    Returns {handle: scored FlaggedAccount or None} for the handles actually fetched.
+    """
+    adapter = adapter or platforms.get_adapter(platform)
     repo = SqlAccountRepository()
-    usecase = IngestTelegramHandle(account_repo=repo, telegram_adapter=type("A", (), {"fetch_public_channel_metadata": fetch_public_channel_metadata}))
+    usecase = IngestHandle(account_repo=repo, adapter=adapter, discovery=discovery)
+    results = {}
 
+    todo = []
     for h in handles:
-        logging.info(f"Processing handle: {h}")
-        dto = IngestHandleDTO(platform="telegram", raw_handle=h, discovered_at=datetime.utcnow())
-        try:
-            await usecase.execute(dto)
-        except Exception:
-            logging.exception("Error ingesting %s", h)
-        await asyncio.sleep(0.8)
+        if filters is not None:
+            reason = filters.skip_reason(h)
+            if reason:
+                logging.info(f"Skipping handle {h}: {reason}")
+                continue
+        todo.append(h)
+    pending = iter(todo)
+
+    async def worker():
+        # workers share one iterator, so each handle is taken exactly once
+        for h in pending:
+            logging.info(f"Processing handle: {h}")
+            dto = IngestHandleDTO(platform=adapter.platform, raw_handle=h, discovered_at=datetime.utcnow(),
+                                  depth=(depths or {}).get(h, 0))
+            try:
+                results[h] = await usecase.execute(dto)
+            except Exception:
+                logging.exception("Error ingesting %s", h)
+                continue
+            if filters is not None:
+                if results[h] is None:
+                    filters.not_found.add(h)
+                else:
+                    filters.recent.add(h)
+            if adapter.delay:
+                await asyncio.sleep(adapter.delay)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(adapter.max_concurrency, len(todo))))))
+
+    if filters is not None:
+        filters.save()
+    return results
+
+async def run_frontier(max_items: int = 200, batch_size: Optional[int] = None, filters: Optional[CrawlFilters] = None,
+                       discovery: Optional[link_graph.LinkDiscovery] = None, platform: str = "telegram"):
+    """Crawl handles queued in the frontier (link discovery, imports), best priority first."""
+    adapter = platforms.get_adapter(platform)
+    # claim enough per round to keep every concurrent worker busy
+    batch_size = batch_size or max(20, 2 * adapter.max_concurrency)
+    discovery = discovery or link_graph.LinkDiscovery()
+    processed = 0
+    while processed < max_items:
+        batch = await link_graph.claim(limit=min(batch_size, max_items - processed), platform=platform)
+        if not batch:
+            break
+        depths = dict(batch)
+        results = await run_crawl(list(depths), filters=filters, discovery=discovery, depths=depths, adapter=adapter)
+        # handles whose ingest raised stay claimed; the lease expiring retries them later
+        done = [h for h in depths if h in results or (filters is not None and filters.skip_reason(h))]
+        await link_graph.mark_done(done, platform=platform)
+        if len(done) < len(depths):
+            logging.info("Left %d failed handles for retry after the claim lease", len(depths) - len(done))
+        processed += len(batch)
+    return processed
+
+
+async def _main(platform: str, handles: list, frontier: int):
+    adapter = platforms.get_adapter(platform)
+    try:
+        if handles:
+            results = await run_crawl([adapter.normalize(h) for h in handles], adapter=adapter)
+            for h, flagged in results.items():
+                print(h, "not found" if flagged is None else f"risk {flagged.risk_score.value}")
+        if frontier:
+            print(f"Crawled {await run_frontier(max_items=frontier, platform=platform)} queued {platform} handles")
+    finally:
+        from app.infra.fetch_engine import get_engine
+        await get_engine().close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Crawl handles of any registered platform")
+    parser.add_argument("handles", nargs="*")
+    parser.add_argument("--platform", default="telegram", choices=platforms.available())
+    parser.add_argument("--frontier", type=int, default=0, help="also crawl up to N handles queued for the platform")
+    args = parser.parse_args()
+    asyncio.run(_main(args.platform, args.handles, args.frontier))
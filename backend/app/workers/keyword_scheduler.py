@@ -0,0 +1,116 @@
+import math
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from app.db import AsyncSessionLocal
+from app.models import KeywordStat
+
+# Weight of the exploration bonus in UCB1; higher favours rarely searched keywords
+EXPLORATION = 0.5
+
+
+@dataclass
+class KeywordArm:
+    keyword: str
+    pulls: int = 0
+    handles_found: int = 0
+    new_handles: int = 0
+    flagged: int = 0
+    risk_sum: float = 0.0
+    reward_sum: float = 0.0
+
+    @property
+    def mean_reward(self) -> float:
+        return self.reward_sum / self.pulls if self.pulls else 0.0
+
+    @property
+    def flagged_fraction(self) -> float:
+        return self.flagged / self.new_handles if self.new_handles else 0.0
+
+    @property
+    def avg_risk(self) -> float:
+        return self.risk_sum / self.flagged if self.flagged else 0.0
+
+
+def search_reward(flagged_risks: List[float], limit: int) -> float:
+    """Reward of one search in [0, 1]: summed risk of newly flagged accounts per result slot."""
+    return min(1.0, sum(flagged_risks) / max(1, limit))
+
+
+class KeywordScheduler:
+    """UCB1 bandit over search keywords with stats persisted in keyword_stats.
+
+    Keywords never searched before are always tried first, so newly added ones
+    get explored; afterwards each search goes to the keyword with the best
+    mean reward plus an exploration bonus that shrinks as it is searched more.
+    """
+
+    def __init__(self, keywords: Iterable[str], session_factory=AsyncSessionLocal, exploration: float = EXPLORATION):
+        self.keywords = list(dict.fromkeys(k.strip() for k in keywords if k.strip()))
+        self._session_factory = session_factory
+        self.exploration = exploration
+        self.arms: Dict[str, KeywordArm] = {}
+
+    async def load(self):
+        async with self._session_factory() as session:
+            res = await session.execute(select(KeywordStat).where(KeywordStat.keyword.in_(self.keywords)))
+            stored = {row.keyword: row for row in res.scalars().all()}
+        for kw in self.keywords:
+            row = stored.get(kw)
+            self.arms[kw] = KeywordArm(
+                keyword=kw,
+                pulls=row.pulls if row else 0,
+                handles_found=row.handles_found if row else 0,
+                new_handles=row.new_handles if row else 0,
+                flagged=row.flagged if row else 0,
+                risk_sum=row.risk_sum if row else 0.0,
+                reward_sum=row.reward_sum if row else 0.0,
+            )
+        return self
+
+    def next_keyword(self, exclude: Iterable[str] = ()) -> Optional[str]:
+        excluded = set(exclude)
+        arms = [a for a in self.arms.values() if a.keyword not in excluded]
+        if not arms:
+            return None
+        unexplored = [a for a in arms if a.pulls == 0]
+        if unexplored:
+            return random.choice(unexplored).keyword
+        total = sum(a.pulls for a in arms)
+        log_total = math.log(total)
+
+        def ucb(a: KeywordArm) -> float:
+            return a.mean_reward + self.exploration * math.sqrt(2 * log_total / a.pulls)
+
+        return max(arms, key=ucb).keyword
+
+    async def record(self, keyword: str, handles_found: int, new_handles: int, flagged_risks: List[float], limit: int):
+        """Update a keyword's stats after one search and persist them."""
+        arm = self.arms.setdefault(keyword, KeywordArm(keyword))
+        reward = search_reward(flagged_risks, limit)
+        arm.pulls += 1
+        arm.handles_found += handles_found
+        arm.new_handles += new_handles
+        arm.flagged += len(flagged_risks)
+        arm.risk_sum += sum(flagged_risks)
+        arm.reward_sum += reward
+        delta = {
+            "pulls": 1,
+            "handles_found": handles_found,
+            "new_handles": new_handles,
+            "flagged": len(flagged_risks),
+            "risk_sum": sum(flagged_risks),
+            "reward_sum": reward,
+        }
+        now = datetime.now(timezone.utc)
+        async with self._session_factory() as session:
+            # increments rather than absolute values so concurrent crawlers don't overwrite each other
+            stmt = insert(KeywordStat).values(keyword=keyword, last_pulled_at=now, **delta)
+            set_ = {k: getattr(KeywordStat, k) + v for k, v in delta.items()}
+            set_["last_pulled_at"] = now
+            await session.execute(stmt.on_conflict_do_update(index_elements=[KeywordStat.keyword], set_=set_))
+            await session.commit()
+        return reward
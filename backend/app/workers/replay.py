@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from app.application.dtos import IngestHandleDTO
+from app.application.use_cases import IngestHandle
+from app.infra import capture
+
+CHUNK_SIZE = 512
+
+
+def _dto(record: Dict) -> IngestHandleDTO:
+    data = record["data"]
+    raw_handle = record.get("handle") or data.get("username") or str(data.get("id"))
+    return IngestHandleDTO(platform="telegram", raw_handle=raw_handle,
+                           discovered_at=datetime.fromisoformat(record["captured_at"]))
+
+
+def _account_key(record: Dict) -> str:
+    data = record["data"]
+    return (data.get("username") or str(data.get("id"))).lower()
+
+
+async def replay(directory: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                 dry_run: bool = False, concurrency: int = 16, kinds=("channel", "search")) -> Counter:
+    """Push captured fetches through IngestHandle.process_metadata.
+
+    Records are taken in capture order in chunks; within a chunk only the
+    latest capture of each account is kept, so concurrent saves never let an
+    older capture overwrite a newer one. Events are not published, so replays
+    do not re-trigger exports or reports. With `dry_run` nothing is written
+    and only the flag counts are reported.
+    """
+    repo = None
+    if not dry_run:
+        from app.infra.sql_repository import SqlAccountRepository
+        repo = SqlAccountRepository()
+    usecase = IngestHandle(account_repo=repo, adapter=None)
+    stats: Counter = Counter()
+    sem = asyncio.Semaphore(concurrency)
+
+    async def run_one(record: Dict):
+        async with sem:
+            try:
+                if dry_run:
+                    flagged = usecase.score(record["data"], _dto(record))
+                else:
+                    flagged = await usecase.process_metadata(record["data"], _dto(record), publish=False)
+            except Exception:
+                stats["errors"] += 1
+                logging.exception("Replay failed for %s", _account_key(record))
+                return
+            stats["flagged" if usecase.should_flag(flagged) else "not_flagged"] += 1
+
+    async def run_chunk(chunk: List[Dict]):
+        latest = {_account_key(r): r for r in chunk}
+        stats["superseded"] += len(chunk) - len(latest)
+        await asyncio.gather(*(run_one(r) for r in latest.values()))
+
+    started = time.perf_counter()
+    chunk: List[Dict] = []
+    for record in capture.iter_records(directory, since=since, until=until):
+        stats["records"] += 1
+        if record.get("kind") not in kinds or not record.get("data"):
+            stats["skipped"] += 1
+            continue
+        chunk.append(record)
+        if len(chunk) >= CHUNK_SIZE:
+            await run_chunk(chunk)
+            chunk = []
+            logging.info("Replayed %d records", stats["records"])
+    if chunk:
+        await run_chunk(chunk)
+    stats["seconds"] = round(time.perf_counter() - started, 2)
+    return stats
+
+
+def _parse_time(value: str) -> datetime:
+    dt = datetime.fromisoformat(value)
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Re-score captured Telegram fetches without recrawling")
+    parser.add_argument("--dir", default=capture.CAPTURE_DIR, required=capture.CAPTURE_DIR is None,
+                        help="capture directory (default: EUMENIDES_CAPTURE_DIR)")
+    parser.add_argument("--since", type=_parse_time)
+    parser.add_argument("--until", type=_parse_time)
+    parser.add_argument("--dry-run", action="store_true", help="score only, write nothing")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--kind", dest="kinds", action="append", choices=["channel", "search"])
+    args = parser.parse_args()
+    result = asyncio.run(replay(args.dir, since=args.since, until=args.until, dry_run=args.dry_run,
+                                concurrency=args.concurrency, kinds=tuple(args.kinds or ("channel", "search"))))
+    print(dict(result))
@@ -0,0 +1,62 @@
+import argparse
+import asyncio
+import logging
+import os
+from typing import Optional
+from app.infra import report_queue
+from app.infra.rate_limit import TokenBucket
+from app.infra.report_sinks import ReportSink, get_sink
+
+RATE_PER_HOUR = float(os.environ.get("EUMENIDES_REPORT_RATE_PER_HOUR", "3600"))
+BATCH_SIZE = int(os.environ.get("EUMENIDES_REPORT_BATCH_SIZE", "50"))
+IDLE_SECONDS = 5.0
+
+
+async def run_submitter(sink: Optional[ReportSink] = None, rate_per_hour: float = RATE_PER_HOUR,
+                        batch_size: int = BATCH_SIZE, once: bool = False) -> int:
+    """Drain the report queue into a sink at a bounded rate; returns reports submitted.
+
+    Tokens are taken before claiming and a batch (riskiest first) is only as
+    large as the tokens in hand, so the sink never sees more than
+    `rate_per_hour` reports per hour and claimed reports are sent right away,
+    well within report_queue.CLAIM_LEASE. With `once` the loop stops when
+    nothing is due instead of polling.
+    """
+    sink = sink or get_sink()
+    batch_size = max(1, min(batch_size, int(rate_per_hour)))
+    bucket = TokenBucket(rate_per_hour / 3600.0, burst=batch_size)
+    submitted = 0
+    try:
+        while True:
+            # waiting for tokens after claiming could outlast the lease and get the batch sent twice
+            tokens = await bucket.acquire_up_to(batch_size)
+            claimed = await report_queue.claim(limit=tokens)
+            bucket.refund(tokens - len(claimed))
+            if not claimed:
+                if once:
+                    break
+                await asyncio.sleep(IDLE_SECONDS)
+                continue
+            try:
+                results = await sink.submit_batch(claimed)
+            except Exception as e:
+                logging.warning("Report sink %s failed for %d reports: %s", sink.name, len(claimed), e)
+                await report_queue.release(claimed, error=str(e)[:500])
+                continue
+            ok, retried, failed = await report_queue.record_results(claimed, results)
+            submitted += ok
+            logging.info("Reports: %d submitted, %d to retry, %d failed", ok, retried, failed)
+    finally:
+        await sink.close()
+    return submitted
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Submit queued abuse reports")
+    parser.add_argument("--sink", default=None, help="local or http (default: EUMENIDES_REPORT_SINK)")
+    parser.add_argument("--rate", type=float, default=RATE_PER_HOUR, help="max reports per hour")
+    parser.add_argument("--once", action="store_true", help="exit when no report is due")
+    args = parser.parse_args()
+    total = asyncio.run(run_submitter(get_sink(args.sink) if args.sink else None, rate_per_hour=args.rate, once=args.once))
+    print(f"Submitted {total} reports")
@@ -1,17 +1,18 @@
+import argparse
 import asyncio
 import csv
 from datetime import datetime
 import json
 
-from app.infra.sql_repository import SqlAccountRepository
+from app.infra.sql_repository import SqlAccountRepository, FLAG_LIST_COLUMNS
+from app.infra.cluster_index import cluster_ids_for
+from app.infra.snapshots import newly_escalated, ESCALATION_COLUMNS
+from app.infra import reason_templates
 from app.domain.entities import FlaggedAccount
 from app.domain.value_objects import Timestamp
 
-try:
-    from fpdf import FPDF
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
+from app.infra.pdf_renderer import PDF_AVAILABLE, MAX_WORKERS, ReportLayout, render_report
+from app.infra.parquet_export import PARQUET_AVAILABLE, export_flagged_to_parquet, export_snapshots_to_parquet
 
 
 def human_date(dt, pt_format=False):
@@ -25,43 +26,22 @@ def human_date(dt, pt_format=False):
     return dt.strftime("%d/%m/%Y %H:%M:%S") if pt_format else dt.strftime("%Y-%m-%d %H:%M:%S")
 
 
-# English → Portuguese reason translations
-REASON_PT_MAP = {
-    "account name suggests seller activity (e.g. selling illegal content)": "nome de usuário sugere atividade de venda (ex: venda de conteúdo ilegal)",
-    "display name suggests seller activity (e.g. selling illegal content)": "nome de exibição sugere atividade de venda (ex: venda de conteúdo ilegal)",
-    "account name suggests suspicious/illicit content": "nome de usuário sugere conteúdo suspeito/ilícito",
-    "display name suggests suspicious/illicit content": "nome de exibição sugere conteúdo suspeito/ilícito",
-    "account name matches public Telegram handle pattern (potential risk)": "nome de usuário corresponde ao padrão público do Telegram (risco potencial)",
-}
-
-
-def translate_reason_pt(reason: str) -> str:
-    return REASON_PT_MAP.get(reason, reason)
-
-
 def safe_field(val):
     if val is None or (isinstance(val, str) and val.strip() == ""):
         return "N/A"
     return str(val)
 
 
-def safe_pdf_text(val):
-    """For PDF: replace non-latin-1 chars with '?'."""
-    if val is None:
-        return "N/A"
-    s = str(val)
-    try:
-        s.encode("latin-1")
-        return s
-    except UnicodeEncodeError:
-        return s.encode("latin-1", errors="replace").decode("latin-1")
+# ---------------- CSV EXPORTS ---------------- #
 
+async def _top_flagged(limit=1000):
+    """The ranked accounts (and their clusters) shared by the CSV exports."""
+    flagged = await SqlAccountRepository().list_flagged(limit=limit)
+    return flagged, await cluster_ids_for(acc.id for acc in flagged)
 
-# ---------------- CSV EXPORTS ---------------- #
 
-async def export_flagged_to_csv(csv_path="flagged_accounts_report.csv"):
-    repo = SqlAccountRepository()
-    flagged = await repo.list_flagged(limit=1000)
+async def export_flagged_to_csv(csv_path="flagged_accounts_report.csv", ranked=None):
+    flagged, clusters = ranked or await _top_flagged()
     report_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     with open(csv_path, mode="w", newline='', encoding="utf-8") as f:
@@ -70,7 +50,7 @@ async def export_flagged_to_csv(csv_path="flagged_accounts_report.csv"):
         writer.writerow([f"Flagged Telegram Accounts Report - Generated: {report_date}"])
         writer.writerow([
             "ID", "Platform", "Handle", "Display Name", "Description",
-            "Participants", "Risk Score", "Reasons", "First Seen", "Last Seen"
+            "Participants", "Risk Score", "Reasons", "First Seen", "Last Seen", "Cluster"
         ])
 
         for acc in flagged:
@@ -83,17 +63,17 @@ async def export_flagged_to_csv(csv_path="flagged_accounts_report.csv"):
                 safe_field(meta.description),
                 safe_field(meta.extra.get("participants", "") if meta.extra else "N/A"),
                 safe_field(acc.risk_score.value),
-                "; ".join(acc.reasons) if acc.reasons else "N/A",
+                "; ".join(reason_templates.render(acc.reasons)) if acc.reasons else "N/A",
                 human_date(acc.created_at.value if acc.created_at else None),
                 human_date(acc.last_seen.value if acc.last_seen else None),
+                safe_field(clusters.get(acc.id)),
             ])
 
     print(f"CSV report written to {csv_path}")
 
 
-async def export_flagged_to_csv_pt(csv_path="relatorio_contas_suspeitas.csv"):
-    repo = SqlAccountRepository()
-    flagged = await repo.list_flagged(limit=1000)
+async def export_flagged_to_csv_pt(csv_path="relatorio_contas_suspeitas.csv", ranked=None):
+    flagged, clusters = ranked or await _top_flagged()
     report_date = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
 
     with open(csv_path, mode="w", newline='', encoding="utf-8") as f:
@@ -118,12 +98,13 @@ async def export_flagged_to_csv_pt(csv_path="relatorio_contas_suspeitas.csv"):
             "Motivos: razões para flag",
             "Primeira Vez Visto",
             "Última Vez Visto",
+            "Grupo: contas quase idênticas recebem o mesmo número",
         ])
 
         for acc in flagged:
             meta = acc.metadata
-            reasons_pt = "\n".join(f"- {translate_reason_pt(r)}" for r in acc.reasons) if acc.reasons else "N/A"
-            raw_score = getattr(acc, "_raw_risk_score", acc.risk_score.value)
+            reasons_pt = "\n".join(f"- {r}" for r in reason_templates.render(acc.reasons, "pt")) if acc.reasons else "N/A"
+            raw_score = acc.raw_risk_score if acc.raw_risk_score is not None else acc.risk_score.value
 
             writer.writerow([
                 safe_field(acc.id),
@@ -137,116 +118,161 @@ async def export_flagged_to_csv_pt(csv_path="relatorio_contas_suspeitas.csv"):
                 reasons_pt,
                 human_date(acc.created_at.value if acc.created_at else None, pt_format=True),
                 human_date(acc.last_seen.value if acc.last_seen else None, pt_format=True),
+                safe_field(clusters.get(acc.id)),
             ])
 
     print(f"Relatório em português salvo em {csv_path}")
 
 
+async def export_escalations_to_csv(csv_path="escalated_accounts_report.csv", days=7, min_increase=0.2):
+    rows = await newly_escalated(days=days, min_increase=min_increase, limit=1000)
+    report_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    with open(csv_path, mode="w", newline='', encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([f"Accounts escalated in the last {days} days - Generated: {report_date}"])
+        writer.writerow([c.replace("_", " ").title() for c in ESCALATION_COLUMNS])
+        for row in rows:
+            writer.writerow([safe_field(round(v, 3) if isinstance(v, float) else v) for v in row])
+
+    print(f"Escalation report written to {csv_path}")
+
+
 # ---------------- PDF EXPORTS ---------------- #
 
-async def export_flagged_to_pdf(pdf_path="flagged_accounts_report.pdf"):
+REPORT_COLUMNS = FLAG_LIST_COLUMNS + ("account_metadata",)
+
+
+def _report_batches():
+    return SqlAccountRepository().iter_flagged_rows(columns=REPORT_COLUMNS)
+
+
+def _tee(source, n, maxsize=4):
+    """Split one async iterator of batches into n readers; the slowest reader paces the source."""
+    queues = [asyncio.Queue(maxsize=maxsize) for _ in range(n)]
+    done = object()
+
+    async def pump():
+        try:
+            async for item in source:
+                for q in queues:
+                    await q.put(item)
+        finally:
+            for q in queues:
+                await q.put(done)
+
+    async def reader(q):
+        while (item := await q.get()) is not done:
+            yield item
+
+    return asyncio.ensure_future(pump()), [reader(q) for q in queues]
+
+
+async def _pdf_rows(batches=None, pt_format=False):
+    """Turn flagged account batches into plain dicts ready for the PDF workers."""
+    async for batch in batches or _report_batches():
+        rows = []
+        for r in batch:
+            row = dict(zip(REPORT_COLUMNS, r))
+            extra = (row.pop("account_metadata") or {}).get("extra") or {}
+            reasons = reason_templates.render(row["reasons"], "pt" if pt_format else "en")
+            if pt_format:
+                row["reasons"] = "\n".join(f"- {x}" for x in reasons) if reasons else "N/A"
+            else:
+                row["reasons"] = "; ".join(reasons) if reasons else "N/A"
+            row["participants"] = safe_field(extra.get("participants"))
+            row["created_at"] = human_date(row["created_at"], pt_format=pt_format)
+            row["last_seen"] = human_date(row["last_seen"], pt_format=pt_format)
+            rows.append(row)
+        yield rows
+
+
+async def export_flagged_to_pdf(pdf_path="flagged_accounts_report.pdf", batches=None, max_workers=MAX_WORKERS):
     if not PDF_AVAILABLE:
-        print("FPDF is not installed. Run 'pip install fpdf' to enable PDF export.")
+        print("FPDF is not installed. Run 'pip install fpdf2' to enable PDF export.")
         return
 
-    repo = SqlAccountRepository()
-    flagged = await repo.list_flagged(limit=1000)
     report_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", style="B", size=14)
-    pdf.cell(0, 12, txt="Flagged Telegram Accounts Report", ln=True, align='C')
-    pdf.set_font("Arial", size=10)
-    pdf.cell(0, 8, txt=f"Generated: {report_date}", ln=True, align='C')
-    pdf.ln(4)
-
-    for acc in flagged:
-        meta = acc.metadata
-        pdf.set_font("Arial", style="B", size=10)
-        pdf.cell(0, 8, txt=f"Handle: {safe_pdf_text(meta.handle.normalized())}", ln=True)
-        pdf.set_font("Arial", size=10)
-        pdf.cell(0, 8, txt=f"Platform: {safe_pdf_text(meta.platform)}", ln=True)
-        pdf.cell(0, 8, txt=f"Display Name: {safe_pdf_text(meta.display_name)}", ln=True)
-        pdf.cell(0, 8, txt=f"Description: {safe_pdf_text(meta.description)}", ln=True)
-        pdf.cell(0, 8, txt=f"Participants: {safe_pdf_text(meta.extra.get('participants', '') if meta.extra else 'N/A')}", ln=True)
-        pdf.cell(0, 8, txt=f"Risk Score: {safe_pdf_text(acc.risk_score.value)}", ln=True)
-        pdf.cell(0, 8, txt=f"Reasons: {safe_pdf_text('; '.join(acc.reasons) if acc.reasons else 'N/A')}", ln=True)
-        pdf.cell(0, 8, txt=f"First Seen: {safe_pdf_text(human_date(acc.created_at.value if acc.created_at else None))}", ln=True)
-        pdf.cell(0, 8, txt=f"Last Seen: {safe_pdf_text(human_date(acc.last_seen.value if acc.last_seen else None))}", ln=True)
-
-        pdf.ln(2)
-        pdf.set_draw_color(100, 100, 100)
-        pdf.set_line_width(0.3)
-        pdf.line(10, pdf.get_y(), 200, pdf.get_y())
-        pdf.ln(2)
-
-    pdf.output(pdf_path)
-    print(f"PDF report written to {pdf_path}")
-
-
-async def export_flagged_to_pdf_pt(pdf_path="relatorio_contas_suspeitas.pdf"):
+    layout = ReportLayout(
+        title="Flagged Telegram Accounts Report",
+        subtitle=f"Generated: {report_date}",
+        heading_field=("handle", "Handle"),
+        fields=[
+            ("platform", "Platform"), ("display_name", "Display Name"), ("description", "Description"),
+            ("participants", "Participants"), ("risk_score", "Risk Score"), ("reasons", "Reasons"),
+            ("created_at", "First Seen"), ("last_seen", "Last Seen"),
+        ],
+    )
+    count = await render_report(layout, _pdf_rows(batches), pdf_path, max_workers=max_workers)
+    print(f"PDF report written to {pdf_path} ({count} accounts)")
+
+
+async def export_flagged_to_pdf_pt(pdf_path="relatorio_contas_suspeitas.pdf", batches=None, max_workers=MAX_WORKERS):
     if not PDF_AVAILABLE:
-        print("FPDF não está instalado. Rode 'pip install fpdf' para habilitar exportação PDF.")
+        print("FPDF não está instalado. Rode 'pip install fpdf2' para habilitar exportação PDF.")
         return
 
-    repo = SqlAccountRepository()
-    flagged = await repo.list_flagged(limit=1000)
     report_date = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", style="B", size=14)
-    pdf.cell(0, 12, txt="Relatório de Contas Suspeitas do Telegram", ln=True, align='C')
-    pdf.set_font("Arial", size=10)
-    pdf.cell(0, 8, txt=f"Gerado em: {report_date}", ln=True, align='C')
-    pdf.ln(4)
-
-    pdf.set_font("Arial", size=9)
-    pdf.multi_cell(0, 7, txt=(
-        "Este relatório lista contas públicas do Telegram identificadas como suspeitas por critérios automáticos. "
-        "Cada linha representa uma conta analisada. Um score de risco próximo de 1 indica alta suspeita; próximo de 0 indica baixa suspeita.\n\n"
-        "ID: identificador interno\nPlataforma: sempre 'telegram'\nUsuário: username público ou identificador\n"
-        "Nome de Exibição: nome visível no perfil\nDescrição: texto do perfil\nParticipantes: número de membros (se aplicável)\n"
-        "Score de Risco: 0 a 1\nMotivos: razões para flag\nPrimeira Vez Visto: data/hora da primeira detecção\nÚltima Vez Visto: data/hora da última detecção"
-    ), align='L')
-    pdf.ln(2)
-
-    for acc in flagged:
-        meta = acc.metadata
-        reasons_pt = "\n".join(f"- {translate_reason_pt(r)}" for r in acc.reasons) if acc.reasons else "N/A"
-
-        pdf.set_font("Arial", style="B", size=10)
-        pdf.cell(0, 8, txt=f"Usuário: {safe_pdf_text(meta.handle.normalized())}", ln=True)
-        pdf.set_font("Arial", size=10)
-        pdf.cell(0, 8, txt=f"Plataforma: {safe_pdf_text(meta.platform)}", ln=True)
-        pdf.cell(0, 8, txt=f"Nome de Exibição: {safe_pdf_text(meta.display_name)}", ln=True)
-        pdf.cell(0, 8, txt=f"Descrição: {safe_pdf_text(meta.description)}", ln=True)
-        pdf.cell(0, 8, txt=f"Participantes: {safe_pdf_text(meta.extra.get('participants', '') if meta.extra else 'N/A')}", ln=True)
-        pdf.cell(0, 8, txt=f"Score de Risco: {safe_pdf_text(acc.risk_score.value)}", ln=True)
-        pdf.multi_cell(0, 8, txt=f"Motivos:\n{safe_pdf_text(reasons_pt)}")
-        pdf.cell(0, 8, txt=f"Primeira Vez Visto: {safe_pdf_text(human_date(acc.created_at.value if acc.created_at else None, pt_format=True))}", ln=True)
-        pdf.cell(0, 8, txt=f"Última Vez Visto: {safe_pdf_text(human_date(acc.last_seen.value if acc.last_seen else None, pt_format=True))}", ln=True)
-
-        pdf.ln(2)
-        pdf.set_draw_color(100, 100, 100)
-        pdf.set_line_width(0.3)
-        pdf.line(10, pdf.get_y(), 200, pdf.get_y())
-        pdf.ln(2)
-
-    pdf.output(pdf_path)
-    print(f"Relatório PDF em português salvo em {pdf_path}")
+    layout = ReportLayout(
+        title="Relatório de Contas Suspeitas do Telegram",
+        subtitle=f"Gerado em: {report_date}",
+        intro=(
+            "Este relatório lista contas públicas do Telegram identificadas como suspeitas por critérios automáticos. "
+            "Cada linha representa uma conta analisada. Um score de risco próximo de 1 indica alta suspeita; próximo de 0 indica baixa suspeita.\n\n"
+            "ID: identificador interno\nPlataforma: sempre 'telegram'\nUsuário: username público ou identificador\n"
+            "Nome de Exibição: nome visível no perfil\nDescrição: texto do perfil\nParticipantes: número de membros (se aplicável)\n"
+            "Score de Risco: 0 a 1\nMotivos: razões para flag\nPrimeira Vez Visto: data/hora da primeira detecção\nÚltima Vez Visto: data/hora da última detecção"
+        ),
+        toc_title="Sumário",
+        toc_entry="Contas {first} a {last}",
+        heading_field=("handle", "Usuário"),
+        fields=[
+            ("platform", "Plataforma"), ("display_name", "Nome de Exibição"), ("description", "Descrição"),
+            ("participants", "Participantes"), ("risk_score", "Score de Risco"), ("reasons", "Motivos"),
+            ("created_at", "Primeira Vez Visto"), ("last_seen", "Última Vez Visto"),
+        ],
+    )
+    count = await render_report(layout, _pdf_rows(batches, pt_format=True), pdf_path, max_workers=max_workers)
+    print(f"Relatório PDF em português salvo em {pdf_path} ({count} contas)")
+
+
+# ---------------- PARQUET EXPORTS ---------------- #
+
+async def export_to_parquet(parquet_path="flagged_accounts.parquet", snapshots_path="account_snapshots.parquet"):
+    if not PARQUET_AVAILABLE:
+        print("pyarrow is not installed. Run 'pip install pyarrow' to enable Parquet export.")
+        return
+    count = await export_flagged_to_parquet(parquet_path)
+    print(f"Parquet export written to {parquet_path} ({count} accounts)")
+    count = await export_snapshots_to_parquet(snapshots_path)
+    print(f"Parquet snapshot export written to {snapshots_path} ({count} snapshots)")
 
 
 # ---------------- MAIN ---------------- #
 
-async def main():
-    await export_flagged_to_csv()
-    await export_flagged_to_csv_pt()
-    if PDF_AVAILABLE:
-        await export_flagged_to_pdf()
-        await export_flagged_to_pdf_pt()
+async def main(formats=("csv", "pdf")):
+    await reason_templates.load()
+    if "csv" in formats:
+        ranked = await _top_flagged()
+        await export_flagged_to_csv(ranked=ranked)
+        await export_flagged_to_csv_pt(ranked=ranked)
+        await export_escalations_to_csv()
+    if "pdf" in formats and PDF_AVAILABLE:
+        # both languages render from a single pass over the table, each with half the workers
+        pump, (en, pt) = _tee(_report_batches(), 2)
+        workers = max(1, MAX_WORKERS // 2)
+        await asyncio.gather(
+            export_flagged_to_pdf(batches=en, max_workers=workers),
+            export_flagged_to_pdf_pt(batches=pt, max_workers=workers),
+        )
+        await pump
+    if "parquet" in formats:
+        await export_to_parquet()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Export flagged account reports")
+    parser.add_argument("--format", dest="formats", action="append", choices=["csv", "pdf", "parquet"],
+                        help="repeatable; defaults to csv and pdf")
+    args = parser.parse_args()
+    asyncio.run(main(args.formats or ("csv", "pdf")))
@@ -0,0 +1,27 @@
+import argparse
+import asyncio
+import logging
+import os
+from app.infra import handle_import
+
+
+async def main(paths, fmt, column, platform, priority, batch_size):
+    for path in paths:
+        stats = await handle_import.import_handles(
+            handle_import.iter_file(path, fmt=fmt, column=column),
+            source=os.path.basename(path), platform=platform, priority=priority, batch_size=batch_size,
+        )
+        print(f"{path}: {dict(stats)}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Queue new handles from text/CSV files (optionally gzipped) for crawling")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--format", choices=["text", "csv"], help="default: csv for .csv/.csv.gz, text otherwise")
+    parser.add_argument("--column", help="CSV column name or index (default: 'handle' header, else the first column)")
+    parser.add_argument("--platform", default="telegram")
+    parser.add_argument("--priority", type=float, default=handle_import.IMPORT_PRIORITY)
+    parser.add_argument("--batch-size", type=int, default=handle_import.BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(main(args.paths, args.format, args.column, args.platform, args.priority, args.batch_size))
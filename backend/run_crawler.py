@@ -1,6 +1,11 @@
 
 import asyncio
-from app.workers.crawler import run_crawl
+from app.workers.crawler import run_crawl, run_frontier
+from app.infra.link_graph import LinkDiscovery
+from app.infra.seen_filter import CrawlFilters
+from app.infra import report_queue
+from app.workers.keyword_scheduler import KeywordScheduler
+from app.domain.services import FLAG_THRESHOLD
 from telethon import TelegramClient
 import os
 from app.config import settings
@@ -34,6 +39,9 @@ if __name__ == "__main__":
         "cpsel", "vendo_cp", "kidspor","hotlinks","hotlinkse","hotlinkso" 
     ]  # Add as many as you want
     delay_seconds = 30  # Big delay between keyword searches
+    search_budget = int(os.environ.get("EUMENIDES_SEARCH_BUDGET", len(keywords)))  # searches per run
+    search_limit = 10
+    frontier_budget = int(os.environ.get("EUMENIDES_FRONTIER_BUDGET", "200"))  # discovered handles per run
     safe_handles = [
         "kidsport", "kidsportschool","CPSEliteCRMbot","rcpisowifivendo2bot" # Add any handles you want to exclude
     ]
@@ -42,16 +50,38 @@ if __name__ == "__main__":
         session_name = os.environ.get("TELEGRAM_CRAWLER_SESSION", "crawler_session")
         client = TelegramClient(session_name, settings.TELEGRAM_API_ID, settings.TELEGRAM_API_HASH)
         await client.start()
-        keyword_handles = set()
-        for keyword in keywords:
+        report_queue.subscribe()
+        filters = CrawlFilters(safe_handles=safe_handles)
+        discovery = LinkDiscovery()
+        # known-safe, not-found and recently crawled handles are dropped before any get_entity call
+        manual = [h for h in manual_handles if filters.skip_reason(h) is None]
+        print(f"Manual handles (excluding safe/seen): {manual}")
+        await run_crawl(manual, filters=filters, discovery=discovery)
+
+        # spend the search budget on the keywords that have been yielding flags
+        scheduler = await KeywordScheduler(keywords).load()
+        for _ in range(search_budget):
+            keyword = scheduler.next_keyword()
             print(f"Searching for keyword: {keyword}")
-            result = await client(functions.contacts.SearchRequest(q=keyword, limit=10))
+            result = await client(functions.contacts.SearchRequest(q=keyword, limit=search_limit))
             found = [user.username for user in result.users if hasattr(user, 'username') and user.username]
-            print(f"Handles found for '{keyword}': {found}")
-            keyword_handles.update(found)
+            new = [h for h in found if filters.skip_reason(h) is None]
+            print(f"Handles found for '{keyword}': {found} (new: {new})")
+            results = await run_crawl(new, filters=filters, discovery=discovery)
+            risks = [r.risk_score.value for r in results.values() if r is not None and r.risk_score.value >= FLAG_THRESHOLD]
+            reward = await scheduler.record(keyword, len(found), len(new), risks, search_limit)
+            print(f"Keyword '{keyword}': {len(risks)} flagged, reward {reward:.3f}")
             await asyncio.sleep(delay_seconds)
-        all_handles = list((set(manual_handles) | keyword_handles) - set(safe_handles))
-        print(f"Combined handles (excluding safe): {all_handles}")
-        await run_crawl(all_handles)
 
-    asyncio.run(combined_crawl())
+        # follow references found in flagged profiles, highest-risk sources first
+        crawled = await run_frontier(max_items=frontier_budget, filters=filters, discovery=discovery)
+        print(f"Crawled {crawled} handles discovered through profile links")
+
+    async def main():
+        try:
+            await combined_crawl()
+        finally:
+            # reports for the last flags may still be buffered; write them before the loop closes
+            await report_queue.auto_reporter.drain()
+
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.infra import capture, sql_repository
+from app.workers import replay
+
+T0 = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class _Clock(datetime):
+    """datetime whose now() advances one second per call, so capture times are predictable."""
+    ticks = 0
+
+    @classmethod
+    def now(cls, tz=None):
+        cls.ticks += 1
+        return T0 + timedelta(seconds=cls.ticks)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    _Clock.ticks = 0
+    monkeypatch.setattr(capture, "datetime", _Clock)
+
+
+def _channel(username, title, description="", fetched_offset=0):
+    return {"username": username, "id": hash(username) & 0xFFFF, "title": title, "description": description,
+            "participants_count": 10, "fetched_at": (T0 + timedelta(seconds=fetched_offset)).isoformat()}
+
+
+def _write(directory, records, segment_bytes=capture.SEGMENT_BYTES):
+    writer = capture.CaptureWriter(str(directory), segment_bytes=segment_bytes)
+    for kind, data, fields in records:
+        writer.append(kind, data, raw={"blob": b"\x00\x01", "date": T0}, **fields)
+    writer.close()
+
+
+def test_records_round_trip_across_segments(tmp_path):
+    records = [("channel", _channel(f"h{i}", f"Title {i}"), {"handle": f"h{i}"}) for i in range(20)]
+    _write(tmp_path, records, segment_bytes=300)
+    assert len(capture.segments(str(tmp_path))) > 1
+    got = list(capture.iter_records(str(tmp_path)))
+    assert [r["data"] for r in got] == [d for _, d, _ in records]
+    assert got[0]["raw"] == {"blob": "AAE=", "date": T0.isoformat()}
+    assert got[0]["kind"] == "channel" and got[0]["handle"] == "h0"
+
+
+def test_time_bounds_use_the_index(tmp_path, clock):
+    _write(tmp_path, [("channel", _channel(f"h{i}", "x"), {}) for i in range(10)], segment_bytes=400)
+    times = [datetime.fromisoformat(r["captured_at"]) for r in capture.iter_records(str(tmp_path))]
+    got = [r["data"]["username"] for r in capture.iter_records(str(tmp_path), since=times[3], until=times[6])]
+    assert got == ["h3", "h4", "h5", "h6"]
+    assert list(capture.iter_records(str(tmp_path), since=times[-1] + timedelta(seconds=1))) == []
+
+
+def test_missing_index_is_rebuilt_and_torn_tail_ignored(tmp_path, clock):
+    _write(tmp_path, [("channel", _channel(f"h{i}", "x"), {}) for i in range(3)])
+    (segment,) = capture.segments(str(tmp_path))
+    os.remove(segment[:-len(".seg")] + ".idx")
+    with open(segment, "ab") as fh:
+        fh.write(capture._LEN.pack(500) + b"partial")
+    assert [r["data"]["username"] for r in capture.iter_records(str(tmp_path))] == ["h0", "h1", "h2"]
+    assert capture.rebuild_index(segment) == 3
+
+
+RECORDS = [
+    ("channel", _channel("vendo_cp", "CP links", "vendo cp, chama no pv", 0), {"handle": "vendo_cp"}),
+    ("channel", _channel("padaria_sol", "Padaria Sol", "pão fresco", 1), {"handle": "padaria_sol"}),
+    ("search", {}, {"query": "cp"}),
+    ("channel", _channel("vendo_cp", "CP links v2", "vendo cp", 2), {"handle": "vendo_cp"}),
+]
+
+
+def test_dry_run_replay_scores_without_writing(tmp_path, clock):
+    _write(tmp_path, RECORDS)
+    stats = asyncio.run(replay.replay(str(tmp_path), dry_run=True))
+    assert (stats["records"], stats["skipped"], stats["superseded"]) == (4, 1, 1)
+    assert stats["flagged"] + stats["not_flagged"] == 2 and not stats["errors"]
+
+
+class _Repo:
+    def __init__(self):
+        self.saved = []
+
+    async def save(self, entity, notify=True):
+        assert not notify  # replays stay off the live stream
+        self.saved.append(entity)
+        entity.id = len(self.saved)
+        return entity
+
+
+def test_replay_saves_the_latest_capture_of_each_account(tmp_path, clock, monkeypatch):
+    _write(tmp_path, RECORDS)
+    repo = _Repo()
+    monkeypatch.setattr(sql_repository, "SqlAccountRepository", lambda: repo)
+    published = []
+    monkeypatch.setattr(replay.IngestHandle, "_publish", lambda self, saved: published.append(saved))
+    stats = asyncio.run(replay.replay(str(tmp_path)))
+    by_handle = {e.metadata.handle.normalized(): e for e in repo.saved}
+    assert stats["flagged"] == len(repo.saved) and "vendo_cp" in by_handle
+    saved = by_handle["vendo_cp"]
+    assert saved.metadata.display_name == "CP links v2"
+    assert saved.metadata.fetched_at.value == T0 + timedelta(seconds=2)
+    assert published == []
+
+
+def test_index_missing_the_last_records_is_rebuilt(tmp_path, clock):
+    _write(tmp_path, [("channel", _channel(f"h{i}", "x"), {}) for i in range(3)])
+    (segment,) = capture.segments(str(tmp_path))
+    index = segment[:-len(".seg")] + ".idx"
+    # crash after the segment writes but before their index entries
+    with open(index, "r+b") as fh:
+        fh.truncate(capture._IDX.size)
+    assert [r["data"]["username"] for r in capture.iter_records(str(tmp_path))] == ["h0", "h1", "h2"]
+    assert os.path.getsize(index) == 3 * capture._IDX.size
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime
+from app.domain import similarity
+from app.domain.entities import AccountMetadata
+from app.domain.value_objects import Handle, Timestamp
+from app.infra import cluster_index
+
+
+def _md(handle, name, desc):
+    return AccountMetadata("telegram", Handle(handle), name, desc, {}, Timestamp(datetime(2025, 1, 1)))
+
+
+class _Result:
+    def __init__(self, rows=()):
+        self._rows = list(rows)
+
+    def all(self):
+        return self._rows
+
+    def scalar_one_or_none(self):
+        return self._rows[0][0] if self._rows else None
+
+
+class _Session:
+    """Records statements; answers every query with no rows (an account with no look-alikes)."""
+
+    def __init__(self):
+        self.tables = []
+
+    async def execute(self, stmt, params=None):
+        table = getattr(stmt, "table", None)
+        if table is not None:
+            self.tables.append(table.name)
+        return _Result()
+
+
+def test_lone_account_gets_no_cluster_row():
+    session = _Session()
+    cid = asyncio.run(cluster_index.index_account(session, 42, _md("bakery", "Fresh bread", "Daily loaves")))
+    assert cid is None
+    assert "account_clusters" not in session.tables
+
+
+def test_assignment_merges_into_smallest_id_and_writes_only_changes():
+    target, merged, rows = cluster_index.assignment(9, [5, 7], {7: 3, 5: 5})
+    assert target == 3
+    assert merged == [5]
+    assert rows == [{"account_id": 5, "cluster_id": 3}, {"account_id": 9, "cluster_id": 3}]
+
+
+def test_assignment_for_new_pair_covers_both_members():
+    target, merged, rows = cluster_index.assignment(8, [4], {})
+    assert (target, merged) == (4, [])
+    assert sorted(r["account_id"] for r in rows) == [4, 8]
+
+
+def test_near_duplicates_estimate_above_threshold():
+    a = similarity.minhash(similarity.shingles(_md("cpselq1", "CP links vendo", "dm for megas, best prices")))
+    b = similarity.minhash(similarity.shingles(_md("cpselq2", "CP links vendo", "dm for megas, best prices!")))
+    c = similarity.minhash(similarity.shingles(_md("bakery", "Fresh bread", "Daily loaves and cakes")))
+    assert similarity.estimated_jaccard(a, b) >= cluster_index.CLUSTER_THRESHOLD
+    assert similarity.estimated_jaccard(a, c) < cluster_index.CLUSTER_THRESHOLD
+
+
+def test_prune_singletons_is_a_committed_one_off():
+    class _Pruned:
+        rowcount = 3
+
+    class _PruneSession:
+        def __init__(self):
+            self.sql, self.committed = [], False
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def execute(self, stmt, params=None):
+            self.sql.append(str(stmt))
+            return _Pruned()
+
+        async def commit(self):
+            self.committed = True
+
+    session = _PruneSession()
+    assert asyncio.run(cluster_index.prune_singletons(lambda: session)) == 3
+    assert session.committed and "HAVING count(*) = 1" in session.sql[0]
+
@@ -0,0 +1,36 @@
+import json
+
+from app.domain.value_objects import Handle
+from app.infra import export_adapter
+from app.infra.export_index import ExportIndex
+
+
+def test_find_returns_newest_first_and_honours_since(tmp_path):
+    index = ExportIndex(str(tmp_path / "index.sqlite"))
+    index.add("a", "2025-01-01T00:00:00Z", "1.enc")
+    index.add("a", "2025-03-01T00:00:00Z", "3.enc")
+    index.add("b", "2025-02-01T00:00:00Z", "2.enc")
+    index.add("a", "2025-03-01T00:00:00Z", "3.enc")  # same file again is ignored
+    assert index.find("a") == [("2025-03-01T00:00:00Z", "3.enc"), ("2025-01-01T00:00:00Z", "1.enc")]
+    assert index.find("a", since="2025-02-01") == [("2025-03-01T00:00:00Z", "3.enc")]
+    assert index.find("missing") == []
+
+
+def test_rebuild_from_log_skips_malformed_and_indexed_records(tmp_path):
+    log = tmp_path / "index.audit.log"
+    records = [{"time": f"2025-01-0{i}T00:00:00Z", "file": f"{i}.enc", "handle_hmac": "a"} for i in range(1, 4)]
+    log.write_text("\n".join([json.dumps(records[0]), "not json", json.dumps({"file": "x"})]
+                             + [json.dumps(r) for r in records[1:]]) + "\n")
+    index = ExportIndex(str(tmp_path / "index.sqlite"))
+    index.add("a", records[0]["time"], records[0]["file"])
+    assert index.rebuild_from_log(str(log), batch_size=1) == 2
+    assert [f for _, f in index.find("a")] == ["3.enc", "2.enc", "1.enc"]
+    assert index.rebuild_from_log(str(tmp_path / "absent.log")) == 0
+
+
+def test_exports_are_found_by_normalized_handle(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_adapter, "_index", ExportIndex(str(tmp_path / "index.sqlite")))
+    monkeypatch.setattr(export_adapter, "_ensure_export_dir", lambda: str(tmp_path))
+    export_adapter._append_index_record(str(tmp_path / "x.json.enc"), "vendo_cp")
+    assert [r["file"] for r in export_adapter.find_exports(Handle("@Vendo_CP").normalized())] == ["x.json.enc"]
+    assert export_adapter.find_exports("vendo_cp_2") == []
@@ -0,0 +1,131 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from app.infra import fetch_engine
+from app.infra.fetch_engine import FetchEngine
+from app.infra.stub_server import StubServer, synthetic_pages
+from app.infra.web_adapter import WebPageAdapter, parse_page
+
+
+@pytest.fixture
+def no_jitter(monkeypatch):
+    # backoff becomes 0.25s, 0.5s, ... instead of a random multiple
+    monkeypatch.setattr(fetch_engine.random, "random", lambda: 0.0)
+
+
+def _run(engine, make):
+    """Run `make()` in a fresh event loop, closing the engine's client inside it."""
+    async def scenario():
+        try:
+            return await make()
+        finally:
+            await engine.close()
+    return asyncio.run(scenario())
+
+
+def _engine(**kwargs):
+    return FetchEngine(**{"per_host_rate": 1000.0, "retries": 2, **kwargs})
+
+
+def test_per_host_concurrency_limit():
+    pages = {f"/p/{i}": "ok" for i in range(8)}
+    with StubServer(pages, latency=0.05) as stub:
+        engine = _engine(per_host_concurrency=2)
+        results = _run(engine, lambda: asyncio.gather(*(engine.get(f"{stub.url}/p/{i}") for i in range(8))))
+    assert all(r.ok for r in results)
+    assert stub.max_active == 2
+
+
+def test_concurrent_requests_for_one_url_share_a_fetch():
+    with StubServer({"/a": "shared"}, latency=0.05) as stub:
+        engine = _engine()
+        results = _run(engine, lambda: asyncio.gather(*(engine.get(f"{stub.url}/a") for _ in range(5))))
+    assert [r.text() for r in results] == ["shared"] * 5
+    assert stub.hits["/a"] == 1
+
+
+def test_fresh_hits_come_from_cache_and_stale_ones_are_revalidated():
+    with StubServer({"/a": "body"}) as stub:
+        engine = _engine(cache_ttl=60)
+
+        async def twice():
+            return await engine.get(f"{stub.url}/a"), await engine.get(f"{stub.url}/a")
+
+        first, second = _run(engine, twice)
+        assert (first.from_cache, second.from_cache, stub.hits["/a"]) == (False, True, 1)
+
+        engine = _engine(cache_ttl=0)
+        first, second = _run(engine, twice)
+    # the second request sent If-None-Match and got a 304 with no body
+    assert stub.hits["/a"] == 3
+    assert second.from_cache and second.status == 200 and second.text() == "body"
+
+
+def test_5xx_is_retried_with_backoff(no_jitter):
+    with StubServer({"/a": "recovered"}, fail_first=2) as stub:
+        engine = _engine()
+        started = time.monotonic()
+        result = _run(engine, lambda: engine.get(f"{stub.url}/a"))
+        elapsed = time.monotonic() - started
+    assert result.status == 200 and result.text() == "recovered"
+    assert stub.hits["/a"] == 3
+    assert elapsed >= 0.25 + 0.5
+
+
+def test_retry_after_is_honoured_and_retries_are_bounded(no_jitter):
+    with StubServer({"/a": "late"}, fail_first=1, retry_after=1) as stub:
+        engine = _engine()
+        started = time.monotonic()
+        assert _run(engine, lambda: engine.get(f"{stub.url}/a")).ok
+        assert time.monotonic() - started >= 1.0
+    with StubServer({"/a": "never"}, fail_first=10) as stub:
+        engine = _engine(retries=1)
+        result = _run(engine, lambda: engine.get(f"{stub.url}/a"))
+    assert result.status == 503 and stub.hits["/a"] == 2
+
+
+def test_parse_page_reads_title_and_description_from_the_head():
+    html = ('<html><head><title> CP  group </title><meta property="og:description" content="og text">'
+            '<meta name="description" content="vendo links"></head>'
+            '<body><meta name="description" content="ignored"></body></html>')
+    assert parse_page(html) == {"title": "CP group", "description": "vendo links"}
+    assert parse_page('<meta property="og:title" content="Fallback">') == {"title": "Fallback", "description": None}
+    assert parse_page("") == {"title": None, "description": None}
+
+
+def test_web_adapter_against_the_stub():
+    pages = {**synthetic_pages(2), "/gone": (410, {}, "gone"), "/broken": (400, {}, "bad")}
+    with StubServer(pages) as stub:
+        engine = _engine()
+        adapter = WebPageAdapter(engine=engine, scheme="http")
+
+        async def scenario():
+            return (await adapter.fetch(f"http://{stub.netloc}/p/0/"), await adapter.fetch(f"{stub.netloc}/p/1"),
+                    await adapter.fetch(f"{stub.netloc}/missing"), await adapter.fetch(f"{stub.netloc}/gone"))
+
+        seller, bakery, missing, gone = _run(engine, scenario)
+        assert seller["username"] == f"{stub.netloc}/p/0".lower()
+        assert (seller["title"], seller["description"]) == ("CP group 0 🔥", "vendo links, dm for megas")
+        assert bakery["title"] == "Bakery 1"
+        assert missing is None and gone is None
+
+        engine = _engine()
+        adapter = WebPageAdapter(engine=engine, scheme="http")
+        with pytest.raises(RuntimeError, match="HTTP 400"):
+            _run(engine, lambda: adapter.fetch(f"{stub.netloc}/broken"))
+
+
+@pytest.mark.parametrize("raw, handle", [
+    ("https://Example.com/Shop/Item?ID=AbC", "example.com/Shop/Item?ID=AbC"),
+    ("HTTP://EXAMPLE.com/", "example.com"),
+    ("Example.COM/Path/#Frag", "example.com/Path"),
+    ("example.com?Q=1", "example.com?Q=1"),
+])
+def test_web_handles_lowercase_only_the_host(raw, handle):
+    adapter = WebPageAdapter()
+    assert adapter.normalize(raw) == handle and adapter.is_valid(handle)
+    assert not adapter.is_valid(adapter.normalize("https://"))
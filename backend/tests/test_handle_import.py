@@ -0,0 +1,117 @@
+import asyncio
+import gzip
+
+import pytest
+
+from app.infra import handle_import
+from app.infra.telegram_client import TelegramAdapter
+from app.infra.web_adapter import WebPageAdapter
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class _Session:
+    """Treats every handle as new and records what gets queued."""
+
+    def __init__(self, queued):
+        self.queued = queued
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt, params=None):
+        if isinstance(params, dict) and "handles" in params:
+            return _Result([(h,) for h in params["handles"]])
+        self.queued.extend((p["platform"], p["handle"]) for p in params)
+
+    async def commit(self):
+        pass
+
+
+def test_normalize_uses_the_platform_adapter():
+    telegram, web = TelegramAdapter(), WebPageAdapter()
+    assert handle_import.normalize(' "https://telegram.me/Some_Chan?start=1" ', telegram) == "some_chan"
+    assert handle_import.normalize("@ab", telegram) is None
+    assert handle_import.normalize("example.com/shop", telegram) is None
+    assert handle_import.normalize("https://Example.com/Shop", web) == "example.com/Shop"
+    assert handle_import.normalize("# comment", web) is None
+
+
+def test_web_imports_are_not_counted_invalid():
+    queued = []
+    stats = asyncio.run(handle_import.import_handles(
+        ["https://Example.com/Shop", "example.com/Shop/", "http://other.org", ""], source="test", platform="web",
+        session_factory=lambda: _Session(queued)))
+    assert (stats["enqueued"], stats["duplicates"], stats["invalid"]) == (2, 1, 1)
+    assert queued == [("web", "example.com/Shop"), ("web", "other.org")]
+
+
+def _body(chunks, **kwargs):
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect():
+        return [v async for v in handle_import.iter_body(stream(), **kwargs)]
+
+    return asyncio.run(collect())
+
+
+def _split(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("raw", ["@Ab_cd", "http://telegram.me/ab_cd", "https://t.me/Ab_Cd/12", "  AB_CD  "])
+def test_normalize_telegram_forms(raw):
+    assert handle_import.normalize(raw) == "ab_cd"
+
+
+@pytest.mark.parametrize("column, rows, expected", [
+    (None, [["id", "Handle"], ["1", "a"], ["2", "b"]], ["a", "b"]),
+    (None, [["a", "x"], ["b", "y"]], ["a", "b"]),  # no header: first column, first row is data
+    ("user", [["id", "user"], ["1", "c"], ["2"]], ["c"]),  # short rows are skipped
+    ("1", [["a", "x"], ["b", "y"]], ["x", "y"]),
+])
+def test_csv_column_header_detection(column, rows, expected):
+    lines = [",".join(r) for r in rows]
+    assert list(handle_import._CsvColumn(column).values(lines)) == expected
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 1000])
+def test_iter_body_splits_lines_across_chunks(size):
+    data = "ça_va\nbeta\r\n\ngamma".encode()
+    assert _body(_split(data, size)) == ["ça_va", "beta\r", "", "gamma"]
+    packed = gzip.compress(data + b"\n")
+    assert _body(_split(packed, size)) == ["ça_va", "beta\r", "", "gamma"]
+    assert _body([b"x"]) == ["x"]
+
+
+def test_iter_body_csv_keeps_header_state_across_chunks():
+    data = b"id,handle\n1,alpha\n2,beta\n"
+    assert _body(_split(data, 4), fmt="csv") == ["alpha", "beta"]
+
+
+def test_iter_body_bounds_inflated_output_and_line_length(monkeypatch):
+    pieces = []
+    real = handle_import._inflated
+
+    def recording(inflate, chunk):
+        for piece in real(inflate, chunk):
+            pieces.append(len(piece))
+            yield piece
+
+    monkeypatch.setattr(handle_import, "_inflated", recording)
+    bomb = b"a" * (handle_import.MAX_LINE_CHARS * 50) + b"\nok_handle\n" + b"b" * (handle_import.MAX_LINE_CHARS + 1)
+    values = _body([gzip.compress(bomb)])
+    # one compressed chunk, inflated in bounded pieces; both overlong lines come back empty
+    assert max(pieces) <= handle_import._INFLATE_CHUNK and len(pieces) > 1
+    assert values == ["", "ok_handle", ""]
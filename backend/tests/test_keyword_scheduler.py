@@ -0,0 +1,73 @@
+import asyncio
+import random
+
+from app.workers.keyword_scheduler import KeywordArm, KeywordScheduler, search_reward
+
+
+class _Result:
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+
+class _Session:
+    """Stands in for keyword_stats: no stored stats, records every upsert."""
+
+    def __init__(self, log):
+        self.log = log
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt, params=None):
+        self.log.append(stmt)
+        return _Result()
+
+    async def commit(self):
+        pass
+
+
+def _scheduler(keywords, exploration=0.5):
+    log = []
+    sched = KeywordScheduler(keywords, session_factory=lambda: _Session(log), exploration=exploration)
+    return asyncio.run(sched.load()), log
+
+
+def test_search_reward_is_clamped_risk_per_slot():
+    assert search_reward([], 20) == 0.0
+    assert search_reward([0.5, 0.5], 4) == 0.25
+    assert search_reward([1.0] * 30, 20) == 1.0
+
+
+def test_unexplored_keywords_are_tried_first():
+    random.seed(0)
+    sched, _ = _scheduler(["cp", "vendo", "cp", " "])
+    assert sched.keywords == ["cp", "vendo"]
+    first = sched.next_keyword()
+    asyncio.run(sched.record(first, 10, 10, [], 20))
+    assert sched.next_keyword() != first
+    assert sched.next_keyword(exclude=["cp", "vendo"]) is None
+
+
+def test_exploits_the_keyword_with_the_best_reward():
+    sched, log = _scheduler(["good", "bad"], exploration=0.1)
+    for _ in range(5):
+        asyncio.run(sched.record("good", 20, 10, [0.9] * 10, 20))
+        asyncio.run(sched.record("bad", 20, 10, [], 20))
+    assert sched.next_keyword() == "good"
+    assert sched.next_keyword(exclude=["good"]) == "bad"
+    assert len(log) == 1 + 10  # one load, one upsert per search
+    arm = sched.arms["good"]
+    assert (arm.pulls, arm.flagged, round(arm.avg_risk, 2)) == (5, 50, 0.9)
+
+
+def test_exploration_bonus_revisits_rarely_searched_keywords():
+    sched, _ = _scheduler(["often", "rare"], exploration=2.0)
+    sched.arms["often"] = KeywordArm("often", pulls=200, reward_sum=200 * 0.3)
+    sched.arms["rare"] = KeywordArm("rare", pulls=1, reward_sum=0.1)
+    assert sched.next_keyword() == "rare"
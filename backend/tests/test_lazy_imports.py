@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _loaded_after(module: str, heavy: str) -> bool:
+    code = f"import sys, {module}; print({heavy!r} in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=BACKEND, env=dict(os.environ),
+                         capture_output=True, text=True, check=True)
+    return out.stdout.strip() == "True"
+
+
+def test_api_startup_does_not_import_pyarrow():
+    assert not _loaded_after("app.main", "pyarrow")
+
+
+def test_parquet_export_loads_pyarrow_on_first_export():
+    pytest.importorskip("pyarrow")
+    from app.infra import parquet_export
+    parquet_export._load_pyarrow()
+    assert parquet_export.pq is not None
+
+
+def test_api_startup_does_not_import_numpy():
+    assert not _loaded_after("app.main", "numpy")
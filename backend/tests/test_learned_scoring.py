@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.domain.entities import AccountMetadata
+from app.domain.learned_scoring import HashedNgramModel, features
+from app.domain.value_objects import Handle, Timestamp
+from app.infra import model_store
+
+ABUSIVE = [("cp_vendo", "Vendo packs", "links de cp, chama no pv"), ("megas_cp", "CP megas", "vendo cp")]
+BENIGN = [("padaria_sol", "Padaria Sol", "pão fresco todo dia"), ("clube_xadrez", "Clube de xadrez", "partidas às sextas")]
+
+
+def _md(handle, name, desc):
+    return AccountMetadata("telegram", Handle(handle), name, desc, {}, Timestamp(datetime(2025, 1, 1)))
+
+
+def _trained():
+    rows = ABUSIVE + BENIGN
+    return HashedNgramModel.train([_md(*r) for r in rows], [1] * len(ABUSIVE) + [0] * len(BENIGN),
+                                  epochs=50, dim=1 << 12)
+
+
+def test_features_are_field_tagged_ngrams():
+    grams = features(_md("cp", None, "cp"))
+    assert "h: c" in grams and "d: c" in grams
+    assert not any(g.startswith("n:") for g in grams)
+
+
+def test_trained_model_separates_labels_and_explains_scores():
+    model = _trained()
+    (pos, top), (neg, _) = model.score_batch([_md("vendo_cp", "CP", "vendo"), _md("padaria", "Padaria", "pão")])
+    assert pos > 0.5 > neg
+    assert top and all(f["weight"] > 0 for f in top)
+
+
+def test_model_store_round_trip(tmp_path):
+    model = _trained()
+    path = str(tmp_path / "models" / "risk.npz")
+    model_store.save(model, path)
+    loaded = model_store.load(path)
+    assert (loaded.dim, loaded.ngram_range) == (model.dim, model.ngram_range)
+    md = _md("cp_links", "CP", "vendo")
+    assert loaded.score_one(md) == model.score_one(md)
+
+
+def test_default_model_is_none_until_trained(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_store, "MODEL_PATH", str(tmp_path / "missing.npz"))
+    monkeypatch.setattr(model_store, "_default_loaded", False)
+    monkeypatch.setattr(model_store, "_default_model", None)
+    assert model_store.get_default_model() is None
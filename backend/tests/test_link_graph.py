@@ -0,0 +1,107 @@
+import asyncio
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from app.domain.links import extract_references
+from app.infra import link_graph
+from app.workers import crawler
+
+
+class _Result:
+    def all(self):
+        return [("low", 2, 0.1), ("high", 1, 0.9)]
+
+
+class _Session:
+    def __init__(self):
+        self.statements = []
+        self.committed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+        return _Result()
+
+    async def commit(self):
+        self.committed = True
+
+
+def _compiled(stmt):
+    return stmt.compile(dialect=postgresql.dialect())
+
+
+def test_claim_returns_handles_by_priority_and_commits():
+    session = _Session()
+    assert asyncio.run(link_graph.claim(10, "web", session_factory=lambda: session)) == [("high", 1), ("low", 2)]
+    assert session.committed
+
+
+def test_claim_stamps_a_lease_and_reclaims_expired_ones():
+    session = _Session()
+    before = datetime.now(timezone.utc)
+    asyncio.run(link_graph.claim(10, "telegram", session_factory=lambda: session))
+    compiled = _compiled(session.statements[0])
+    sql = str(compiled)
+    assert "crawl_frontier.claimed_at IS NULL OR crawl_frontier.claimed_at <" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    params = compiled.params
+    claimed_at = params["claimed_at"]
+    assert claimed_at >= before
+    cutoffs = [v for v in params.values() if isinstance(v, datetime) and v != claimed_at]
+    assert cutoffs == [claimed_at - link_graph.CLAIM_LEASE]
+    assert {"pending", "claimed"} <= set(params.values())
+
+
+def test_extract_references_finds_links_and_mentions():
+    texts = [
+        "join https://t.me/CP_Vendas_01 or t.me/s/preview_chan, backup @Backup_Group",
+        "telegram.me/another_one and www.t.me/joinchat/abcdef",
+        "mail me at someone@example.com, @abc is too short",
+        None,
+    ]
+    assert extract_references(texts) == {"cp_vendas_01", "preview_chan", "backup_group", "another_one"}
+
+
+class _Frontier:
+    """In-memory crawl_frontier with claim/mark_done semantics."""
+
+    def __init__(self, handles):
+        self.status = {h: "pending" for h in handles}
+
+    async def claim(self, limit=50, platform="telegram"):
+        picked = [h for h, s in self.status.items() if s == "pending"][:limit]
+        for h in picked:
+            self.status[h] = "claimed"
+        return [(h, 1) for h in picked]
+
+    async def mark_done(self, handles, platform="telegram"):
+        for h in handles:
+            self.status[h] = "done"
+
+
+class _Adapter:
+    platform = "telegram"
+    max_concurrency = 2
+    delay = 0.0
+
+
+def test_frontier_marks_done_only_handles_that_were_ingested(monkeypatch):
+    frontier = _Frontier(["found", "missing", "flaky"])
+    monkeypatch.setattr(crawler.link_graph, "claim", frontier.claim)
+    monkeypatch.setattr(crawler.link_graph, "mark_done", frontier.mark_done)
+    monkeypatch.setattr(crawler.platforms, "get_adapter", lambda platform: _Adapter())
+
+    async def run_crawl(handles, **kwargs):
+        # "flaky" raised inside the worker, which logs it and leaves it out of the results
+        return {"found": object(), "missing": None}
+
+    monkeypatch.setattr(crawler, "run_crawl", run_crawl)
+    processed = asyncio.run(crawler.run_frontier(max_items=10, batch_size=10, discovery=object()))
+    assert processed == 3
+    assert frontier.status == {"found": "done", "missing": "done", "flaky": "claimed"}
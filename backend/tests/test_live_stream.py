@@ -0,0 +1,97 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from app.infra import flag_notifications
+from app.infra.event_bus import SimpleEventBus
+from app.infra.live_stream import FlagBroadcaster
+
+COLUMNS = ("id", "platform", "handle", "display_name", "description",
+           "risk_score", "model_score", "reasons", "created_at", "last_seen")
+SEEN = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+
+def _row(i, score=0.9):
+    return (i, "telegram", f"h{i}", "CP group", "vendo", score, None,
+            [{"rule": "seller", "field": "handle"}], SEEN, SEEN)
+
+
+def test_payload_from_row_matches_account_flagged_shape():
+    payload = flag_notifications.payload_from_row(COLUMNS, _row(7))
+    assert payload["id"] == 7
+    assert payload["handle"] == "h7"
+    assert payload["reason_codes"] == [{"rule": "seller", "field": "handle"}]
+    assert payload["reasons"] and isinstance(payload["reasons"][0], str)
+    assert payload["first_seen"] == SEEN.isoformat()
+
+
+def test_committed_flags_from_another_process_reach_stream_clients(monkeypatch):
+    bus = SimpleEventBus()
+    monkeypatch.setattr(flag_notifications, "event_bus", bus)
+    requested = []
+
+    async def fetch_rows(ids):
+        requested.append(ids)
+        return [_row(i) for i in ids]
+
+    async def scenario():
+        broadcaster = FlagBroadcaster()
+        bus.subscribe(flag_notifications.EVENT, broadcaster.publish)
+        client = broadcaster.connect()
+        listener = flag_notifications.FlagListener("postgresql://unused", COLUMNS, fetch_rows)
+        # what asyncpg calls when the crawler's transaction commits
+        for payload in ("3", "1", "3"):
+            listener._on_notify(None, 1234, flag_notifications.CHANNEL, payload)
+        await listener.drain_once()
+        return [client.queue.get_nowait() for _ in range(client.queue.qsize())]
+
+    frames = asyncio.run(scenario())
+    assert requested == [[1, 3]]  # one lookup for the burst, duplicates coalesced
+    handles = [json.loads(f.decode().split("data: ", 1)[1])["handle"] for f in frames]
+    assert handles == ["h1", "h3"]
+
+
+def test_bad_notification_payload_is_ignored():
+    listener = flag_notifications.FlagListener("postgresql://unused", COLUMNS, None)
+    listener._on_notify(None, 1, flag_notifications.CHANNEL, "not-an-id")
+    assert listener._queue.empty()
+
+
+def test_asyncpg_dsn_drops_driver_suffix():
+    from sqlalchemy.engine import make_url
+    dsn = flag_notifications.asyncpg_dsn(make_url("postgresql+asyncpg://u:p@db:5432/x"))
+    assert dsn == "postgresql://u:p@db:5432/x"
+
+
+def _frames(client):
+    return [client.queue.get_nowait() for _ in range(client.queue.qsize())]
+
+
+def test_resume_id_from_before_a_restart_gets_a_reset():
+    async def scenario():
+        broadcaster = FlagBroadcaster()
+        broadcaster.publish({"handle": "h1"})
+        # ids restart at 1 in a new process; a client that saw id 40 must not wait for id 41
+        stale = _frames(broadcaster.connect(last_event_id=40))
+        current = _frames(broadcaster.connect(last_event_id=0))
+        return stale, current
+
+    stale, current = asyncio.run(scenario())
+    assert stale == [b"event: reset\ndata: {}\n\n"]
+    assert len(current) == 1 and b"h1" in current[0]
+
+
+def test_reset_reaches_connected_and_resuming_clients():
+    async def scenario():
+        broadcaster = FlagBroadcaster()
+        broadcaster.publish({"handle": "h1"})
+        connected = broadcaster.connect(last_event_id=1)
+        broadcaster.reset()
+        broadcaster.publish({"handle": "h3"})
+        resumed_before = _frames(broadcaster.connect(last_event_id=1))
+        resumed_after = _frames(broadcaster.connect(last_event_id=2))
+        return _frames(connected), resumed_before, resumed_after
+
+    connected, before, after = asyncio.run(scenario())
+    assert connected[0] == b"id: 2\nevent: reset\ndata: {}\n\n" and b"h3" in connected[1]
+    assert before == connected
+    assert len(after) == 1 and b"h3" in after[0]
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import pytest
+
+from app.domain.entities import AccountMetadata
+from app.domain.normalization import fold, skeleton
+from app.domain.services import compute_risk_and_reasons
+from app.domain.value_objects import Handle, Timestamp
+
+
+def _score(display_name, description=None, handle="someuser"):
+    md = AccountMetadata("telegram", Handle(handle), display_name, description, {}, Timestamp(datetime(2025, 1, 1)))
+    score, reasons, _ = compute_risk_and_reasons(md)
+    return score.value, {r.term for r in reasons if r.term}
+
+
+BASELINE, _ = _score("Padaria Sol", "pão fresco todo dia")
+
+
+@pytest.mark.parametrize("text", ["средство для дома", "Ноты для фортепиано", "Срочно продаю"])
+def test_single_script_cyrillic_does_not_read_as_latin_keywords(text):
+    assert skeleton(text) == text.lower()
+    assert _score(text, text) == (BASELINE, set())
+
+
+@pytest.mark.parametrize("text, folded", [
+    ("vеndо", "vendo"),  # Cyrillic е and о inside a Latin word
+    ("сp group", "cp group"),  # Cyrillic с next to Latin p
+    ("Ηοt", "hot"),  # Greek Η and ο with Latin t
+    ("ＶＥＮＤＯ", "vendo"),  # fullwidth
+    ("v3nd0", "vendo"),
+    ("c​p", "cp"),  # zero-width space
+    ("ᴄᴘ links", "cp links"),  # small capitals are Latin script
+    ("café", "cafe"),
+])
+def test_obfuscated_latin_is_folded(text, folded):
+    assert skeleton(text) == folded
+
+
+def test_mixed_script_evasions_still_score():
+    score, terms = _score("vеndо сp", "ᴄᴘ l1nks")
+    assert {"vendo", "cp", "links"} <= terms
+    assert score > BASELINE
+
+
+def test_folding_is_per_token():
+    assert skeleton("Срочно vеndо") == "срочно vendo"
+    assert skeleton("Срочно2") == "cpoчho2"  # a digit makes the token mixed-script
+    assert skeleton("!!! 18+") == "!!! ib+"
+
+
+def test_raw_match_is_kept_alongside_the_skeleton():
+    text = fold("Links 4 U")
+    assert text.contains("links 4") and text.contains("links a")
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from app.infra import parquet_export, snapshots
+from app.infra.sql_repository import FLAG_LIST_COLUMNS
+
+SEEN = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def pyarrow_loaded():
+    parquet_export._load_pyarrow()
+
+
+def _flag_row(i):
+    meta = {"fetched_at": "2025-01-02T03:04:05", "extra": {"participants": 120 + i, "is_bot": False, "lang": "pt"}}
+    return (i, "telegram", f"h{i}", "CP group", None, 0.9, None,
+            [{"rule": "keyword", "field": "handle", "term": "cp"}, "multiple suspicious emojis detected"],
+            SEEN, SEEN.replace(tzinfo=None), meta)
+
+
+async def _batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+def test_flagged_rows_round_trip(tmp_path):
+    path = str(tmp_path / "flags.parquet")
+    threads = []
+    to_batch = parquet_export._flagged_batch
+
+    def recording(schema, rows):
+        threads.append(threading.current_thread())
+        return to_batch(schema, rows)
+
+    total = asyncio.run(parquet_export._write(path, parquet_export._flagged_schema(),
+                                              _batches([_flag_row(1), _flag_row(2)], [], [_flag_row(3)]), recording))
+    assert total == 3
+    assert threading.main_thread() not in threads  # encoding stays off the event loop
+    table = pq.read_table(path)
+    assert table.num_rows == 3 and pq.ParquetFile(path).num_row_groups == 2
+    assert table.schema.names[:len(FLAG_LIST_COLUMNS)] == list(FLAG_LIST_COLUMNS)
+    first = table.to_pylist()[0]
+    assert first["reasons"] == [{"rule": "keyword", "field": "handle", "term": "cp"},
+                                {"rule": "multiple_emoji", "field": None, "term": None}]
+    assert first["last_seen"] == SEEN and first["fetched_at"] == SEEN
+    assert (first["participants"], first["is_bot"], first["extra_json"]) == (121, False, '{"lang": "pt"}')
+
+
+def test_snapshot_schema_matches_snapshot_columns(tmp_path):
+    schema = parquet_export._snapshot_schema()
+    assert tuple(schema.names) == snapshots.SNAPSHOT_COLUMNS
+    path = str(tmp_path / "snapshots.parquet")
+    row = (1, SEEN, "telegram", "h1", "n", "d", 0.5, [{"rule": "seller", "field": "handle"}])
+    asyncio.run(parquet_export._write(path, schema, _batches([row]), parquet_export._snapshot_batch))
+    assert pq.read_table(path).to_pylist()[0]["reasons"] == [{"rule": "seller", "field": "handle", "term": None}]
+
+
+def test_empty_export_still_writes_a_readable_file(tmp_path):
+    path = str(tmp_path / "empty.parquet")
+    assert asyncio.run(parquet_export._write(path, parquet_export._flagged_schema(), _batches(),
+                                             parquet_export._flagged_batch)) == 0
+    assert pq.read_table(path).num_rows == 0
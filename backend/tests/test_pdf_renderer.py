@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+
+pytest.importorskip("fpdf")
+pypdf = pytest.importorskip("pypdf")
+
+from app.infra import pdf_renderer  # noqa: E402
+
+LAYOUT = pdf_renderer.ReportLayout(
+    title="Report", subtitle="Test",
+    fields=[("description", "Description"), ("reasons", "Reasons"),
+            ("participants", "Participants"), ("first_seen", "First Seen")],
+    heading_field=("handle", "Handle"),
+)
+ROW = {"handle": "h1", "description": "desc " * 60, "reasons": "seller; keyword " * 10,
+       "participants": 42, "first_seen": "2025-01-01"}
+
+
+def _line_starts(path):
+    starts = []
+
+    def visitor(text, cm, tm, font, size):
+        if text.strip():
+            starts.append((text.strip(), tm[4]))
+
+    for page in pypdf.PdfReader(path).pages:
+        page.extract_text(visitor_text=visitor)
+    return starts
+
+
+def test_fields_after_multiline_fields_start_at_left_margin(tmp_path):
+    out = str(tmp_path / "chunk.pdf")
+    # description and reasons are adjacent multiline fields
+    pages, _ = pdf_renderer._render_chunk(LAYOUT, [ROW, ROW], out, pdf_renderer.find_unicode_font())
+    assert pages >= 1
+    starts = _line_starts(out)
+    for label in ("Participants: 42", "First Seen: 2025-01-01"):
+        xs = [x for text, x in starts if text.startswith(label)]
+        assert len(xs) == 2 and all(x < 50 for x in xs), (label, xs)
+
+
+def test_characters_without_glyph_are_reported(tmp_path, monkeypatch):
+    font = pdf_renderer.find_unicode_font()
+    if font is None:
+        pytest.skip("no Unicode font installed")
+    monkeypatch.setattr(pdf_renderer, "FALLBACK_FONTS", [])
+    row = dict(ROW, description="CP links 🔥 ação")
+    _, missing = pdf_renderer._render_chunk(LAYOUT, [row], str(tmp_path / "c.pdf"), font)
+    assert missing == {"🔥"}
+
+
+def test_render_report_merges_chunks_behind_toc(tmp_path):
+    async def batches():
+        for b in range(3):
+            yield [dict(ROW, handle=f"h{b}_{i}") for i in range(4)]
+
+    out = str(tmp_path / "report.pdf")
+    total = asyncio.run(pdf_renderer.render_report(LAYOUT, batches(), out, chunk_size=5, max_workers=2))
+    assert total == 12
+    reader = pypdf.PdfReader(out)
+    assert [o.title for o in reader.outline] == ["Accounts h0_0-h1_0", "Accounts h1_1-h2_1", "Accounts h2_2-h2_3"]
+
+
+def test_render_report_refuses_reports_too_long_to_merge(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_renderer, "MAX_MERGE_PAGES", 2)
+
+    async def batches():
+        yield [dict(ROW, handle=f"h{i}") for i in range(40)]
+
+    out = tmp_path / "report.pdf"
+    with pytest.raises(RuntimeError, match="exceed 2 pages"):
+        asyncio.run(pdf_renderer.render_report(LAYOUT, batches(), str(out), chunk_size=5, max_workers=1))
+    assert not out.exists()
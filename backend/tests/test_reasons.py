@@ -0,0 +1,33 @@
+import pytest
+
+from app.domain.reasons import Reason, parse_legacy, render
+
+
+@pytest.mark.parametrize("reason", [
+    Reason("keyword", "description", "cp"),
+    Reason("emoji", "display_name", "🍕"),
+    Reason("seller", "handle"),
+    Reason("illicit", "description"),
+    Reason("high_risk_phrase", term="vendo cp"),
+    Reason("repeated_pattern", term="cp"),
+    Reason("multiple_emoji"),
+])
+def test_parse_legacy_inverts_the_english_sentence(reason):
+    assert parse_legacy(render(reason)) == reason
+
+
+def test_parse_legacy_restores_fields_implied_by_the_wording():
+    assert parse_legacy("suspicious phrase in display name: 'só hoje'") == Reason("name_phrase", "display_name", "só hoje")
+    assert parse_legacy(render(Reason("handle_pattern"))) == Reason("handle_pattern", "handle")
+    assert parse_legacy("account name suggests seller activity (e.g. selling illegal content)") == Reason("seller", "handle")
+
+
+def test_unknown_sentences_are_kept_verbatim():
+    reason = parse_legacy("flagged manually by analyst")
+    assert reason == Reason("legacy", term="flagged manually by analyst")
+    assert render(reason, lang="pt") == "flagged manually by analyst"
+
+
+def test_from_code_accepts_codes_and_sentences():
+    assert Reason.from_code({"rule": "keyword", "field": "handle", "term": "cp"}).to_code() == {"rule": "keyword", "field": "handle", "term": "cp"}
+    assert Reason.from_code("suspicious keyword in handle: 'cp'") == Reason("keyword", "handle", "cp")
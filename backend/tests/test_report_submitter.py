@@ -0,0 +1,232 @@
+import asyncio
+import json
+import types
+from datetime import timedelta
+
+import httpx
+import pytest
+
+from app.infra import rate_limit, report_queue
+from app.infra.report_sinks import HttpReportSink, LocalFileSink, ReportSink, SubmissionResult
+from app.workers import report_submitter
+
+
+class _Clock:
+    """Fake monotonic time for TokenBucket; sleeping advances it instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += seconds
+
+
+class _Queue:
+    """In-memory report_queue: claim/record_results/release with the real signatures."""
+
+    def __init__(self, clock, n):
+        self.clock = clock
+        self.pending = [{"handle": f"h{i}", "idempotency_key": f"k{i}", "attempt": 1} for i in range(n)]
+        self.claims = []
+        self.results = []
+        self.released = []
+
+    async def claim(self, limit=50, session_factory=None):
+        batch, self.pending = self.pending[:limit], self.pending[limit:]
+        self.claims.append((self.clock.now, limit, len(batch)))
+        return batch
+
+    async def record_results(self, claimed, results, session_factory=None):
+        results = list(results)
+        self.results.append((self.clock.now, results))
+        ok = sum(r.ok for r in results)
+        return ok, len(results) - ok, 0
+
+    async def release(self, claimed, error, session_factory=None):
+        self.released.append((claimed, error))
+
+
+def _patch(monkeypatch, n):
+    clock = _Clock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    monkeypatch.setattr(rate_limit, "asyncio", types.SimpleNamespace(sleep=clock.sleep))
+    queue = _Queue(clock, n)
+    for name in ("claim", "record_results", "release"):
+        monkeypatch.setattr(report_queue, name, getattr(queue, name))
+    return clock, queue
+
+
+class _OkSink(ReportSink):
+    name = "ok"
+
+    async def submit_batch(self, reports):
+        return [SubmissionResult(r["idempotency_key"], ok=True) for r in reports]
+
+
+class _FailingSink(ReportSink):
+    name = "failing"
+
+    async def submit_batch(self, reports):
+        raise ConnectionError("sink down")
+
+
+def test_submitter_respects_rate_and_never_holds_claims_while_waiting(monkeypatch, tmp_path):
+    clock, queue = _patch(monkeypatch, 25)
+    sink = LocalFileSink(str(tmp_path))
+    total = asyncio.run(report_submitter.run_submitter(sink, rate_per_hour=60, batch_size=10, once=True))
+    assert total == 25
+    # burst of 10, then one report per minute
+    assert queue.results[-1][0] == 15 * 60
+    assert [c[2] for c in queue.claims][:2] == [10, 1]
+    # every batch went to the sink at the instant it was claimed, never after a token wait
+    assert [t for t, _, got in queue.claims if got] == [t for t, _ in queue.results]
+    lines = [json.loads(line) for f in tmp_path.iterdir() for line in f.read_text().splitlines()]
+    assert sorted(r["idempotency_key"] for r in lines) == sorted(f"k{i}" for i in range(25))
+
+
+def test_unused_tokens_are_refunded(monkeypatch):
+    clock, queue = _patch(monkeypatch, 3)
+    asyncio.run(report_submitter.run_submitter(_OkSink(), rate_per_hour=3600, batch_size=10, once=True))
+    # the 7 tokens not used by the first claim are available again without waiting
+    assert clock.now == 0
+    assert [(limit, got) for _, limit, got in queue.claims] == [(10, 3), (7, 0)]
+
+
+def test_sink_errors_release_the_batch(monkeypatch):
+    _, queue = _patch(monkeypatch, 2)
+    assert asyncio.run(report_submitter.run_submitter(_FailingSink(), rate_per_hour=3600, once=True)) == 0
+    assert [len(c) for c, _ in queue.released] == [2]
+    assert queue.released[0][1] == "sink down"
+
+
+def test_local_sink_treats_repeated_keys_as_one_report(tmp_path):
+    sink = LocalFileSink(str(tmp_path))
+    report = {"handle": "h", "idempotency_key": "k1"}
+    asyncio.run(sink.submit_batch([report]))
+    results = asyncio.run(LocalFileSink(str(tmp_path)).submit_batch([report]))
+    assert results[0].ok
+    assert sum(len(f.read_text().splitlines()) for f in tmp_path.iterdir()) == 1
+
+
+class _Session:
+    def __init__(self):
+        self.updates = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt, params=None):
+        status = stmt.compile().params["status"]
+        self.updates.append((status, params))
+
+    async def commit(self):
+        pass
+
+
+def test_record_results_backs_off_exponentially_and_gives_up():
+    claimed = [{"idempotency_key": k, "attempt": a} for k, a in
+               (("ok", 1), ("retry1", 1), ("retry3", 3), ("bad", 1), ("exhausted", report_queue.MAX_ATTEMPTS), ("lost", 2))]
+    results = [
+        SubmissionResult("ok", ok=True, external_id="x1"),
+        SubmissionResult("retry1", ok=False, error="HTTP 503"),
+        SubmissionResult("retry3", ok=False, error="timeout"),
+        SubmissionResult("bad", ok=False, error="HTTP 400", retriable=False),
+        SubmissionResult("exhausted", ok=False, error="HTTP 503"),
+    ]
+    session = _Session()
+    counts = asyncio.run(report_queue.record_results(claimed, results, session_factory=lambda: session))
+    assert counts == (1, 3, 2)
+    updates = dict(session.updates)
+    assert [u["k"] for u in updates["submitted"]] == ["ok"]
+    assert {u["k"]: u["error"] for u in updates["failed"]} == {"bad": "HTTP 400", "exhausted": "HTTP 503"}
+    retries = {u["k"]: u for u in updates["pending"]}
+    assert retries["lost"]["error"] == "no result from sink"
+    assert retries["retry3"]["at"] - retries["retry1"]["at"] == timedelta(seconds=report_queue.BACKOFF_BASE_SECONDS * 3)
+    assert report_queue.backoff(1) == timedelta(seconds=60) and report_queue.backoff(4) == timedelta(seconds=480)
+
+
+def _reporter(monkeypatch, fail_times=0):
+    queued = []
+    calls = {"n": 0}
+
+    async def enqueue(items, requested_by="auto", session_factory=None):
+        calls["n"] += 1
+        if calls["n"] <= fail_times:
+            raise ConnectionError("db down")
+        queued.extend(item["handle"] for item in items)
+        return len(items)
+
+    monkeypatch.setattr(report_queue, "enqueue", enqueue)
+    return report_queue.AutoReporter(threshold=0.8), queued, calls
+
+
+def test_auto_reporter_batches_one_tick_and_skips_low_risk(monkeypatch):
+    reporter, queued, calls = _reporter(monkeypatch)
+
+    async def run():
+        for handle, score in (("a", 0.9), ("b", 0.5), ("c", 0.8)):
+            reporter.handle({"handle": handle, "risk_score": score})
+        await reporter.drain()
+
+    asyncio.run(run())
+    assert queued == ["a", "c"] and calls["n"] == 1
+
+
+def test_auto_reporter_keeps_failed_flushes_for_drain(monkeypatch):
+    reporter, queued, calls = _reporter(monkeypatch, fail_times=1)
+
+    async def run():
+        reporter.handle({"handle": "a", "risk_score": 0.9})
+        await asyncio.sleep(0.01)  # the background flush fails
+        assert queued == [] and reporter._buffer
+        reporter.handle({"handle": "b", "risk_score": 0.9})
+        await reporter.drain()
+
+    asyncio.run(run())
+    assert queued == ["a", "b"] and not reporter._buffer
+
+
+def test_auto_reporter_drain_writes_events_buffered_without_a_loop(monkeypatch):
+    reporter, queued, _ = _reporter(monkeypatch)
+    reporter.handle({"handle": "a", "risk_score": 0.95})
+    asyncio.run(reporter.drain())
+    assert queued == ["a"]
+
+
+def test_auto_reporter_drain_gives_up_after_one_more_attempt(monkeypatch):
+    reporter, queued, calls = _reporter(monkeypatch, fail_times=10)
+    reporter.handle({"handle": "a", "risk_score": 0.95})
+    asyncio.run(reporter.drain())
+    assert queued == [] and not reporter._buffer and calls["n"] == 1
+
+
+def _http_sink(status, body=None):
+    sink = HttpReportSink(url="https://reports.example/api")
+    sink._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(status, json=body or {})))
+    return sink
+
+
+@pytest.mark.parametrize("status", [401, 403, 408, 429, 503])
+def test_http_sink_retries_batch_auth_timeout_and_server_errors(status):
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(_http_sink(status).submit_batch([{"idempotency_key": "k1"}]))
+
+
+def test_http_sink_batch_rejection_and_per_report_statuses():
+    rejected = asyncio.run(_http_sink(422).submit_batch([{"idempotency_key": "k1"}]))
+    assert [(r.ok, r.retriable, r.error) for r in rejected] == [(False, False, "HTTP 422")]
+    body = {"results": [{"idempotency_key": "k1", "ok": True, "id": "r1"},
+                        {"idempotency_key": "k2", "ok": False, "status": 404, "error": "no such account"}]}
+    results = asyncio.run(_http_sink(200, body).submit_batch([{"idempotency_key": k} for k in ("k1", "k2", "k3")]))
+    assert [(r.ok, r.external_id, r.retriable) for r in results] == [(True, "r1", True), (False, None, False), (False, None, True)]
+
+
+def test_report_sink_is_abstract():
+    with pytest.raises(TypeError):
+        ReportSink()
@@ -0,0 +1,134 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.infra import flag_notifications, risk_summary
+from app.infra.event_bus import SimpleEventBus
+
+COLUMNS = ("id", "platform", "handle", "display_name", "description",
+           "risk_score", "model_score", "reasons", "created_at", "last_seen")
+SEEN = datetime(2025, 1, 2, tzinfo=timezone.utc)
+
+
+def _row(i, score):
+    return (i, "telegram", f"h{i}", None, None, score, None, [], SEEN, SEEN)
+
+
+def test_bucket_of_clamps_scores():
+    assert [risk_summary.bucket_of(s) for s in (-1, 0.0, 0.35, 0.99, 1.0, 5)] == [0, 0, 3, 9, 9, 9]
+
+
+def test_cache_keeps_the_top_k_by_score():
+    cache = risk_summary.TopRiskCache(k=2, columns=COLUMNS)
+    cache.load([_row(1, 0.5), _row(2, 0.7), _row(3, 0.6)])
+    assert [r[0] for r in cache.top(5)] == [2, 3]
+    cache.handle(flag_notifications.payload_from_row(COLUMNS, _row(4, 0.9)))
+    cache.handle(flag_notifications.payload_from_row(COLUMNS, _row(5, 0.1)))
+    assert [r[0] for r in cache.top(5)] == [4, 2]
+
+
+def test_flags_committed_by_another_process_update_the_cache(monkeypatch):
+    bus = SimpleEventBus()
+    monkeypatch.setattr(flag_notifications, "event_bus", bus)
+    monkeypatch.setattr(risk_summary, "event_bus", bus)
+
+    async def fetch_top(limit):
+        return [_row(1, 0.5)]
+
+    async def fetch_rows(ids):
+        return [_row(i, 0.95) for i in ids]
+
+    async def scenario():
+        await risk_summary.start(COLUMNS, fetch_top, k=10)
+        listener = flag_notifications.FlagListener("postgresql://unused", COLUMNS, fetch_rows)
+        # what asyncpg delivers when the crawler commits account 42
+        listener._on_notify(None, 1234, flag_notifications.CHANNEL, "42")
+        await listener.drain_once()
+        return risk_summary.top_risk.top(10)
+
+    top = asyncio.run(scenario())
+    assert [(r[0], r[5]) for r in top] == [(42, 0.95), (1, 0.5)]
+    # the in-process event alone no longer feeds the cache; every save is also notified
+    bus.publish("AccountFlagged", {"id": 7, "platform": "telegram", "handle": "h7", "risk_score": 1.0})
+    assert [r[0] for r in risk_summary.top_risk.top(10)] == [42, 1]
+
+
+def test_missed_notifications_trigger_a_reseed():
+    cache = risk_summary.TopRiskCache(k=10, columns=COLUMNS)
+    calls = []
+
+    async def fetch(limit):
+        calls.append(limit)
+        return [_row(1, 0.5), _row(2, 0.8)]
+
+    async def scenario():
+        await cache.seed(fetch)
+        cache.refresh_if_stale(fetch)
+        assert calls == [10]  # fresh: served from memory
+        cache.mark_stale()  # e.g. the LISTEN connection was re-established
+        cache.refresh_if_stale(fetch)
+        await cache._task
+        return cache.top(10)
+
+    assert [r[0] for r in asyncio.run(scenario())] == [2, 1]
+    assert calls == [10, 10]
+
+
+def test_score_drop_triggers_a_reseed():
+    cache = risk_summary.TopRiskCache(k=10, columns=COLUMNS)
+    cache.load([_row(1, 0.9)])
+    cache.handle(flag_notifications.payload_from_row(COLUMNS, _row(1, 0.2)))
+    assert cache._stale
+
+
+class _Session:
+    def __init__(self):
+        self.calls = []
+
+    async def execute(self, stmt, params=None):
+        self.calls.append((stmt, params))
+
+
+def _deltas(old, new):
+    session = _Session()
+    asyncio.run(risk_summary.apply(session, "telegram", old, new))
+    return [sorted((p["bucket"], p["count"]) for p in params) for _, params in session.calls]
+
+
+def test_apply_moves_accounts_between_buckets():
+    assert _deltas(None, 0.35) == [[(3, 1)]]
+    assert _deltas(0.35, 0.95) == [[(3, -1), (9, 1)]]
+    assert _deltas(0.31, 0.39) == []  # same bucket: nothing to write
+    assert _deltas(1.0, 0.0) == [[(0, 1), (9, -1)]]
+
+
+def test_save_locks_the_existing_row_before_reading_its_score():
+    from sqlalchemy.dialects import postgresql
+    from app.domain.entities import AccountMetadata, FlaggedAccount
+    from app.domain.value_objects import Handle, RiskScore, Timestamp
+    from app.infra.sql_repository import SqlAccountRepository
+
+    class _Result:
+        def scalar_one_or_none(self):
+            raise _Stop
+
+    class _Stop(Exception):
+        pass
+
+    class _LockSession(_Session):
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def execute(self, stmt, params=None):
+            self.calls.append((stmt, params))
+            return _Result()
+
+    session = _LockSession()
+    md = AccountMetadata("telegram", Handle("someone"), None, None, {}, Timestamp(SEEN))
+    with pytest.raises(_Stop):  # stop once the lookup ran
+        asyncio.run(SqlAccountRepository(lambda: session).save(FlaggedAccount(None, md, RiskScore(0.5), [])))
+    assert "FOR UPDATE" in str(session.calls[0][0].compile(dialect=postgresql.dialect()))
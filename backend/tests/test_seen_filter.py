@@ -0,0 +1,77 @@
+import asyncio
+import time
+from app.domain.platforms import PlatformAdapter
+from app.infra import seen_filter
+from app.infra.seen_filter import BloomFilter, CrawlFilters, ScalableBloomFilter, SeenFilter
+from app.workers import crawler
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bf = BloomFilter(capacity=5000, error_rate=0.01)
+    for i in range(5000):
+        bf.add(f"member{i}")
+    assert all(f"member{i}" in bf for i in range(5000))
+    false_positives = sum(f"other{i}" in bf for i in range(20000))
+    assert false_positives / 20000 < 0.03
+
+
+def test_scalable_filter_grows_past_initial_capacity():
+    sbf = ScalableBloomFilter(initial_capacity=100, error_rate=0.01)
+    for i in range(1000):
+        sbf.add(f"h{i}")
+    assert len(sbf.filters) > 1
+    assert all(f"h{i}" in sbf for i in range(1000))
+    assert not sbf.add("h5")
+
+
+def test_seen_filter_persists_and_normalizes(tmp_path):
+    f = SeenFilter("recent", str(tmp_path), ttl=3600)
+    f.add("@SomeHandle")
+    f.save()
+    reloaded = SeenFilter("recent", str(tmp_path), ttl=3600)
+    assert "somehandle" in reloaded
+    assert "https://t.me/somehandle" in reloaded
+    assert "otherhandle" not in reloaded
+
+
+def test_seen_filter_forgets_after_ttl(tmp_path, monkeypatch):
+    f = SeenFilter("recent", str(tmp_path), ttl=100)
+    f.add("old_handle")
+    now = time.time()
+    monkeypatch.setattr(seen_filter.time, "time", lambda: now + 60)
+    f.add("newer_handle")  # rotates: old_handle moves to the previous generation
+    assert "old_handle" in f
+    monkeypatch.setattr(seen_filter.time, "time", lambda: now + 60 + 101)
+    f.add("latest")
+    assert "old_handle" not in f
+
+
+def test_confirmed_filter_never_reports_false_positives(tmp_path):
+    f = SeenFilter("safe", str(tmp_path), initial_capacity=10, error_rate=0.5, confirm=True)
+    for i in range(10):
+        f.add(f"safe{i}")
+    assert not any(f"unsafe{i}" in f for i in range(2000))
+
+
+class _Adapter(PlatformAdapter):
+    platform = "telegram"
+
+    async def fetch(self, handle):
+        if handle == "missing_handle":
+            return None
+        raise ConnectionError("flood wait / network error")
+
+
+class _Repo:
+    async def save(self, entity, notify=True):
+        return entity
+
+
+def test_transient_fetch_errors_do_not_mark_handles_not_found(tmp_path, monkeypatch):
+    monkeypatch.setattr(crawler, "SqlAccountRepository", _Repo)
+    filters = CrawlFilters(directory=str(tmp_path))
+    results = asyncio.run(crawler.run_crawl(["missing_handle", "real_handle"], filters=filters, adapter=_Adapter()))
+    assert results == {"missing_handle": None}
+    assert "missing_handle" in filters.not_found
+    assert "real_handle" not in filters.not_found
+    assert filters.skip_reason("real_handle") is None
@@ -0,0 +1,32 @@
+import json
+from datetime import datetime, timezone
+from typing import List
+
+from app.api.controllers import router
+from app.api.schemas import FlaggedOut
+from app.api.serialization import json_response, rows_to_json
+from app.infra.sql_repository import FLAG_LIST_COLUMNS
+
+SEEN = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+
+def test_rows_to_json_maps_columns_in_order():
+    rows = [(1, "telegram", "h1", None, "desc", 0.9, None, ["Seller"], SEEN, SEEN)]
+    (obj,) = json.loads(rows_to_json(FLAG_LIST_COLUMNS, rows))
+    assert list(obj) == list(FLAG_LIST_COLUMNS)
+    assert obj["handle"] == "h1" and obj["display_name"] is None and obj["reasons"] == ["Seller"]
+    assert datetime.fromisoformat(obj["created_at"].replace("Z", "+00:00")) == SEEN
+    assert json.loads(rows_to_json(("a",), [])) == []
+
+
+def test_json_response_sends_bytes_as_json():
+    resp = json_response(b"[]", status_code=201)
+    assert (resp.body, resp.status_code, resp.media_type) == (b"[]", 201, "application/json")
+
+
+def test_flag_list_schema_is_documentation_only():
+    # the handler returns pre-encoded JSON, so the schema documents the response instead of validating it
+    route = next(r for r in router.routes if r.path == "/api/flags")
+    assert route.response_model is None
+    assert route.responses[200]["model"] == List[FlaggedOut]
+    assert tuple(FlaggedOut.__annotations__) == FLAG_LIST_COLUMNS
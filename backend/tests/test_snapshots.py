@@ -0,0 +1,93 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.infra import snapshots
+
+
+class _Conn:
+    def __init__(self, log, fail=False):
+        self.log = log
+        self.fail = fail
+
+    async def execute(self, stmt, params=None):
+        if self.fail:
+            raise RuntimeError("connection lost")
+        self.log.append(str(stmt))
+
+
+class _Engine:
+    """engine.begin(): commits on a clean exit, rolls back (raises) otherwise."""
+
+    def __init__(self, fail=False):
+        self.log = []
+        self.fail = fail
+        self.committed = 0
+
+    def begin(self):
+        engine = self
+
+        class _Tx:
+            async def __aenter__(self):
+                return _Conn(engine.log, engine.fail)
+
+            async def __aexit__(self, exc_type, *exc):
+                if exc_type is None:
+                    engine.committed += 1
+                return False
+
+        return _Tx()
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(snapshots, "_ensured", set())
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_partition_names_and_month_rollover():
+    assert snapshots.partition_name(_utc(2025, 3, 31, 23, 59)) == "account_snapshots_y2025m03"
+    assert snapshots._next_month(_utc(2025, 12, 1)) == _utc(2026, 1, 1)
+    assert snapshots._month_start(_utc(2025, 12, 31, 23)) == _utc(2025, 12, 1)
+    ddl = snapshots.partition_ddl(_utc(2025, 12, 1))
+    assert ddl.startswith("CREATE TABLE IF NOT EXISTS account_snapshots_y2025m12 PARTITION OF account_snapshots")
+    assert "FROM ('2025-12-01T00:00:00+00:00') TO ('2026-01-01T00:00:00+00:00')" in ddl
+    assert snapshots._PARTITION_NAME.match("account_snapshots_y2026m01").groups() == ("2026", "01")
+
+
+def test_ensure_partitions_covers_the_following_months():
+    engine = _Engine()
+    asyncio.run(snapshots.ensure_partitions(_Conn(engine.log), _utc(2025, 11, 15), months_ahead=2))
+    assert [line.split()[5] for line in engine.log] == [
+        "account_snapshots_y2025m11", "account_snapshots_y2025m12", "account_snapshots_y2026m01"]
+
+
+def test_months_are_cached_only_after_their_partition_committed():
+    failing = _Engine(fail=True)
+    with pytest.raises(RuntimeError):
+        asyncio.run(snapshots._ensure_months({(2025, 1)}, bind=failing))
+    assert snapshots._ensured == set()
+    ok = _Engine()
+    asyncio.run(snapshots._ensure_months({(2025, 2), (2025, 1)}, bind=ok))
+    assert ok.committed == 1 and snapshots._ensured == {(2025, 1), (2025, 2)}
+    assert "y2025m01" in ok.log[0] and "y2025m02" in ok.log[1]
+
+
+def test_append_creates_missing_months_outside_the_callers_transaction(monkeypatch):
+    engine = _Engine()
+    monkeypatch.setattr(snapshots, "engine", engine)
+    inserted = []
+
+    class _Session:
+        async def execute(self, stmt, rows=None):
+            inserted.append(rows)
+
+    rows = [{"captured_at": _utc(2025, 12, 31)}, {"captured_at": _utc(2026, 1, 1)}]
+    asyncio.run(snapshots.append(_Session(), rows))
+    asyncio.run(snapshots.append(_Session(), rows[:1]))
+    assert engine.committed == 1 and len(engine.log) == 2  # second append finds both months cached
+    assert inserted == [rows, rows[:1]]
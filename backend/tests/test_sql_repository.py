@@ -0,0 +1,159 @@
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.domain.entities import AccountMetadata, FlaggedAccount
+from app.domain.value_objects import Handle, RiskScore, Timestamp
+from app.infra import cluster_index, flag_notifications, risk_summary, snapshots, sql_repository
+from app.infra.sql_repository import SqlAccountRepository
+from app.models import FlaggedAccount as ORMFlagged
+
+FETCHED = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class _Result:
+    def __init__(self, row):
+        self._row = row
+
+    def scalar_one_or_none(self):
+        return self._row
+
+
+class _Session:
+    def __init__(self, row):
+        self.row = row
+        self.added = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt, params=None):
+        return _Result(self.row)
+
+    def add(self, row):
+        self.added.append(row)
+
+    async def flush(self):
+        self.added[-1].id = 1
+
+    async def refresh(self, row):
+        pass
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def side_effects(monkeypatch):
+    calls = {"notify": [], "snapshots": []}
+
+    async def noop(*args, **kwargs):
+        pass
+
+    async def notify(session, account_id):
+        calls["notify"].append(account_id)
+
+    async def append(session, rows):
+        calls["snapshots"].extend(rows)
+
+    monkeypatch.setattr(risk_summary, "apply", noop)
+    monkeypatch.setattr(cluster_index, "index_account", noop)
+    monkeypatch.setattr(snapshots, "append", append)
+    monkeypatch.setattr(flag_notifications, "notify", notify)
+    return calls
+
+
+def _entity(fetched=FETCHED):
+    md = AccountMetadata("telegram", Handle("vendo_cp"), "CP", None, {}, Timestamp(fetched))
+    return FlaggedAccount(None, md, RiskScore(0.9), [])
+
+
+def _existing(last_seen):
+    return ORMFlagged(id=7, platform="telegram", handle="vendo_cp", risk_score=0.5, reasons=[],
+                      created_at=FETCHED - timedelta(days=30), last_seen=last_seen)
+
+
+def test_last_seen_follows_the_fetch_time_and_never_goes_back(side_effects):
+    row = _existing(FETCHED - timedelta(days=1))
+    asyncio.run(SqlAccountRepository(lambda: _Session(row)).save(_entity()))
+    assert row.last_seen == FETCHED and side_effects["snapshots"][0]["captured_at"] == FETCHED
+    # an older capture replayed later keeps the newer last_seen
+    asyncio.run(SqlAccountRepository(lambda: _Session(row)).save(_entity(FETCHED - timedelta(days=5))))
+    assert row.last_seen == FETCHED
+
+
+def test_replayed_saves_do_not_notify(side_effects):
+    row = _existing(FETCHED)
+    asyncio.run(SqlAccountRepository(lambda: _Session(row)).save(_entity(), notify=False))
+    assert side_effects["notify"] == [] and len(side_effects["snapshots"]) == 1
+    asyncio.run(SqlAccountRepository(lambda: _Session(row)).save(_entity()))
+    assert side_effects["notify"] == [7]
+
+
+def test_new_accounts_take_last_seen_from_the_fetch_time(side_effects):
+    session = _Session(None)
+    saved = asyncio.run(SqlAccountRepository(lambda: session).save(_entity(), notify=False))
+    assert session.added[0].last_seen == FETCHED and saved.id == 1
+    assert side_effects["notify"] == []
+
+
+def test_list_flagged_rows_selects_flag_list_columns_in_order():
+    class _Rows:
+        def tuples(self):
+            return self
+
+        def all(self):
+            return []
+
+    class _SelectSession(_Session):
+        async def execute(self, stmt, params=None):
+            self.stmt = stmt
+            return _Rows()
+
+    session = _SelectSession(None)
+    asyncio.run(SqlAccountRepository(lambda: session).list_flagged_rows(limit=5, reason={"rule": "seller"}))
+    assert tuple(c.name for c in session.stmt.selected_columns) == sql_repository.FLAG_LIST_COLUMNS
+    assert "ORDER BY flagged_accounts.risk_score DESC" in str(session.stmt)
+
+
+def _ilike(pattern, value):
+    """What Postgres ILIKE ... ESCAPE '\\' does with the pattern, for checking matches without a database."""
+    out, chars = "", iter(pattern)
+    for c in chars:
+        if c == "\\":
+            out += re.escape(next(chars))
+        else:
+            out += {"%": ".*", "_": "."}.get(c, re.escape(c))
+    return re.fullmatch(out, value, re.IGNORECASE | re.DOTALL) is not None
+
+
+@pytest.mark.parametrize("query, pattern", [
+    ("cpsel", "%cpsel%"),
+    ("cpsel*", "cpsel%"),
+    ("cp*links*", "cp%links%"),
+    ("100%", "%100\\%%"),
+    ("vendo_cp", "%vendo\\_cp%"),
+    ("a\\b", "%a\\\\b%"),
+    ("50%_off*", "50\\%\\_off%"),
+])
+def test_search_pattern_escapes_wildcards(query, pattern):
+    assert sql_repository._search_pattern(query) == pattern
+
+
+@pytest.mark.parametrize("query, value, hit", [
+    ("vendo_cp", "best VENDO_CP deals", True),
+    ("vendo_cp", "vendoXcp", False),  # _ is literal, not "any character"
+    ("100%", "now 100% off", True),
+    ("100%", "1000 items", False),
+    ("cpsel*", "cpselq0", True),
+    ("cpsel*", "xcpselq0", False),  # * anchors a prefix
+    ("cpsel", "xcpselq0", True),
+    ("a\\b", "path a\\b here", True),
+])
+def test_search_pattern_matches_literally(query, value, hit):
+    assert _ilike(sql_repository._search_pattern(query), value) is hit
@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from app.infra import telegram_client
+
+
+class UsernameNotOccupiedError(Exception):
+    pass
+
+
+class FloodWaitError(Exception):
+    pass
+
+
+class _Client:
+    def __init__(self, error):
+        self.error = error
+        self.requested = []
+
+    async def get_entity(self, handle):
+        self.requested.append(handle)
+        raise self.error
+
+
+def _patch(monkeypatch, error):
+    client = _Client(error)
+
+    async def start_client():
+        return client
+
+    monkeypatch.setattr(telegram_client, "start_client", start_client)
+    # stands in for the telethon error classes, which are imported lazily
+    monkeypatch.setattr(telegram_client, "_not_found_errors", lambda: (UsernameNotOccupiedError, ValueError))
+    return client
+
+
+@pytest.mark.parametrize("error", [UsernameNotOccupiedError("gone"), ValueError("No user has \"x\" as username")])
+def test_missing_usernames_return_none(monkeypatch, error):
+    client = _patch(monkeypatch, error)
+    assert asyncio.run(telegram_client.fetch_public_channel_metadata("https://t.me/some_handle")) is None
+    assert client.requested == ["some_handle"]
+
+
+@pytest.mark.parametrize("error", [FloodWaitError("wait 30s"), ConnectionError("reset"), RuntimeError("RPC")])
+def test_transient_errors_propagate(monkeypatch, error):
+    _patch(monkeypatch, error)
+    with pytest.raises(type(error)):
+        asyncio.run(telegram_client.TelegramAdapter().fetch("@some_handle"))
@@ -0,0 +1,31 @@
+import argparse
+import asyncio
+import logging
+from app.domain.learned_scoring import HashedNgramModel
+from app.infra import labels, model_store
+
+
+async def main(path: str, epochs: int, rescore: bool):
+    metadatas, y = await labels.labeled_accounts()
+    positives = sum(y)
+    if not positives or positives == len(y):
+        print(f"Need both abusive and benign labels to train (have {positives} abusive, {len(y) - positives} benign).")
+        return
+    model = HashedNgramModel.train(metadatas, y, epochs=epochs)
+    probs = [p for p, _ in model.score_batch(metadatas, top_k=0)]
+    accuracy = sum((p >= 0.5) == bool(t) for p, t in zip(probs, y)) / len(y)
+    model_store.save(model, path)
+    print(f"Trained on {len(y)} labeled accounts ({positives} abusive), training accuracy {accuracy:.3f}; saved to {path}")
+    if rescore:
+        total = await labels.rescore_all(model)
+        print(f"Rescored {total} accounts")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Train the learned risk model from analyst labels")
+    parser.add_argument("--output", default=model_store.MODEL_PATH)
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--rescore", action="store_true", help="write model scores for all stored accounts")
+    args = parser.parse_args()
+    asyncio.run(main(args.output, args.epochs, args.rescore))
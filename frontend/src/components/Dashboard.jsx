@@ -2,10 +2,33 @@ import React, { useEffect, useState } from "react";
 import axios from "axios";
 import FlagCard from "./FlagCard";
 
+const keyOf = (f) => `${f.platform}-${f.handle}`;
+
+function mergeFlag(flags, incoming) {
+  const rest = flags.filter((f) => keyOf(f) !== keyOf(incoming));
+  const prev = flags.find((f) => keyOf(f) === keyOf(incoming));
+  const next = [...rest, { ...prev, ...incoming }];
+  next.sort((a, b) => b.risk_score - a.risk_score);
+  return next;
+}
+
 export default function Dashboard() {
   const [flags, setFlags] = useState([]);
   useEffect(() => {
     fetchFlags();
+    // live updates are pushed by the backend; the initial fetch only seeds the list
+    const source = new EventSource("/api/flags/stream");
+    source.addEventListener("flag", (e) => {
+      try {
+        const incoming = JSON.parse(e.data);
+        setFlags((flags) => mergeFlag(flags, incoming));
+      } catch (err) {
+        console.error(err);
+      }
+    });
+    // the server could not resume from our last event id, refetch the list
+    source.addEventListener("reset", () => fetchFlags());
+    return () => source.close();
   }, []);
   async function fetchFlags() {
     try {
@@ -20,7 +43,7 @@ export default function Dashboard() {
       {flags.length === 0 && <p>No flagged items yet.</p>}
       <div style={{ display: "grid", gridTemplateColumns: "repeat(auto-fit,minmax(320px,1fr))", gap: 12 }}>
         {flags.map((f) => (
-          <FlagCard key={`${f.platform}-${f.handle}`} flag={f} />
+          <FlagCard key={keyOf(f)} flag={f} />
         ))}
       </div>
     </div>